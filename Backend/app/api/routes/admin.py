@@ -0,0 +1,34 @@
+# api/routes/admin.py
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.langgraph_core.agents import prompts
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+)
+
+
+def require_admin_token(x_admin_token: str = Header(default="")):
+    """Operator endpoints are off unless ADMIN_TOKEN is set, and then need it in X-Admin-Token."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin endpoints are disabled")
+    if not secrets.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.post("/index/reload", dependencies=[Depends(require_admin_token)])
+async def reload_index(force: bool = False):
+    """
+    Loads the index version VECTOR_INDEX_PATH currently points at and swaps it in
+    for new queries. Only affects the worker that serves this request; the others
+    pick the version up on their next poll. `force` reloads even an unchanged version.
+    """
+    if prompts.index_manager is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="RAG components failed to initialize")
+    reloaded = await run_in_threadpool(prompts.index_manager.reload, force)
+    return {"reloaded": reloaded, **prompts.index_manager.stats()}
@@ -1,12 +1,14 @@
 # api/routes/chat.py
-import json
+import asyncio
 import traceback
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from fastapi.responses import StreamingResponse, JSONResponse
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from fastapi.concurrency import run_in_threadpool
 from app.services import chat_service
+from app.services.resume_jobs import resume_jobs
+from app.api.sse import DONE_FRAME, SSEFrameCoalescer, acoalesce_tokens, encode_event
+from app.api.uploads import RESUME_UPLOAD_OPENAPI, receive_file_upload
 
 # Import models, schemas, and the db session dependency
 from app.db import models, schemas
@@ -65,8 +67,7 @@ async def create_new_chat_session(
         if session_data.first_message:
             try:
                 # Process the first message and get the response
-                full_response = await run_in_threadpool(
-                    chat_service.process_user_message,
+                full_response = await chat_service.aprocess_user_message(
                     db_session=db,
                     chat_session=db_session,
                     user_prompt=session_data.first_message
@@ -82,32 +83,67 @@ async def create_new_chat_session(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create chat session: {str(e)}")
 
-@router.post("/resume-analysis", response_model=schemas.ChatSession, status_code=status.HTTP_201_CREATED)
+def _resume_queue_busy() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                         detail="Too many resumes are being analyzed right now. Please try again in a moment.")
+
+
+def _queued_job_response(current_user: models.User, chat_session_id: int, upload) -> JSONResponse:
+    """Hands the stored upload to the background queue; the job now owns (and deletes) the temp file."""
+    try:
+        job = resume_jobs.submit(current_user.id, chat_session_id, upload.path, upload.digest, cleanup=upload.discard)
+    except asyncio.QueueFull:
+        raise _resume_queue_busy()
+    response = JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={**job.snapshot(), "events_url": f"/chat/resume-jobs/{job.id}/events"},
+    )
+    return add_cors_headers(response, "https://carrer-gpt.vercel.app")
+
+
+@router.post("/resume-analysis", response_model=schemas.ChatSession, status_code=status.HTTP_201_CREATED,
+             openapi_extra=RESUME_UPLOAD_OPENAPI)
 async def create_session_with_resume_analysis(
-    resume: UploadFile = File(...),
+    request: Request,
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
+    """
+    Creates a session for the uploaded resume and analyzes it. With `background=true`
+    it returns 202 with `session_id` and `job_id` as soon as the file is stored;
+    follow the analysis at GET /chat/resume-jobs/{job_id}/events.
+    """
+    if background and resume_jobs.full():
+        raise _resume_queue_busy()
+    # 1. Stream the upload to a temp file first, so an oversized file is refused before a session exists
+    upload = await receive_file_upload(request, "resume")
+    handed_off = False
     try:
-        # 1. Create the session
+        if background and resume_jobs.full():
+            raise _resume_queue_busy()  # filled up while the file was arriving
+
+        # 2. Create the session
         new_chat_session = models.ChatSession(
-            title=f"Resume Analysis: {resume.filename}", 
+            title=f"Resume Analysis: {upload.filename}", 
             user_id=current_user.id
         )
         db.add(new_chat_session)
         db.commit()
         db.refresh(new_chat_session)
 
-        # 2. Read the file bytes
-        file_bytes = await resume.read()
-        
-        # 3. Call the service in a threadpool with the correct arguments
+        if background:
+            response = _queued_job_response(current_user, new_chat_session.id, upload)
+            handed_off = True
+            return response
+
+        # 3. Run the async resume pipeline (parsing still happens off the event loop, from the temp file)
         try:
-            await run_in_threadpool(
-                chat_service.process_resume_file, 
+            await chat_service.aprocess_resume_file(
                 db_session=db,
                 chat_session_id=new_chat_session.id,
-                file_content=file_bytes
+                file_content=upload.path,
+                file_digest=upload.digest
             )
         except Exception as service_error:
             # Don't fail the entire request, just log the error
@@ -118,40 +154,115 @@ async def create_session_with_resume_analysis(
         response = JSONResponse(content=schemas.ChatSession.from_orm(new_chat_session).model_dump(mode='json'))
         return add_cors_headers(response, "https://carrer-gpt.vercel.app")
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Resume analysis failed: {str(e)}")
+    finally:
+        if not handed_off:
+            upload.discard()
 
-@router.post("/{session_id}/resume-analysis", response_model=schemas.ChatSession)
+@router.post("/{session_id}/resume-analysis", response_model=schemas.ChatSession, openapi_extra=RESUME_UPLOAD_OPENAPI)
 async def add_resume_analysis_to_session(
     session_id: int,
-    resume: UploadFile = File(...),
+    request: Request,
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
+    """
+    Analyzes an uploaded resume into an existing session. With `background=true`
+    it returns 202 with `session_id` and `job_id` as soon as the file is stored.
+    """
+    chat_session_obj = db.query(models.ChatSession).filter(
+        models.ChatSession.id == session_id, 
+        models.ChatSession.user_id == current_user.id
+    ).first()
+
+    if not chat_session_obj:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+
+    if background and resume_jobs.full():
+        raise _resume_queue_busy()
+    upload = await receive_file_upload(request, "resume")
+    handed_off = False
     try:
-        chat_session_obj = db.query(models.ChatSession).filter(
-            models.ChatSession.id == session_id, 
-            models.ChatSession.user_id == current_user.id
-        ).first()
-        
-        if not chat_session_obj:
-            raise HTTPException(status_code=404, detail="Chat session not found")
-        
-        file_bytes = await resume.read()
+        if background:
+            response = _queued_job_response(current_user, chat_session_obj.id, upload)
+            handed_off = True
+            return response
 
-        await run_in_threadpool(
-            chat_service.process_resume_file, 
+        await chat_service.aprocess_resume_file(
             db_session=db,
             chat_session_id=chat_session_obj.id,
-            file_content=file_bytes
+            file_content=upload.path,
+            file_digest=upload.digest
         )
         
         db.refresh(chat_session_obj)
         response = JSONResponse(content=schemas.ChatSession.from_orm(chat_session_obj).model_dump(mode='json'))
         return add_cors_headers(response, "https://carrer-gpt.vercel.app")
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add resume: {str(e)}")
+    finally:
+        if not handed_off:
+            upload.discard()
+
+
+def _get_user_resume_job(job_id: str, current_user: models.User):
+    job = resume_jobs.get(job_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Resume job not found")
+    return job
+
+
+@router.get("/resume-jobs/{job_id}")
+async def get_resume_job(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user)
+):
+    """Current status of a background resume analysis."""
+    job = _get_user_resume_job(job_id, current_user)
+    return add_cors_headers(JSONResponse(content=job.snapshot()), "https://carrer-gpt.vercel.app")
+
+
+@router.get("/resume-jobs/{job_id}/events")
+async def stream_resume_job_events(
+    job_id: str,
+    request: Request,
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Streams a background resume analysis as SSE: `{"stage": ...}` progress frames
+    (queued, extracting, analyzing, saving), the analysis as `{"token": ...}` frames,
+    then `{"stage": "done", "session_id": ...}` or `{"stage": "failed", "error": ...}`
+    and `[DONE]`. Frames carry ids, so a reconnect with Last-Event-ID resumes where
+    it left off; connecting after the job finished replays everything.
+    """
+    job = _get_user_resume_job(job_id, current_user)
+    last_event_id = request.headers.get("last-event-id", "")
+    after = int(last_event_id) if last_event_id.isdigit() else 0
+
+    async def event_generator():
+        async for position, event in job.follow(after):
+            yield encode_event(event, event_id=position)
+        yield DONE_FRAME
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Access-Control-Allow-Origin": "https://carrer-gpt.vercel.app",
+            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+            "Access-Control-Allow-Headers": "*",
+            "Access-Control-Allow-Credentials": "true",
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
 
 @router.get("/", response_model=List[schemas.ChatSession])
 async def get_all_user_sessions(
@@ -214,26 +325,31 @@ async def post_new_message_stream(
         if not db_session:
             raise HTTPException(status_code=404, detail="Chat session not found or not authorized")
 
-        def event_generator():
+        async def event_generator():
+            coalescer = SSEFrameCoalescer()
             try:
-                # Stream the response
-                for token in chat_service.process_user_message_stream(
-                    db_session=db,
-                    chat_session=db_session,
-                    user_prompt=message.content
+                # Stream the response, batching tokens into frames
+                # SSE format: data: {"token": "your tokens here"}\n\n
+                async for frame in acoalesce_tokens(
+                    chat_service.aprocess_user_message_stream(
+                        db_session=db,
+                        chat_session=db_session,
+                        user_prompt=message.content
+                    ),
+                    coalescer
                 ):
-                    if token and token.strip():  # Only send non-empty tokens
-                        # SSE format: data: {"token": "your token here"}\n\n
-                        yield f"data: {json.dumps({'token': token})}\n\n"
+                    yield frame
                 
                 # Signal the end of the stream
-                yield f"data: [DONE]\n\n"
+                yield DONE_FRAME
                 
             except Exception as e:
                 # Send error as a token so frontend can display it
                 error_msg = f"I apologize, but I encountered an error: {str(e)}. Please try again."
-                yield f"data: {json.dumps({'token': error_msg})}\n\n"
-                yield f"data: [DONE]\n\n"
+                yield encode_event({"token": error_msg})
+                yield DONE_FRAME
+            finally:
+                coalescer.report(f"session {session_id}")
                 
         return StreamingResponse(
             event_generator(), 
@@ -291,7 +407,8 @@ async def create_new_chat_session_stream(
 
         # 2. If a first message was provided, stream it
         if session_data.first_message:
-            def event_generator():
+            async def event_generator():
+                coalescer = SSEFrameCoalescer()
                 try:
                     # Create a separate database session for streaming to avoid session closure issues
                     stream_db = SessionLocal()
@@ -305,13 +422,15 @@ async def create_new_chat_session_stream(
                             raise Exception("Chat session not found in stream database")
                         
                         # Stream the first message response
-                        for token in chat_service.process_user_message_stream(
-                            db_session=stream_db,
-                            chat_session=chat_session_in_stream,
-                            user_prompt=session_data.first_message
+                        async for frame in acoalesce_tokens(
+                            chat_service.aprocess_user_message_stream(
+                                db_session=stream_db,
+                                chat_session=chat_session_in_stream,
+                                user_prompt=session_data.first_message
+                            ),
+                            coalescer
                         ):
-                            if token and token.strip():
-                                yield f"data: {json.dumps({'token': token})}\n\n"
+                            yield frame
                         
                         # Get messages after streaming is complete
                         try:
@@ -342,16 +461,18 @@ async def create_new_chat_session_stream(
                             # Use empty messages if we can't get them
                             session_info["messages"] = []
                         
-                        yield f"data: {json.dumps({'session': session_info})}\n\n"
-                        yield f"data: [DONE]\n\n"
+                        yield encode_event({"session": session_info})
+                        yield DONE_FRAME
                         
                     finally:
                         stream_db.close()
                     
                 except Exception as e:
                     error_msg = f"I apologize, but I encountered an error: {str(e)}. Please try again."
-                    yield f"data: {json.dumps({'token': error_msg})}\n\n"
-                    yield f"data: [DONE]\n\n"
+                    yield encode_event({"token": error_msg})
+                    yield DONE_FRAME
+                finally:
+                    coalescer.report(f"new session {session_info['id']}")
             
             return StreamingResponse(
                 event_generator(), 
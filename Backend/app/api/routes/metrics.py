@@ -0,0 +1,80 @@
+# api/routes/metrics.py
+from fastapi import APIRouter
+
+from app.langgraph_core.agents.registry import chain_registry
+from app.langgraph_core.cache.response_cache import response_cache
+from app.langgraph_core.cache.semantic_cache import semantic_cache
+from app.langgraph_core.cache.routing_cache import routing_cache
+from app.langgraph_core.cache.embedding_cache import query_embedding_cache
+from app.langgraph_core.cache.resume_cache import resume_cache
+from app.langgraph_core.agents import prompts
+from app.langgraph_core.retrieval.context import context_stats
+from app.services.resume_extraction import resume_extractor
+from app.services.resume_jobs import resume_jobs
+from app.services.speculation import speculation_stats
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+)
+
+@router.get("/chains")
+async def get_chain_metrics():
+    """
+    Reports which agent chains are built and how long each one took to build.
+    """
+    return chain_registry.stats()
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """
+    Reports size and hit-rate counters for the LLM response, routing, query embedding and resume caches.
+    """
+    return {
+        "responses": response_cache.stats(),
+        "semantic_responses": semantic_cache.stats(),
+        "routing_decisions": routing_cache.stats(),
+        "query_embeddings": query_embedding_cache.stats(),
+        "resumes": resume_cache.stats(),
+    }
+
+@router.get("/speculation")
+async def get_speculation_metrics():
+    """
+    Reports how often the speculatively started agent matched the supervisor's pick
+    and how much routing latency that hid.
+    """
+    return speculation_stats.stats()
+
+@router.get("/context")
+async def get_context_metrics():
+    """
+    Reports how many prompt tokens RAG context assembly removed (duplicates, chunk
+    overlap, budget trimming) compared with joining the raw retrieved chunks.
+    """
+    return context_stats.stats()
+
+@router.get("/index")
+async def get_index_metrics():
+    """
+    Reports the active knowledge-base index version, when and how fast it was loaded,
+    and how many hot reloads have succeeded or failed in this worker.
+    """
+    if prompts.index_manager is None:
+        return {"version": None, "error": "RAG components failed to initialize"}
+    return prompts.index_manager.stats()
+
+@router.get("/resume-extraction")
+async def get_resume_extraction_metrics():
+    """
+    Reports resume parsing jobs run in the extraction process pool, with timeouts,
+    worker crashes and pool restarts.
+    """
+    return resume_extractor.stats()
+
+@router.get("/resume-jobs")
+async def get_resume_job_metrics():
+    """
+    Reports the background resume analysis queue: pending, finished and rejected jobs.
+    """
+    return resume_jobs.stats()
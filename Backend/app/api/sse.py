@@ -0,0 +1,113 @@
+# api/sse.py
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
+
+import orjson
+
+from app.core.config import settings
+
+DONE_FRAME = b"data: [DONE]\n\n"
+
+
+def encode_event(payload: dict, event_id: Optional[int] = None) -> bytes:
+    """Encodes a payload as a single SSE `data:` frame, with an `id:` line when given."""
+    frame = b"data: " + orjson.dumps(payload) + b"\n\n"
+    return frame if event_id is None else b"id: %d\n" % event_id + frame
+
+
+class SSEFrameCoalescer:
+    """
+    Buffers streamed tokens and emits them as `{"token": ...}` SSE frames once
+    the buffer reaches `max_bytes` or the oldest buffered token is older than
+    `max_interval_ms`. Whitespace-only tokens are kept so spacing and newlines
+    in the answer survive.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_interval_ms: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.SSE_FLUSH_BYTES
+        self.max_interval = (max_interval_ms if max_interval_ms is not None else settings.SSE_FLUSH_INTERVAL_MS) / 1000
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._first_token_at = 0.0
+        self.tokens = 0
+        self.frames = 0
+
+    def feed(self, token: str) -> Optional[bytes]:
+        """Adds a token; returns an encoded frame when a threshold is crossed."""
+        if not token:
+            return None
+        if not self._buffer:
+            self._first_token_at = time.monotonic()
+        self._buffer.append(token)
+        self._buffered_bytes += len(token.encode("utf-8"))
+        self.tokens += 1
+
+        if (self._buffered_bytes >= self.max_bytes
+                or time.monotonic() - self._first_token_at >= self.max_interval):
+            return self.flush()
+        return None
+
+    def seconds_until_flush(self) -> Optional[float]:
+        """Time left before the buffered text is due, or None if nothing is buffered."""
+        if not self._buffer:
+            return None
+        return max(0.0, self.max_interval - (time.monotonic() - self._first_token_at))
+
+    def flush(self) -> Optional[bytes]:
+        """Emits whatever is buffered as one frame (or None if the buffer is empty)."""
+        if not self._buffer:
+            return None
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        self.frames += 1
+        return encode_event({"token": text})
+
+    def report(self, label: str = "response"):
+        print(f"--- SSE {label}: {self.tokens} tokens sent in {self.frames} frames ---")
+
+
+def coalesce_tokens(tokens: Iterable[str], coalescer: Optional[SSEFrameCoalescer] = None) -> Iterator[bytes]:
+    """Turns a token iterator into coalesced SSE frames (without the final [DONE])."""
+    coalescer = coalescer or SSEFrameCoalescer()
+    for token in tokens:
+        frame = coalescer.feed(token)
+        if frame:
+            yield frame
+    frame = coalescer.flush()
+    if frame:
+        yield frame
+
+
+async def acoalesce_tokens(tokens: AsyncIterable[str], coalescer: Optional[SSEFrameCoalescer] = None) -> AsyncIterator[bytes]:
+    """
+    Async version of `coalesce_tokens`. While waiting for the next token it also
+    flushes on the time threshold, so a pause in generation never strands
+    buffered text on the server.
+    """
+    coalescer = coalescer or SSEFrameCoalescer()
+    iterator = tokens.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({pending}, timeout=coalescer.seconds_until_flush())
+            if not done:
+                frame = coalescer.flush()
+                if frame:
+                    yield frame
+                continue
+            try:
+                token = pending.result()
+            except StopAsyncIteration:
+                break
+            frame = coalescer.feed(token)
+            if frame:
+                yield frame
+            pending = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        if not pending.done():
+            pending.cancel()
+    frame = coalescer.flush()
+    if frame:
+        yield frame
@@ -0,0 +1,183 @@
+# api/uploads.py
+import os
+import tempfile
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.langgraph_core.cache.resume_cache import HASH_NAME, new_hasher
+
+try:
+    import python_multipart as multipart
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    import multipart
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import parse_options_header
+
+# Boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Documents the multipart body for /docs, since the routes read it themselves instead of via File(...)
+RESUME_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["resume"],
+                    "properties": {"resume": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+class StoredUpload(NamedTuple):
+    """A file part streamed to disk: its temp path, client filename, size and content digest."""
+    path: str
+    filename: str
+    size: int
+    digest: str
+
+    def discard(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"The file is too large. Resumes can be at most {max_bytes // (1024 * 1024)} MB.",
+    )
+
+
+class _FilePartReceiver:
+    """python-multipart callbacks that write one named file part to a temp file, hashing it on the way."""
+
+    def __init__(self, field_name: str, max_bytes: int):
+        self.field_name = field_name.encode()
+        self.max_bytes = max_bytes
+        self.file = None
+        self.filename: Optional[str] = None
+        self.size = 0
+        self.hasher = new_hasher()
+        self.done = False
+        self._receiving = False
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        if self.done or options.get(b"name") != self.field_name or b"filename" not in options:
+            return  # other fields are skipped without being stored
+        self._receiving = True
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.file = tempfile.NamedTemporaryFile(
+            dir=settings.RESUME_UPLOAD_TMP_DIR or None, prefix="resume-", suffix=".upload", delete=False,
+        )
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._receiving:
+            return
+        self.size += end - start
+        if self.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        chunk = memoryview(data)[start:end]
+        self.hasher.update(chunk)
+        # A chunk is at most one network read; the write lands in the page cache
+        self.file.write(chunk)
+
+    def on_part_end(self):
+        if self._receiving:
+            self._receiving = False
+            self.done = True
+            self.file.close()
+
+    def discard(self):
+        if self.file is None:
+            return
+        self.file.close()
+        try:
+            os.unlink(self.file.name)
+        except FileNotFoundError:
+            pass
+        self.file = None
+
+
+async def receive_file_upload(request: Request, field_name: str = "resume") -> StoredUpload:
+    """
+    Streams a multipart/form-data body to a temp file chunk by chunk, so memory per
+    upload stays constant whatever the file size. The size limit is checked against
+    Content-Length before any of the body is read, and again while streaming, so an
+    oversized upload gets a 413 as soon as it crosses RESUME_UPLOAD_MAX_MB. The
+    caller owns the returned file and must `discard()` it.
+    """
+    max_bytes = settings.RESUME_UPLOAD_MAX_MB * 1024 * 1024
+    content_type, options = parse_options_header(request.headers.get("content-type"))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="Upload the resume as multipart/form-data.")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+
+    receiver = _FilePartReceiver(field_name, max_bytes)
+    parser = multipart.MultipartParser(options[b"boundary"], receiver.callbacks())
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            # Also bounds bodies without Content-Length and whatever else they carry besides the file
+            if received > max_bytes + MULTIPART_OVERHEAD_BYTES:
+                raise _too_large(max_bytes)
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        receiver.discard()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Malformed multipart body: {e}")
+    except BaseException:
+        # Includes the 413 raised mid-stream and a client that disconnects
+        receiver.discard()
+        raise
+    if not receiver.done:
+        receiver.discard()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=f"The request has no complete '{field_name}' file.")
+    return StoredUpload(
+        path=receiver.file.name,
+        filename=receiver.filename,
+        size=receiver.size,
+        digest=f"{HASH_NAME}:{receiver.hasher.hexdigest()}",
+    )
@@ -16,6 +16,113 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256" # You can provide a default value
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 # And a default value here
 
+    # --- Streaming (SSE) Settings ---
+    # Tokens are buffered and sent as one frame once either threshold is hit
+    SSE_FLUSH_INTERVAL_MS: int = 16
+    SSE_FLUSH_BYTES: int = 256
+
+    # --- LLM Response Cache Settings ---
+    # Exact-match cache in front of the agent chains (comma-separated agent names)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_AGENTS: str = "CareerAdvisor,LearningPath"
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    RESPONSE_CACHE_MAX_SIZE: int = 1024
+
+    # --- Semantic Response Cache Settings ---
+    # Serves a stored answer when a new question is a close paraphrase of an old one that
+    # names the same technologies and parsed arguments (see semantic_cache.SEMANTIC_CHAINS)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_AGENTS: str = "CareerAdvisor,LearningPath"
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_MAX_SIZE: int = 2048
+    SEMANTIC_CACHE_TTL_SECONDS: int = 86400
+
+    # --- Supervisor Routing Settings ---
+    # JSONL file that receives every routing decision (empty = don't log)
+    ROUTING_LOG_PATH: str = ""
+    # Local intent model trained from that log (empty = always ask the LLM)
+    INTENT_CLASSIFIER_PATH: str = ""
+    INTENT_CLASSIFIER_THRESHOLD: float = 0.85
+    # Remembers LLM routing decisions for repeated prompts
+    ROUTING_CACHE_ENABLED: bool = True
+    ROUTING_CACHE_MAX_SIZE: int = 4096
+    ROUTING_CACHE_TTL_SECONDS: int = 3600
+
+    # --- Speculative Routing Settings ---
+    # Start the most likely agent while the supervisor is still deciding (async path only)
+    SPECULATIVE_ROUTING_ENABLED: bool = False
+    SPECULATIVE_AGENT: str = "CareerAdvisor"
+    SPECULATIVE_RESUME_AGENT: str = "ResumeQAAgent"
+
+    # --- Knowledge Base Index Settings ---
+    # Folder holding index.faiss + docstore (build other index types with retrieval/index_factory.py)
+    VECTOR_INDEX_PATH: str = "faiss_index"
+    # Query-time recall/latency knobs; ignored by index types they don't apply to
+    VECTOR_INDEX_NPROBE: int = 16
+    VECTOR_INDEX_EF_SEARCH: int = 64
+    # Embedding backend: "google" (network), "local" (sentence-transformers on CPU) or "hashing" (test stub).
+    # Must match the index's embedding.json; re-index with retrieval/embeddings.py when switching.
+    EMBEDDING_BACKEND: str = "google"
+    EMBEDDING_MODEL: str = "models/embedding-001"
+    EMBEDDING_DEVICE: str = "cpu"
+    EMBEDDING_RUNTIME: str = "torch"
+    # "dense", "lexical" or "hybrid" (BM25 + vectors fused with reciprocal rank fusion).
+    # Compare them with benchmarks/bench_retrieval.py on the real embedding model before switching.
+    RETRIEVAL_MODE: str = "dense"
+    # Candidates taken from each leg before fusion, and the RRF damping constant
+    RETRIEVAL_FETCH_K: int = 20
+    RETRIEVAL_RRF_K: int = 60
+    # Pre-filter searches to the source_folder a question targets (e.g. only Roadmap chunks for roadmap questions).
+    # A wrong guess drops every other folder's chunks; check bench_retrieval --folder-filter off on first.
+    RETRIEVAL_FOLDER_FILTER: bool = False
+
+    # --- Index Hot Reload Settings ---
+    # How often each worker checks VECTOR_INDEX_PATH for a new index version (0 = only on /admin/index/reload)
+    INDEX_RELOAD_POLL_SECONDS: float = 30.0
+    # Shared secret for the /admin endpoints, sent as X-Admin-Token; empty disables them
+    ADMIN_TOKEN: str = ""
+
+    # --- RAG Context Assembly Settings ---
+    # Dedupe, diversify (MMR) and token-budget the retrieved chunks before they go into the prompt
+    CONTEXT_ASSEMBLY_ENABLED: bool = True
+    CONTEXT_CANDIDATES: int = 8  # chunks retrieved for MMR to choose from
+    CONTEXT_MAX_CHUNKS: int = 5
+    CONTEXT_TOKEN_BUDGET: int = 1500
+    CONTEXT_MMR_LAMBDA: float = 0.7  # 1.0 = pure retrieval rank, 0.0 = pure diversity
+    CONTEXT_DUPLICATE_THRESHOLD: float = 0.8
+    CONTEXT_TOKENIZER: str = "cl100k_base"
+
+    # --- Query Embedding Cache Settings ---
+    # LRU of retrieval query embeddings; set a path prefix to keep it across restarts (<path>.npy + <path>.json)
+    QUERY_EMBEDDING_CACHE_ENABLED: bool = True
+    QUERY_EMBEDDING_CACHE_SIZE: int = 4096
+    QUERY_EMBEDDING_CACHE_PATH: str = ""
+
+    # --- Resume Extraction Settings ---
+    # PDF/DOCX parsing runs in a separate process pool so a pathological upload can't stall chat traffic
+    RESUME_EXTRACT_WORKERS: int = 2
+    RESUME_EXTRACT_TIMEOUT_SECONDS: float = 20.0
+    RESUME_EXTRACT_MEMORY_MB: int = 1024  # address-space cap per extraction process (0 = no cap)
+    RESUME_EXTRACT_MAX_PAGES: int = 20
+    RESUME_EXTRACT_MAX_CHARS: int = 60000  # longer extracted text is truncated before it leaves the worker
+
+    # --- Resume Upload Settings ---
+    # Uploads are streamed to a temp file (in RESUME_UPLOAD_TMP_DIR, default the system temp dir) and hashed on the way
+    RESUME_UPLOAD_MAX_MB: int = 10
+    RESUME_UPLOAD_TMP_DIR: str = ""
+
+    # --- Resume Job Queue Settings ---
+    # Uploads with ?background=true return a job id at once; the analysis runs on these in-process workers
+    RESUME_JOB_WORKERS: int = 2
+    RESUME_JOB_MAX_PENDING: int = 32  # further uploads get 503 until the queue drains
+    RESUME_JOB_RETENTION_SECONDS: float = 600.0  # finished jobs (and their events) are kept this long
+
+    # --- Resume Cache Settings ---
+    # Parsed text + analysis of uploaded resumes, keyed on a hash of the file bytes (SQLite, shared by all workers)
+    RESUME_CACHE_ENABLED: bool = True
+    RESUME_CACHE_PATH: str = "resume_cache.sqlite3"
+    RESUME_CACHE_MAX_MB: int = 64  # least recently used entries are evicted above this
+
     # This tells Pydantic to load the variables from a file named .env
     model_config = SettingsConfigDict(env_file=".env")
 
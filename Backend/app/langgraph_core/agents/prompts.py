@@ -1,14 +1,19 @@
 import nest_asyncio
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
 from langchain_community.tools.tavily_search import TavilySearchResults
 # from langchain_community.tools import DuckDuckGoSearchRun
 from ..utils.text_processing import preprocess_user_input
+from ..retrieval.embeddings import create_embeddings
+from ..cache.embedding_cache import CachedQueryEmbeddings, query_embedding_cache
+from ..retrieval.retriever import configured_retriever, load_configured_index
+from ..retrieval.index_manager import IndexManager
+from ..retrieval.context import build_rag_context
+from app.core.config import settings
 from langchain_core.runnables import RunnablePassthrough,RunnableLambda
+from pydantic.v1 import Field, BaseModel
     
 # --- THIS IS THE CRITICAL FIX ---
 # Apply the patch to allow nested event loops.
@@ -21,14 +26,26 @@ load_dotenv()
 # --- Shared Components ---
 llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.2)
 llm_creative = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.4)
+llm_advisor = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
 # Global variables to hold the RAG components
 retriever = None
+index_manager = None
 try:
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vector_store = FAISS.load_local("faiss_index", embeddings, allow_dangerous_deserialization=True)
-    retriever = vector_store.as_retriever(search_kwargs={"k": 5})
+    # Repeated questions reuse their query embedding instead of another embedding call
+    embeddings = CachedQueryEmbeddings(
+        create_embeddings(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL,
+                          device=settings.EMBEDDING_DEVICE, runtime=settings.EMBEDDING_RUNTIME),
+        query_embedding_cache,
+    )
+    # Memory-mapped so every worker on the host shares one copy of the index; the manager
+    # swaps in new index versions without a restart
+    index_manager = IndexManager(settings.VECTOR_INDEX_PATH, lambda folder: load_configured_index(folder, embeddings))
+    # A few extra candidates so context assembly has something to choose from
+    retriever = index_manager.attach(configured_retriever(
+        index_manager.load(), k=settings.CONTEXT_CANDIDATES if settings.CONTEXT_ASSEMBLY_ENABLED else 5))
     print("--- RAG Components Initialized Successfully ---")
 except Exception as e:
+    index_manager = None
     print(f"❌ FATAL ERROR: Failed to initialize RAG components: {e}")
 
 
@@ -234,8 +251,7 @@ def create_career_advisor_chain():
              Follow the protocols above strictly.]
             """
         )
-    llm_creative = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
-    rag_chain = prompt | llm_creative | StrOutputParser()
+    rag_chain = prompt | llm_advisor | StrOutputParser()
     def retrieve_and_stream(inputs: dict):
         """
         Retrieves context, and if no context is found, yields a
@@ -250,7 +266,7 @@ def create_career_advisor_chain():
             yield "I couldn't find specific information about that topic in my knowledge base. Could you try asking about a different career area?"
             return # Stop the generator
         
-        context = "\n\n".join([doc.page_content for doc in docs])
+        context = build_rag_context([doc.page_content for doc in docs])
     
         for token in rag_chain.stream({
             "context": context, 
@@ -258,11 +274,30 @@ def create_career_advisor_chain():
         }):
             yield token
 
-    return RunnableLambda(retrieve_and_stream)
-def create_resume_analyzer_chain():
-    """Creates the chain for the Resume Analyst agent with enhanced professional analysis."""
-    prompt = ChatPromptTemplate.from_template(
-    """
+    async def aretrieve_and_stream(inputs: dict):
+        """Async twin of `retrieve_and_stream`, used by `.astream()`/`.ainvoke()`."""
+        question = inputs["question"]
+        corrected_question = preprocess_user_input(question) 
+        
+        docs = await retriever.ainvoke(corrected_question)
+        
+        if not docs:
+            yield "I couldn't find specific information about that topic in my knowledge base. Could you try asking about a different career area?"
+            return
+        
+        context = build_rag_context([doc.page_content for doc in docs])
+    
+        async for token in rag_chain.astream({
+            "context": context, 
+            "question": question
+        }):
+            yield token
+
+    return RunnableLambda(retrieve_and_stream, afunc=aretrieve_and_stream)
+
+
+# Module-level so the resume cache can fingerprint the analysis it stores
+RESUME_ANALYZER_TEMPLATE = """
     # 🎯 **Professional Resume Analysis System**
     
     ## **Your Expert Identity**
@@ -533,7 +568,11 @@ def create_resume_analyzer_chain():
 
     **Success Probability:** [Likelihood of achieving career objectives with optimizations]
     """
-)
+
+
+def create_resume_analyzer_chain():
+    """Creates the chain for the Resume Analyst agent with enhanced professional analysis."""
+    prompt = ChatPromptTemplate.from_template(RESUME_ANALYZER_TEMPLATE)
     return prompt | llm_creative | StrOutputParser() 
 
 
@@ -1054,9 +1093,22 @@ def create_job_search_chain():
             print(f"Tavily API error: {e}")
             return f"The Job Search API encountered an error: {e}."
 
+    async def arun_tavily_search(inputs: dict):
+        """Async twin of `run_tavily_search` so `.astream()` doesn't block the event loop."""
+        skills = inputs.get("skills", "AI Engineer")
+        location = inputs.get("location", "United States")
+        query = f"latest job postings for '{skills}' in {location} on LinkedIn"
+        print(f"--- Running Tavily Job Search with query: {query} ---")
+        try:
+            search_results = await search_tool.ainvoke(query)
+            return "\n\n".join([str(result) for result in search_results])
+        except Exception as e:
+            print(f"Tavily API error: {e}")
+            return f"The Job Search API encountered an error: {e}."
+
     
     chain = RunnablePassthrough.assign(
-        search_results=run_tavily_search
+        search_results=RunnableLambda(run_tavily_search, afunc=arun_tavily_search)
     ) | prompt | llm_creative | StrOutputParser()
     
     return chain
@@ -1268,4 +1320,66 @@ def create_resume_qa_chain():
     **REMEMBER:** Always format your response with proper spacing, line breaks, and bullet points. Never run words together without spaces.
     """
 )
-    return prompt | llm | StrOutputParser()
\ No newline at end of file
+    return prompt | llm | StrOutputParser()
+
+
+class JobSearchParams(BaseModel):
+    """The parameters required for the Job Search agent."""
+    skills: str = Field(description="The job title or primary skills the user is looking for.")
+    location: str = Field(description="The geographic location the user wants to search in. Default to 'Not specified' if none is mentioned.")
+
+
+def create_learning_path_parser_chain():
+    """Creates the small, fast chain that turns a learning path request into JSON arguments."""
+    llm_parser = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
+    parser_prompt = ChatPromptTemplate.from_template(
+        """You are a highly efficient text-to-JSON converter. Your ONLY job is to extract information from the user's request and format it as a single, valid JSON object.
+        You MUST respond with ONLY the JSON object and nothing else. Do not add any conversational text, introductions, or Markdown formatting.
+
+        The JSON schema you must adhere to is:
+        {{"current_skills": "a comma-separated list of skills", "goal_role": "the user's desired job role"}}
+
+        - If no skills are mentioned, use "Not specified" for the current_skills value.
+        - If no goal role is mentioned, use "Not specified" for the goal_role value.
+
+        User Request: "{request}"
+
+        Your JSON Response:
+        """
+    )
+    return parser_prompt | llm_parser | StrOutputParser()
+
+
+def create_job_search_parser_chain():
+    """Creates the structured-output chain that extracts job search skills and location."""
+    llm_parser = ChatGroq(model="llama-3.1-8b-instant", temperature=0).with_structured_output(JobSearchParams)
+    parser_prompt = ChatPromptTemplate.from_messages([
+        ("system",
+         "You are a data extraction specialist. Your only job is to analyze the user's request and extract the 'skills' (job title) and 'location' into a JSON object that matches the `JobSearchParams` schema. Follow the examples precisely.\n\n"
+         "--- EXAMPLES ---\n"
+         "User Request: 'find me AI Engineer jobs in Pakistan'\n"
+         "Your JSON Response: {{\"skills\": \"AI Engineer\", \"location\": \"Pakistan\"}}\n\n"
+         "User Request: 'remote software developer positions'\n"
+         "Your JSON Response: {{\"skills\": \"software developer\", \"location\": \"Remote\"}}\n\n"
+         "User Request: 'what are some data science jobs?'\n"
+         "Your JSON Response: {{\"skills\": \"data science\", \"location\": \"Not specified\"}}\n"
+         "--- END EXAMPLES ---"
+        ),
+        ("user", "User Request: \"{request}\"")
+    ])
+    return parser_prompt | llm_parser
+
+
+def _model_params(model: ChatGroq) -> dict:
+    return {"model": model.model_name, "temperature": model.temperature}
+
+
+# The generation settings behind each agent chain. Anything that caches chain
+# output keys on these, so changing a model or temperature invalidates it.
+CHAIN_MODEL_PARAMS = {
+    "CareerAdvisor": _model_params(llm_advisor),
+    "ResumeAnalyst": _model_params(llm_creative),
+    "LearningPath": _model_params(llm_creative),
+    "JobSearch": _model_params(llm_creative),
+    "ResumeQAAgent": _model_params(llm),
+}
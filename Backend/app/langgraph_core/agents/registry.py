@@ -0,0 +1,85 @@
+# app/langgraph_core/agents/registry.py
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from langchain_core.runnables import Runnable
+
+from app.langgraph_core.agents.prompts import (
+    create_career_advisor_chain,
+    create_job_search_chain,
+    create_job_search_parser_chain,
+    create_learning_path_chain,
+    create_learning_path_parser_chain,
+    create_resume_analyzer_chain,
+    create_resume_qa_chain
+)
+
+
+class ChainRegistry:
+    """
+    Builds every agent chain once per process and hands out the shared instance.
+
+    LangChain runnables (prompt templates, ChatGroq clients, the Tavily tool) are
+    safe to share between threads, so one instance per chain keeps a single HTTP
+    connection pool per model instead of a new one on every request.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Runnable]]):
+        self._factories = dict(factories)
+        self._chains: Dict[str, Runnable] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._factories)
+
+    def get(self, name: str) -> Runnable:
+        """Return the shared chain for `name`, building it on first use."""
+        chain = self._chains.get(name)
+        if chain is not None:
+            return chain
+
+        if name not in self._factories:
+            raise KeyError(f"Unknown agent chain: {name}")
+
+        with self._lock:
+            # Another thread may have built it while we were waiting
+            chain = self._chains.get(name)
+            if chain is None:
+                started = time.perf_counter()
+                chain = self._factories[name]()
+                elapsed = time.perf_counter() - started
+                self._build_seconds[name] = elapsed
+                self._chains[name] = chain
+                print(f"--- CHAIN REGISTRY: Built {name} in {elapsed * 1000:.1f} ms ---")
+        return chain
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Build the given chains (all by default) and return their build times in seconds."""
+        for name in names or self._factories:
+            self.get(name)
+        return self.build_times()
+
+    def build_times(self) -> Dict[str, float]:
+        return dict(self._build_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "built": sorted(self._chains),
+            "pending": sorted(set(self._factories) - set(self._chains)),
+            "build_ms": {name: round(seconds * 1000, 2) for name, seconds in self._build_seconds.items()},
+        }
+
+
+# A single, global registry shared by the chat service and the LangGraph nodes
+chain_registry = ChainRegistry({
+    "CareerAdvisor": create_career_advisor_chain,
+    "ResumeAnalyst": create_resume_analyzer_chain,
+    "ResumeQAAgent": create_resume_qa_chain,
+    "LearningPath": create_learning_path_chain,
+    "JobSearch": create_job_search_chain,
+    "LearningPathParser": create_learning_path_parser_chain,
+    "JobSearchParser": create_job_search_parser_chain,
+})
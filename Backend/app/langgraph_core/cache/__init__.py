@@ -0,0 +1 @@
+# app/langgraph_core/cache/__init__.py
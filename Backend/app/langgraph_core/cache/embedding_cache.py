@@ -0,0 +1,157 @@
+# app/langgraph_core/cache/embedding_cache.py
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def _cache_key(text: str) -> str:
+    # Callers already typo-correct the question; fold case/whitespace/trailing punctuation
+    return " ".join(text.lower().split()).rstrip("?!. ")
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU of query embeddings (float32), keyed on normalized question text.
+
+    When `persist_path` is set the cache is written on shutdown as two files:
+    `<path>.npy` (one float32 row per entry) and `<path>.json` (the keys plus
+    the embedding backend they came from), and reloaded on the next start.
+    Entries from a different backend are ignored on load.
+    """
+
+    def __init__(self, maxsize: int, persist_path: str = "", enabled: bool = True):
+        self.maxsize = maxsize
+        self.persist_path = persist_path
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._spec: Optional[dict] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._miss_seconds = 0.0
+
+    # --- Lookups ---
+    def get(self, text: str) -> Optional[np.ndarray]:
+        if not self.enabled:
+            return None
+        key = _cache_key(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def set(self, text: str, vector, embed_seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._miss_seconds += embed_seconds
+            self._entries[_cache_key(text)] = np.asarray(vector, dtype=np.float32)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # --- Persistence ---
+    def bind(self, spec: dict):
+        """Ties the cache to one embedding backend, loading any persisted entries made with it."""
+        with self._lock:
+            self._spec = spec
+            self._entries.clear()
+        if not self.persist_path or not os.path.exists(self.persist_path + ".json"):
+            return
+        try:
+            with open(self.persist_path + ".json") as f:
+                meta = json.load(f)
+            if meta.get("spec") != spec:
+                print(f"--- QUERY EMBEDDING CACHE: {self.persist_path} was built with another embedding backend; ignoring it ---")
+                return
+            vectors = np.load(self.persist_path + ".npy")
+            with self._lock:
+                for key, vector in zip(meta["keys"][-self.maxsize:], vectors[-self.maxsize:]):
+                    self._entries[key] = vector
+            print(f"--- QUERY EMBEDDING CACHE: Loaded {len(self._entries)} entries from {self.persist_path} ---")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"--- QUERY EMBEDDING CACHE: Could not load {self.persist_path}: {e} ---")
+
+    def save(self):
+        if not self.persist_path or self._spec is None:
+            return
+        with self._lock:
+            keys = list(self._entries)
+            vectors = np.stack(list(self._entries.values())) if keys else np.zeros((0, 0), dtype=np.float32)
+        with open(self.persist_path + ".npy.tmp", "wb") as f:
+            np.save(f, vectors.astype(np.float32))
+        with open(self.persist_path + ".json.tmp", "w") as f:
+            json.dump({"spec": self._spec, "keys": keys}, f)
+        os.replace(self.persist_path + ".npy.tmp", self.persist_path + ".npy")
+        os.replace(self.persist_path + ".json.tmp", self.persist_path + ".json")
+        print(f"--- QUERY EMBEDDING CACHE: Saved {len(keys)} entries to {self.persist_path} ---")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_embed_ms = self._miss_seconds * 1000 / self.misses if self.misses else 0.0
+            return {
+                "size": len(self._entries),
+                "max_size": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "avg_embed_ms": round(avg_embed_ms, 2),
+                # Every hit skipped one embedding call of roughly average cost
+                "saved_ms_estimate": round(self.hits * avg_embed_ms, 1),
+                "persist_path": self.persist_path or None,
+            }
+
+
+class CachedQueryEmbeddings:
+    """
+    Wraps an embedding backend so `embed_query`/`aembed_query` go through the
+    query cache. Document embedding (indexing) is passed straight through.
+    """
+
+    def __init__(self, embeddings, cache: QueryEmbeddingCache):
+        self._embeddings = embeddings
+        self._cache = cache
+        self.spec = getattr(embeddings, "spec", None)
+        cache.bind(self.spec or {})
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = self._cache.get(text)
+        if vector is not None:
+            return vector.tolist()
+        started = time.perf_counter()
+        result = self._embeddings.embed_query(text)
+        self._cache.set(text, result, time.perf_counter() - started)
+        return result
+
+    async def aembed_query(self, text: str) -> list[float]:
+        vector = self._cache.get(text)
+        if vector is not None:
+            return vector.tolist()
+        started = time.perf_counter()
+        result = await self._embeddings.aembed_query(text)
+        self._cache.set(text, result, time.perf_counter() - started)
+        return result
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self._embeddings.aembed_documents(texts)
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    maxsize=settings.QUERY_EMBEDDING_CACHE_SIZE,
+    persist_path=settings.QUERY_EMBEDDING_CACHE_PATH,
+    enabled=settings.QUERY_EMBEDDING_CACHE_ENABLED,
+)
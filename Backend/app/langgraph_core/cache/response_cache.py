@@ -0,0 +1,67 @@
+# app/langgraph_core/cache/response_cache.py
+import json
+from typing import Optional
+
+from app.core.config import settings
+from app.langgraph_core.agents.prompts import CHAIN_MODEL_PARAMS
+from app.langgraph_core.cache.ttl_cache import TTLLRUCache
+from app.langgraph_core.utils.text_processing import preprocess_user_input
+
+# Inputs that carry a user's own resume. Answers built from them are personal
+# and must never be served to anyone else.
+PERSONALIZED_KEYS = ("resume_text", "resume_context")
+
+
+def normalize_text(text: str) -> str:
+    """Typo-corrects, lowercases and collapses whitespace so trivial variants share a key."""
+    corrected = preprocess_user_input(text)
+    return " ".join(corrected.lower().split()).rstrip("?!. ")
+
+
+class ResponseCache:
+    """
+    Exact-match cache for complete agent answers, keyed on the chain name, the
+    normalized chain input and the model parameters behind the chain.
+    """
+
+    def __init__(self, cacheable_agents: set[str], maxsize: int, ttl_seconds: float, enabled: bool = True):
+        self.cacheable_agents = cacheable_agents
+        self.enabled = enabled
+        self._store = TTLLRUCache("responses", maxsize, ttl_seconds)
+        self.skipped = 0
+
+    def make_key(self, chain_name: str, inputs: dict) -> Optional[str]:
+        """Returns the cache key for this call, or None when it must not be cached."""
+        if not self.enabled or chain_name not in self.cacheable_agents:
+            return None
+        if any(inputs.get(key) for key in PERSONALIZED_KEYS):
+            self.skipped += 1
+            return None
+
+        normalized = {
+            name: normalize_text(value) if isinstance(value, str) else value
+            for name, value in sorted(inputs.items())
+        }
+        return json.dumps(
+            [chain_name, normalized, CHAIN_MODEL_PARAMS.get(chain_name, {})],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        return self._store.get(key) if key else None
+
+    def set(self, key: Optional[str], response: str):
+        if key and response:
+            self._store.set(key, response)
+
+    def stats(self) -> dict:
+        return {**self._store.stats(), "skipped_personalized": self.skipped}
+
+
+response_cache = ResponseCache(
+    cacheable_agents={name.strip() for name in settings.RESPONSE_CACHE_AGENTS.split(",") if name.strip()},
+    maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
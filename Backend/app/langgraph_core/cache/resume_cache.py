@@ -0,0 +1,192 @@
+# app/langgraph_core/cache/resume_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.langgraph_core.agents.prompts import CHAIN_MODEL_PARAMS, RESUME_ANALYZER_TEMPLATE
+
+try:
+    import xxhash
+
+    HASH_NAME = "xxh128"
+
+    def new_hasher():
+        return xxhash.xxh3_128()
+except ImportError:  # listed in requirements.txt; hashlib keeps the cache working without it
+    import hashlib
+
+    HASH_NAME = "blake2b"
+
+    def new_hasher():
+        return hashlib.blake2b(digest_size=16)
+
+
+def content_digest(source) -> str:
+    """Digest of an upload's bytes, or of the file at a path (read in chunks)."""
+    hasher = new_hasher()
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+    else:
+        hasher.update(source)
+    return f"{HASH_NAME}:{hasher.hexdigest()}"
+
+
+# Stored with each analysis, so editing the analyzer prompt stops old analyses being served
+_ANALYZER_PROMPT_DIGEST = hashlib.sha256(RESUME_ANALYZER_TEMPLATE.encode("utf-8")).hexdigest()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    file_hash TEXT PRIMARY KEY,
+    resume_text TEXT NOT NULL,
+    analysis TEXT,
+    analysis_fingerprint TEXT,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+class ResumeCache:
+    """
+    Persistent cache of parsed resume text and its ResumeAnalyst analysis, keyed
+    on a hash of the uploaded bytes, so re-uploading the same file to another
+    session skips both extraction and the 70B analysis call.
+
+    Stored in SQLite (WAL, shared by every worker on the host). When the stored
+    text exceeds `max_bytes` the least recently used entries are evicted. An
+    analysis is only reused while the analyzer's model parameters and prompt
+    template are unchanged; extraction limits are part of the key, so changing
+    them re-parses.
+    """
+
+    def __init__(self, path: str, max_bytes: int, enabled: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled and bool(path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.analysis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def file_key(digest: str) -> str:
+        """Cache key of a file with the given `content_digest`."""
+        return f"{digest}:{settings.RESUME_EXTRACT_MAX_PAGES}:{settings.RESUME_EXTRACT_MAX_CHARS}"
+
+    @staticmethod
+    def _fingerprint() -> str:
+        return json.dumps({
+            **CHAIN_MODEL_PARAMS.get("ResumeAnalyst", {}),
+            "prompt": _ANALYZER_PROMPT_DIGEST,
+        }, sort_keys=True)
+
+    def get(self, key: str) -> Optional[tuple[str, Optional[str]]]:
+        """Returns (resume_text, analysis or None), or None when the file was never parsed."""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute("SELECT resume_text, analysis, analysis_fingerprint FROM resumes WHERE file_hash = ?",
+                                 (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                db.execute("UPDATE resumes SET last_used = ? WHERE file_hash = ?", (time.time(), key))
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"--- RESUME CACHE: Lookup failed: {e} ---")
+            return None
+        resume_text, analysis, fingerprint = row
+        self.hits += 1
+        if analysis is not None and fingerprint == self._fingerprint():
+            self.analysis_hits += 1
+            return resume_text, analysis
+        return resume_text, None
+
+    def set(self, key: str, resume_text: str, analysis: Optional[str] = None):
+        """Stores the extracted text, and the analysis once there is one. Errors are never cached."""
+        if not self.enabled or resume_text.startswith("Error:"):
+            return
+        if analysis is not None and analysis.startswith("Error:"):
+            analysis = None
+        size = len(resume_text.encode("utf-8")) + len((analysis or "").encode("utf-8"))
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "INSERT INTO resumes (file_hash, resume_text, analysis, analysis_fingerprint, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(file_hash) DO UPDATE SET resume_text = excluded.resume_text, "
+                    "analysis = COALESCE(excluded.analysis, resumes.analysis), "
+                    "analysis_fingerprint = COALESCE(excluded.analysis_fingerprint, resumes.analysis_fingerprint), "
+                    "size = excluded.size, last_used = excluded.last_used",
+                    (key, resume_text, analysis, self._fingerprint() if analysis is not None else None, size, time.time()),
+                )
+                self._evict(db)
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"--- RESUME CACHE: Store failed: {e} ---")
+
+    def _evict(self, db: sqlite3.Connection):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for file_hash, size in db.execute("SELECT file_hash, size FROM resumes ORDER BY last_used ASC"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((file_hash,))
+            freed += size
+        db.executemany("DELETE FROM resumes WHERE file_hash = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> dict:
+        entries, total = 0, 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    entries, total = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resumes").fetchone()
+            except sqlite3.Error:
+                pass
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "analysis_hits": self.analysis_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "hash": HASH_NAME,
+        }
+
+
+resume_cache = ResumeCache(
+    path=settings.RESUME_CACHE_PATH,
+    max_bytes=settings.RESUME_CACHE_MAX_MB * 1024 * 1024,
+    enabled=settings.RESUME_CACHE_ENABLED,
+)
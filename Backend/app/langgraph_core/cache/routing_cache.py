@@ -0,0 +1,42 @@
+# app/langgraph_core/cache/routing_cache.py
+from typing import Optional
+
+from app.core.config import settings
+from app.langgraph_core.cache.ttl_cache import TTLLRUCache
+from app.langgraph_core.utils.text_processing import preprocess_user_input
+
+
+class RoutingDecisionCache:
+    """
+    Remembers the supervisor LLM's decision for a prompt so repeated intents
+    ("find jobs for me", "thanks") skip the routing round trip. The key is the
+    typo-corrected prompt (case-folded) plus whether a resume is loaded, since
+    the same words route differently with and without one.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float, enabled: bool = True):
+        self.enabled = enabled
+        self._store = TTLLRUCache("routing_decisions", maxsize, ttl_seconds)
+
+    @staticmethod
+    def make_key(prompt: str, resume_exists: bool) -> tuple[str, bool]:
+        return preprocess_user_input(prompt).strip().lower(), resume_exists
+
+    def get(self, prompt: str, resume_exists: bool) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self._store.get(self.make_key(prompt, resume_exists))
+
+    def set(self, prompt: str, resume_exists: bool, decision: str):
+        if self.enabled:
+            self._store.set(self.make_key(prompt, resume_exists), decision)
+
+    def stats(self) -> dict:
+        return self._store.stats()
+
+
+routing_cache = RoutingDecisionCache(
+    maxsize=settings.ROUTING_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ROUTING_CACHE_TTL_SECONDS,
+    enabled=settings.ROUTING_CACHE_ENABLED,
+)
@@ -0,0 +1,240 @@
+# app/langgraph_core/cache/semantic_cache.py
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+import faiss
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+from app.langgraph_core.utils.text_processing import preprocess_user_input
+
+# Chains whose inputs are the question plus arguments parsed out of it. JobSearch
+# and the resume chains also read the user's resume, so they are never served
+# someone else's answer.
+SEMANTIC_CHAINS = frozenset({"CareerAdvisor", "LearningPath"})
+
+# Technologies and fields an answer is specific to, by alias. Prompts that
+# differ only in one of these ("I know Python..." / "I know Java...") embed as
+# close paraphrases, so they have to match exactly before similarity counts.
+TECHNOLOGY_ALIASES = {
+    "python": "python", "java": "java", "javascript": "javascript", "js": "javascript",
+    "typescript": "typescript", "ts": "typescript", "c++": "c++", "cpp": "c++", "c#": "c#",
+    "csharp": "c#", ".net": ".net", "dotnet": ".net", "golang": "go", "rust": "rust", "kotlin": "kotlin",
+    "swift": "swift", "scala": "scala", "ruby": "ruby", "php": "php", "sql": "sql", "nosql": "nosql",
+    "html": "html", "css": "css", "react": "react", "angular": "angular", "vue": "vue", "node": "node.js",
+    "node.js": "node.js", "nodejs": "node.js", "django": "django", "flask": "flask", "fastapi": "fastapi",
+    "spring": "spring", "aws": "aws", "azure": "azure", "gcp": "gcp", "docker": "docker",
+    "kubernetes": "kubernetes", "k8s": "kubernetes", "linux": "linux", "spark": "spark", "hadoop": "hadoop",
+    "tensorflow": "tensorflow", "pytorch": "pytorch", "excel": "excel", "tableau": "tableau",
+    "ml": "ml", "machine learning": "ml", "ai": "ai", "artificial intelligence": "ai",
+    "deep learning": "deep learning", "nlp": "nlp", "computer vision": "computer vision",
+    "data science": "data science", "data scientist": "data science", "data engineering": "data engineering",
+    "data engineer": "data engineering", "data analyst": "data analysis", "data analysis": "data analysis",
+    "devops": "devops", "mlops": "mlops", "cloud": "cloud", "cybersecurity": "security", "security": "security",
+    "frontend": "frontend", "front-end": "frontend", "backend": "backend", "back-end": "backend",
+    "full-stack": "full stack", "fullstack": "full stack", "full stack": "full stack",
+    "android": "android", "ios": "ios", "blockchain": "blockchain",
+}
+_LONGEST_ALIAS = max(len(alias.split()) for alias in TECHNOLOGY_ALIASES)
+_WORD_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#.\-]*")
+
+
+def technology_terms(text: str) -> frozenset[str]:
+    """The canonical technology terms mentioned in `text`."""
+    words = [word.rstrip(".-") for word in _WORD_RE.findall(text.lower())]
+    terms = set()
+    for start in range(len(words)):
+        for length in range(1, _LONGEST_ALIAS + 1):
+            term = TECHNOLOGY_ALIASES.get(" ".join(words[start:start + length]))
+            if term:
+                terms.add(term)
+    return frozenset(terms)
+
+
+class _Namespace:
+    """One FAISS inner-product index of past questions for a single agent chain."""
+
+    def __init__(self, dim: int):
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        # id -> (question, answer, expires_at, scope); ordered oldest-used first
+        self.entries: "OrderedDict[int, tuple[str, str, float, Hashable]]" = OrderedDict()
+        # scope -> ids of the entries stored under it
+        self.scopes: dict[Hashable, set[int]] = {}
+        self.next_id = 0
+
+    def remove(self, entry_ids: list[int]):
+        if not entry_ids:
+            return
+        for entry_id in entry_ids:
+            entry = self.entries.pop(entry_id, None)
+            if entry is not None:
+                scoped = self.scopes[entry[3]]
+                scoped.discard(entry_id)
+                if not scoped:
+                    del self.scopes[entry[3]]
+        self.index.remove_ids(np.asarray(entry_ids, dtype=np.int64))
+
+
+class SemanticResponseCache:
+    """
+    Nearest-neighbour cache of agent answers. Each incoming question is embedded
+    and compared (cosine similarity) with previously answered questions for the
+    same chain and scope (see `scope`); a stored answer is returned when the best
+    match clears `threshold`. Entries expire after `ttl_seconds` and the least
+    recently used ones are evicted once a chain holds `maxsize` entries.
+    """
+
+    def __init__(self, embeddings_provider: Callable[[], Optional[Embeddings]], cacheable_agents: set[str],
+                 threshold: float, maxsize: int, ttl_seconds: float, enabled: bool = True):
+        self._embeddings_provider = embeddings_provider
+        refused = set(cacheable_agents) - SEMANTIC_CHAINS
+        if refused:
+            print(f"--- SEMANTIC CACHE: Not caching {sorted(refused)}; their answers depend on the user's resume ---")
+        self.cacheable_agents = set(cacheable_agents) & SEMANTIC_CHAINS
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._namespaces: dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def applies_to(self, chain_name: str) -> bool:
+        return self.enabled and chain_name in self.cacheable_agents
+
+    @staticmethod
+    def scope(question: str, inputs: dict) -> Hashable:
+        """
+        What a stored answer has to share exactly with a new question before
+        their embeddings are compared: the technology terms in the question and,
+        per parsed argument (LearningPath's current_skills and goal_role), its
+        terms, or its normalised text when it names none.
+        """
+        parts = [("question", technology_terms(question))]
+        for field, value in sorted(inputs.items()):
+            if field == "question":
+                continue
+            value = str(value)
+            parts.append((field, technology_terms(value) or " ".join(value.lower().split())))
+        return tuple(parts)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(array)
+        return array
+
+    def embed(self, question: str) -> Optional[np.ndarray]:
+        embeddings = self._embeddings_provider()
+        if embeddings is None:
+            return None
+        try:
+            return self._normalize(embeddings.embed_query(preprocess_user_input(question)))
+        except Exception as e:
+            self.errors += 1
+            print(f"--- SEMANTIC CACHE: embedding failed: {e} ---")
+            return None
+
+    async def aembed(self, question: str) -> Optional[np.ndarray]:
+        embeddings = self._embeddings_provider()
+        if embeddings is None:
+            return None
+        try:
+            return self._normalize(await embeddings.aembed_query(preprocess_user_input(question)))
+        except Exception as e:
+            self.errors += 1
+            print(f"--- SEMANTIC CACHE: embedding failed: {e} ---")
+            return None
+
+    def lookup(self, chain_name: str, vector: Optional[np.ndarray], scope: Hashable) -> Optional[str]:
+        """Returns the stored answer in `scope` closest to `vector` if it is similar enough."""
+        if vector is None:
+            return None
+        now = time.time()
+        with self._lock:
+            namespace = self._namespaces.get(chain_name)
+            scoped = namespace.scopes.get(scope) if namespace is not None else None
+            if not scoped:
+                self.misses += 1
+                return None
+
+            # Only the entries stored under the same scope are scanned
+            selector = faiss.IDSelectorBatch(np.fromiter(scoped, dtype=np.int64, count=len(scoped)))
+            k = min(4, len(scoped))
+            scores, ids = namespace.index.search(vector, k, params=faiss.SearchParameters(sel=selector))
+            expired = []
+            answer = None
+            for score, entry_id in zip(scores[0], ids[0]):
+                if entry_id < 0 or score < self.threshold:
+                    break
+                entry = namespace.entries.get(int(entry_id))
+                if entry is None:
+                    continue
+                if entry[2] < now:
+                    expired.append(int(entry_id))
+                    continue
+                namespace.entries.move_to_end(int(entry_id))
+                answer = entry[1]
+                break
+            namespace.remove(expired)
+
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return answer
+
+    def store(self, chain_name: str, question: str, answer: str, vector: Optional[np.ndarray], scope: Hashable):
+        if vector is None or not answer:
+            return
+        with self._lock:
+            namespace = self._namespaces.get(chain_name)
+            if namespace is None:
+                namespace = self._namespaces[chain_name] = _Namespace(vector.shape[1])
+
+            entry_id = namespace.next_id
+            namespace.next_id += 1
+            namespace.index.add_with_ids(vector, np.asarray([entry_id], dtype=np.int64))
+            namespace.entries[entry_id] = (question, answer, time.time() + self.ttl_seconds, scope)
+            namespace.scopes.setdefault(scope, set()).add(entry_id)
+
+            overflow = len(namespace.entries) - self.maxsize
+            if overflow > 0:
+                namespace.remove(list(namespace.entries)[:overflow])
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": "semantic_responses",
+                "threshold": self.threshold,
+                "max_size": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "size": {name: len(ns.entries) for name, ns in self._namespaces.items()},
+                "hits": self.hits,
+                "misses": self.misses,
+                "embedding_errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _shared_embeddings() -> Optional[Embeddings]:
+    # Reuse the embedding client the RAG retriever was built with
+    from app.langgraph_core.agents import prompts
+    return getattr(prompts, "embeddings", None)
+
+
+semantic_cache = SemanticResponseCache(
+    embeddings_provider=_shared_embeddings,
+    cacheable_agents={name.strip() for name in settings.SEMANTIC_CACHE_AGENTS.split(",") if name.strip()},
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    maxsize=settings.SEMANTIC_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+    enabled=settings.SEMANTIC_CACHE_ENABLED,
+)
@@ -0,0 +1,236 @@
+# app/langgraph_core/intent_classifier.py
+"""
+CPU-only first-stage router for the supervisor.
+
+A TF-IDF (word unigrams + bigrams) softmax-regression model trained on logged
+routing decisions. When it is confident it answers in microseconds; otherwise
+the supervisor falls back to the 70B LLM router.
+
+Offline usage (from the Backend directory):
+    python -m app.langgraph_core.intent_classifier train --log routing_log.jsonl --out intent_model.npz
+    python -m app.langgraph_core.intent_classifier evaluate --log routing_log.jsonl --model intent_model.npz
+
+Only numpy is needed, so this module stays importable without the LLM stack.
+"""
+import argparse
+import json
+import math
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+from app.langgraph_core.routing_log import read_routing_log
+from app.langgraph_core.utils.text_processing import preprocess_user_input
+
+LABELS = ["ResumeAnalyst", "ResumeQAAgent", "CareerAdvisor", "LearningPath", "JobSearch", "IRRELEVANT", "END"]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.'-]*")
+
+
+def _tokens(text: str, resume_exists: bool) -> list[str]:
+    words = [word.rstrip(".'-") for word in _TOKEN_PATTERN.findall(text.lower())]
+    words = [word for word in words if word]
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    # Resume presence changes the right answer for many prompts ("my skills")
+    features.append("__resume_yes__" if resume_exists else "__resume_no__")
+    return features
+
+
+class IntentClassifier:
+    """TF-IDF features + multinomial logistic regression, stored as a single .npz file."""
+
+    def __init__(self, vocabulary: dict[str, int], idf: np.ndarray, weights: np.ndarray,
+                 bias: np.ndarray, labels: list[str]):
+        self.vocabulary = vocabulary
+        self.idf = idf.astype(np.float32)
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.labels = labels
+
+    # --- Features ---
+    def _sparse(self, text: str, resume_exists: bool) -> tuple[np.ndarray, np.ndarray]:
+        counts = Counter(self.vocabulary[t] for t in _tokens(text, resume_exists) if t in self.vocabulary)
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        values = (1.0 + np.log(tf)) * self.idf[indices]
+        values /= np.linalg.norm(values) or 1.0
+        return indices, values
+
+    def _csr(self, samples: list[tuple[str, bool]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Feature rows of `samples` as CSR arrays (indptr, indices, values); memory grows with the non-zeros only."""
+        rows = [self._sparse(text, resume_exists) for text, resume_exists in samples]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(indices) for indices, _ in rows])
+        indices = np.concatenate([indices for indices, _ in rows]) if rows else np.zeros(0, dtype=np.int64)
+        values = np.concatenate([values for _, values in rows]) if rows else np.zeros(0, dtype=np.float32)
+        return indptr, indices, values
+
+    # --- Inference ---
+    def predict(self, text: str, resume_exists: bool) -> tuple[str, float]:
+        """Returns (label, probability) for a single prompt."""
+        indices, values = self._sparse(text, resume_exists)
+        logits = self.bias + values @ self.weights[indices]
+        logits = logits - logits.max()
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    # --- Training ---
+    @classmethod
+    def train(cls, samples: list[tuple[str, bool]], labels: list[str], epochs: int = 60,
+              learning_rate: float = 4.0, l2: float = 1e-4, min_df: int = 1, batch_size: int = 64,
+              seed: int = 0) -> "IntentClassifier":
+        label_names = [name for name in LABELS if name in set(labels)]
+        document_frequency = Counter()
+        for text, resume_exists in samples:
+            document_frequency.update(set(_tokens(text, resume_exists)))
+        terms = sorted(term for term, df in document_frequency.items() if df >= min_df)
+        vocabulary = {term: index for index, term in enumerate(terms)}
+        n = len(samples)
+        idf = np.array([math.log((1 + n) / (1 + document_frequency[t])) + 1.0 for t in terms], dtype=np.float32)
+
+        model = cls(vocabulary, idf, np.zeros((len(terms), len(label_names))), np.zeros(len(label_names)), label_names)
+        indptr, indices, values = model._csr(samples)
+        targets = np.zeros((n, len(label_names)), dtype=np.float32)
+        targets[np.arange(n), [label_names.index(label) for label in labels]] = 1.0
+
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            order = rng.permutation(n)
+            for start in range(0, n, batch_size):
+                batch = order[start:start + batch_size]
+                # Non-zeros of the batch rows: (row within the batch, feature column, value)
+                spans = [np.arange(indptr[i], indptr[i + 1]) for i in batch]
+                rows = np.repeat(np.arange(len(batch)), [len(span) for span in spans])
+                nonzero = np.concatenate(spans)
+                columns, x = indices[nonzero], values[nonzero, None]
+
+                logits = np.tile(model.bias, (len(batch), 1))
+                np.add.at(logits, rows, x * model.weights[columns])
+                logits -= logits.max(axis=1, keepdims=True)
+                probabilities = np.exp(logits)
+                probabilities /= probabilities.sum(axis=1, keepdims=True)
+                error = (probabilities - targets[batch]) / len(batch)
+                gradient = l2 * model.weights
+                np.add.at(gradient, columns, x * error[rows])
+                model.weights -= learning_rate * gradient
+                model.bias -= learning_rate * error.sum(axis=0)
+        return model
+
+    # --- Persistence ---
+    def save(self, path: str):
+        terms = [None] * len(self.vocabulary)
+        for term, index in self.vocabulary.items():
+            terms[index] = term
+        np.savez_compressed(
+            path,
+            terms=np.array(json.dumps(terms)),
+            labels=np.array(json.dumps(self.labels)),
+            idf=self.idf,
+            weights=self.weights,
+            bias=self.bias,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with np.load(path) as data:
+            terms = json.loads(str(data["terms"]))
+            return cls(
+                vocabulary={term: index for index, term in enumerate(terms)},
+                idf=data["idf"],
+                weights=data["weights"],
+                bias=data["bias"],
+                labels=json.loads(str(data["labels"])),
+            )
+
+
+# --- Offline train / evaluate command ---
+
+def _samples(records: list[dict]) -> tuple[list[tuple[str, bool]], list[str]]:
+    kept = [r for r in records if r.get("decision") in LABELS and r.get("prompt")]
+    # The log holds the raw prompt; the supervisor predicts on the preprocessed one
+    return [(preprocess_user_input(r["prompt"]), bool(r.get("resume_exists"))) for r in kept], [r["decision"] for r in kept]
+
+
+def _in_holdout(record: dict, fraction: float) -> bool:
+    # Deterministic split so the same prompt never lands on both sides
+    return (zlib.crc32(record["prompt"].encode("utf-8")) % 10_000) < fraction * 10_000
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+def evaluate(model: IntentClassifier, records: list[dict], threshold: float) -> dict:
+    samples, labels = _samples(records)
+    correct = confident = confident_correct = 0
+    latencies_ms = []
+    for (text, resume_exists), expected in zip(samples, labels):
+        started = time.perf_counter()
+        predicted, probability = model.predict(text, resume_exists)
+        latencies_ms.append((time.perf_counter() - started) * 1000)
+        correct += predicted == expected
+        if probability >= threshold:
+            confident += 1
+            confident_correct += predicted == expected
+
+    llm_latencies = [r["latency_ms"] for r in records if r.get("source") == "llm" and "latency_ms" in r]
+    total = len(samples)
+    return {
+        "samples": total,
+        "threshold": threshold,
+        "accuracy": round(correct / total, 4) if total else 0.0,
+        "coverage": round(confident / total, 4) if total else 0.0,
+        "accuracy_when_confident": round(confident_correct / confident, 4) if confident else 0.0,
+        "classifier_latency_ms": {"p50": _percentile(latencies_ms, 50), "p95": _percentile(latencies_ms, 95)},
+        "llm_latency_ms": {"p50": _percentile(llm_latencies, 50), "p95": _percentile(llm_latencies, 95)},
+    }
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Train or evaluate the local supervisor intent classifier.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_cmd = commands.add_parser("train", help="Fit a model on logged routing decisions.")
+    train_cmd.add_argument("--log", required=True, help="Routing log (JSONL) written by the supervisor.")
+    train_cmd.add_argument("--out", required=True, help="Where to write the .npz model.")
+    train_cmd.add_argument("--sources", default="llm", help="Comma-separated decision sources to learn from.")
+    train_cmd.add_argument("--holdout", type=float, default=0.2, help="Fraction of prompts kept for evaluation.")
+    train_cmd.add_argument("--epochs", type=int, default=60)
+    train_cmd.add_argument("--min-df", type=int, default=1)
+    train_cmd.add_argument("--threshold", type=float, default=0.85)
+
+    eval_cmd = commands.add_parser("evaluate", help="Score a model against a routing log.")
+    eval_cmd.add_argument("--log", required=True)
+    eval_cmd.add_argument("--model", required=True)
+    eval_cmd.add_argument("--sources", default="llm")
+    eval_cmd.add_argument("--threshold", type=float, default=0.85)
+
+    args = parser.parse_args(argv)
+    records = read_routing_log(args.log, set(args.sources.split(",")))
+
+    if args.command == "train":
+        train_records = [r for r in records if not _in_holdout(r, args.holdout)]
+        holdout_records = [r for r in records if _in_holdout(r, args.holdout)]
+        samples, labels = _samples(train_records)
+        if not samples:
+            raise SystemExit(f"No usable training records in {args.log}")
+        model = IntentClassifier.train(samples, labels, epochs=args.epochs, min_df=args.min_df)
+        model.save(args.out)
+        print(f"Trained on {len(samples)} decisions, {len(model.vocabulary)} features -> {args.out}")
+        if holdout_records:
+            print(json.dumps(evaluate(model, holdout_records, args.threshold), indent=2))
+    else:
+        model = IntentClassifier.load(args.model)
+        print(json.dumps(evaluate(model, records, args.threshold), indent=2))
+
+
+if __name__ == "__main__":
+    main()
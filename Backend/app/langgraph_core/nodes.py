@@ -1,7 +1,7 @@
 import os,json,re
 import operator
 import re
-from io import BytesIO
+import time
 from typing import TypedDict, Annotated, Sequence,Any,Literal,Dict
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
@@ -9,15 +9,14 @@ from langgraph.graph import StateGraph, END
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import StrOutputParser
 from pydantic.v1 import Field,BaseModel
-from app.langgraph_core.agents.prompts import (
-    create_resume_analyzer_chain,
-    create_resume_qa_chain,
-    create_career_advisor_chain,
-    create_learning_path_chain,
-    create_job_search_chain
-)
-from app.langgraph_core.utils.file_parser import extract_text_from_file
+from app.langgraph_core.agents.registry import chain_registry
+from app.langgraph_core.utils.file_parser import extract_resume_text
 from app.langgraph_core.utils.text_processing import preprocess_user_input
+from app.langgraph_core.routing_rules import match_resume_followup
+from app.langgraph_core.routing_log import RoutingLog
+from app.langgraph_core.intent_classifier import IntentClassifier
+from app.langgraph_core.cache.routing_cache import routing_cache
+from app.core.config import settings
 
 # --- 1. State definition is correct ---
 class AgentState(TypedDict):
@@ -38,252 +37,306 @@ class JobSearchParams(BaseModel):
 
 llm_parser = ChatGroq(model="llama-3.1-8b-instant", temperature=0).with_structured_output(JobSearchParams)
 
-# --- 2. Initialization is correct ---
-resume_analyzer_agent = create_resume_analyzer_chain()
-career_advisor_agent = create_career_advisor_chain()
-learning_path_agent = create_learning_path_chain()
-job_search_agent = create_job_search_chain()
-resume_qa_agent = create_resume_qa_chain()
+# --- 2. Initialization: shared instances from the process-wide chain registry ---
+resume_analyzer_agent = chain_registry.get("ResumeAnalyst")
+career_advisor_agent = chain_registry.get("CareerAdvisor")
+learning_path_agent = chain_registry.get("LearningPath")
+job_search_agent = chain_registry.get("JobSearch")
+resume_qa_agent = chain_registry.get("ResumeQAAgent")
 
 supervisor_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0)
 
+# Enhanced prompt with better resume follow-up detection.
+# Built once at import; only the per-request variables change between calls.
+supervisor_prompt = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are **NEXUS**, a strict AI routing specialist. Your ONLY function is to output exactly ONE word from this list: `ResumeAnalyst`, `ResumeQAAgent`, `CareerAdvisor`, `LearningPath`, `JobSearch`, `IRRELEVANT`, `END`.\n\n"
+
+     "🚨 **ABSOLUTE CONSTRAINTS:** 🚨\n"
+     "- You MUST output exactly ONE word, nothing else\n"
+     "- You CANNOT provide explanations, advice, or content\n"
+     "- You CANNOT answer the user's question directly\n"
+     "- You CANNOT add punctuation, quotes, or formatting\n"
+     "- If you output anything other than the exact agent name, you have FAILED\n"
+     "- Your response must be exactly: ResumeAnalyst OR ResumeQAAgent OR CareerAdvisor OR LearningPath OR JobSearch OR IRRELEVANT OR END\n\n"
+
+     "**ENHANCED ROUTING DECISION TREE (Follow this exact sequence):**\n\n"
+
+     "0️⃣ **RELEVANCE FILTER CHECK (FIRST PRIORITY):**\n"
+     "   ➤ Is this request related to careers, technology, professional development, jobs, or education?\n\n"
+
+     "   **IRRELEVANT TOPICS (Output: IRRELEVANT):**\n"
+     "   🚫 Personal relationships, dating, romance\n"
+     "   🚫 Medical advice, health diagnoses, mental health treatment\n"
+     "   🚫 Legal advice, financial investment advice\n"
+     "   🚫 Politics, controversial social issues\n"
+     "   🚫 Entertainment content (movies, games, sports) unrelated to tech careers\n"
+     "   🚫 Cooking, recipes, food (unless tech industry related)\n"
+     "   🚫 Travel planning (unless for work/conferences)\n"
+     "   🚫 General trivia, random facts unrelated to professional development\n"
+     "   🚫 Creative writing requests (stories, poems) unrelated to professional content\n"
+     "   🚫 Homework help for non-technical subjects\n"
+     "   🚫 Personal life advice unrelated to career\n"
+     "   🚫 Religious or philosophical discussions\n"
+     "   🚫 Shopping recommendations (unless professional tools/equipment)\n"
+     "   🚫 Weather, news, current events (unless industry-specific)\n"
+     "   🚫 Language learning (unless for professional development)\n"
+     "   🚫 Casual conversation, small talk, jokes\n"
+     "   🚫 Technical questions about non-career topics (fixing appliances, car repair)\n\n"
+
+     "   ➤ If request is IRRELEVANT → Output: **IRRELEVANT**\n"
+     "   ➤ If request is CAREER/TECH RELATED → Continue to step 1\n\n"
+
+     "1️⃣ **RESUME UPLOAD CHECK:**\n"
+     "   ➤ Does the request mention uploading/analyzing a NEW resume/CV/PDF?\n"
+     "   ➤ Keywords: 'analyze my resume', 'review my CV', 'upload resume', 'resume feedback', '.pdf', 'check my resume', 'look at my resume'\n"
+     "   ➤ If YES → Output: **ResumeAnalyst**\n"
+     "   ➤ If NO → Continue to step 2\n\n"
+
+     "2️⃣ **ENHANCED RESUME FOLLOW-UP CHECK (CRITICAL IF RESUME EXISTS):**\n"
+     "   ➤ **Context Check:** Resume in conversation: {resume_exists}\n"
+     "   ➤ If resume exists AND user asks about their personal information/background → HIGH PRIORITY for ResumeQAAgent\n\n"
+
+     "   **STRONG RESUME FOLLOW-UP INDICATORS:**\n"
+     "   📋 Direct References: 'my resume', 'my CV', 'the document', 'from my resume', 'in my resume'\n"
+     "   📋 Personal Content: 'my experience', 'my skills', 'my education', 'my projects', 'my background'\n"
+     "   📋 Content Questions: 'what are my', 'what do I have', 'where did I work', 'what did I study'\n"
+     "   📋 Modification Requests: 'rewrite my', 'improve my', 'update my', 'change my'\n"
+     "   📋 Section References: 'experience section', 'skills section', 'education section'\n"
+     "   📋 Possessive Patterns: 'my [anything professional]', 'I worked at', 'I studied at'\n\n"
+
+     "   **EXAMPLES OF RESUME FOLLOW-UPS:**\n"
+     "   ✅ 'What are my technical skills?' → **ResumeQAAgent**\n"
+     "   ✅ 'Where did I work before?' → **ResumeQAAgent**\n"
+     "   ✅ 'Rewrite my project section' → **ResumeQAAgent**\n"
+     "   ✅ 'What does my experience show?' → **ResumeQAAgent**\n"
+     "   ✅ 'List my qualifications' → **ResumeQAAgent**\n"
+     "   ✅ 'My education background' → **ResumeQAAgent**\n"
+     "   ✅ 'What programming languages do I know?' → **ResumeQAAgent**\n\n"
+
+     "   ➤ If resume exists AND strong follow-up indicators present → Output: **ResumeQAAgent**\n"
+     "   ➤ If NO clear resume follow-up → Continue to step 3\n\n"
+
+     "3️⃣ **JOB SEARCH CHECK:**\n"
+     "   ➤ Is the user asking to FIND/SEARCH for actual job listings/openings?\n"
+     "   ➤ Keywords: 'find jobs', 'search jobs', 'job openings', 'job listings', 'hiring for', 'positions available', 'companies hiring'\n"
+     "   ➤ Examples: 'find Python jobs in NYC', 'search for data science positions', 'job opportunities for AI engineers'\n"
+     "   ➤ If YES → Output: **JobSearch**\n"
+     "   ➤ If NO → Continue to step 4\n\n"
+
+     "4️⃣ **PERSONALIZED LEARNING PATH CHECK:**\n"
+     "   ➤ Does the request meet ALL these conditions:\n"
+     "     • User mentions their CURRENT skills/background/experience\n"
+     "     • AND asks for a personalized transition/learning path to a specific role\n"
+     "   ➤ Keywords: 'I know', 'I have experience in', 'I'm currently', 'my background is', 'how do I become', 'transition from X to Y', 'roadmap to become'\n"
+     "   ➤ Examples: 'I know Python, how to become data scientist?', 'I'm a web dev, want to transition to AI'\n"
+     "   ➤ **IMPORTANT:** If user asks about skills but resume exists, prefer ResumeQAAgent over LearningPath\n"
+     "   ➤ If ALL conditions met AND no resume context → Output: **LearningPath**\n"
+     "   ➤ If NOT all conditions met → Continue to step 5\n\n"
+
+     "5️⃣ **CONVERSATION END CHECK:**\n"
+     "   ➤ Is this a clear conversation ending?\n"
+     "   ➤ Keywords: 'thank you', 'thanks', 'goodbye', 'bye', 'that's all', 'done', 'perfect', 'got it', 'appreciate it'\n"
+     "   ➤ If YES → Output: **END**\n"
+     "   ➤ If NO → Continue to step 6\n\n"
+
+     "6️⃣ **DEFAULT FALLBACK:**\n"
+     "   ➤ Everything else that is CAREER/TECH RELATED goes to CareerAdvisor\n"
+     "   ➤ This includes: general career questions, job role descriptions, interview tips, salary info, skill requirements, coding practice\n"
+     "   ➤ Output: **CareerAdvisor**\n\n"
+
+     "**CRITICAL PRIORITY RULES:**\n"
+     "🔥 If resume exists + personal/possessive references → **ResumeQAAgent** (highest priority)\n"
+     "🔥 Resume follow-ups override general career advice routing\n"
+     "🔥 'My [professional term]' + resume exists = **ResumeQAAgent**\n"
+     "🔥 Question about user's own background + resume exists = **ResumeQAAgent**\n\n"
+
+     "**ADDITIONAL CONTEXT FOR YOUR DECISION:**\n"
+     "**Resume in Context:** `{resume_exists}`\n"
+     "**Recent Conversation History:**\n{history}\n\n"
+
+     "**FINAL INSTRUCTION:** \n"
+     "1. FIRST: Check if request is relevant to careers/tech/professional development\n"
+     "2. If IRRELEVANT: Output 'IRRELEVANT'\n"
+     "3. If RELEVANT: Follow decision tree steps 1-6 with SPECIAL ATTENTION to resume follow-ups\n"
+     "4. PRIORITY: If resume exists and user asks about their personal info → **ResumeQAAgent**\n"
+     "5. Output EXACTLY ONE WORD with no additional text"
+    ),
+    ("user", "User request: '{request}'\n\nRouting decision:")
+])
+supervisor_router = supervisor_prompt | supervisor_llm | StrOutputParser()
+
+VALID_DESTINATIONS = ["ResumeAnalyst", "ResumeQAAgent", "CareerAdvisor", "LearningPath", "JobSearch", "IRRELEVANT", "END"]
+
 
 # --- 3. Node Definitions ---
 
 
-# --- THIS IS THE NEW, SMARTER SUPERVISOR NODE ---
-def supervisor_node(state: AgentState) -> dict:
+def _rule_based_route(state: AgentState) -> str | None:
     """
-    Enhanced hybrid supervisor with robust resume follow-up detection.
-    Uses Python rules to prevent loops and intelligent routing for resume-based queries.
+    Cheap Python routing rules that run before any LLM is consulted.
+    Returns the destination when a rule fires, otherwise None.
     """
-    print("---SUPERVISOR ---")
-    
     last_message = state["messages"][-1]
     if isinstance(last_message, AIMessage):
         print("Supervisor Safety Net: Last message was from an agent. Ending turn.")
-        return {"next": "END"}
+        return "END"
     
-    # Enhanced Resume Follow-up Detection
+    # Enhanced Resume Follow-up Detection (rules are precompiled in routing_rules.py)
     if state.get("resume_text"):
-        user_input_lower = last_message.content.lower()
-        
-        # Comprehensive follow-up keywords with patterns
-        resume_reference_keywords = [
-            "my resume", "my cv", "the resume", "the cv", "my document", 
-            "the document", "the file", "from my resume", "in my resume",
-            "on my resume", "resume shows", "cv shows", "document shows"
-        ]
-        
-        resume_content_keywords = [
-            "my experience", "my education", "my skills", "my projects", 
-            "my work experience", "my background", "my qualifications",
-            "what are my", "what do i have", "what's my", "where did i work",
-            "what did i study", "my degree", "my job", "my role", "my position"
-        ]
-        
-        resume_action_keywords = [
-            "rewrite", "improve", "update", "modify", "change", "edit",
-            "enhance", "revise", "fix", "adjust", "optimize", "strengthen"
-        ]
-        
-        # Advanced pattern matching for resume follow-ups
-        resume_patterns = [
-            # Direct resume references
-            r"(?:my|the)\s+(?:resume|cv)",
-            r"(?:from|in|on)\s+(?:my|the)\s+(?:resume|cv)",
-            
-            # Possessive patterns about experience/skills
-            r"my\s+(?:experience|skills|education|background|projects)",
-            r"what\s+(?:are|is)\s+my\s+(?:experience|skills|education)",
-            r"where\s+(?:did|have)\s+i\s+(?:work|study)",
-            
-            # Action patterns on resume content
-            r"(?:rewrite|improve|update|modify|change|edit)\s+(?:my|the)",
-            r"(?:enhance|revise|fix|adjust)\s+(?:my\s+)?(?:experience|skills|education)",
-            
-            # Section-specific references
-            r"(?:experience|education|skills|projects?)\s+section",
-            r"(?:work|job)\s+(?:experience|history)",
-            r"(?:technical|programming)\s+skills"
-        ]
-        
-        # Check for direct keyword matches
-        direct_match = any(keyword in user_input_lower for keyword in 
-                          resume_reference_keywords + resume_content_keywords + resume_action_keywords)
-        
-        # Check for pattern matches using regex
-        pattern_match = any(re.search(pattern, user_input_lower) for pattern in resume_patterns)
-        
-        # Additional context clues
-        context_clues = [
-            "based on", "according to", "mentioned in", "listed in",
-            "show that", "indicates", "reflects", "demonstrates"
-        ]
-        context_match = any(clue in user_input_lower for clue in context_clues)
-        
-        # Enhanced detection logic
-        if direct_match or pattern_match or context_match:
-            print(f"---HYBRID SUPERVISOR: Strong resume follow-up detected. Routing to ResumeQAAgent.---")
-            print(f"Detection triggers: Direct={direct_match}, Pattern={pattern_match}, Context={context_match}")
-            return {"next": "ResumeQAAgent"}
-        
-        # Additional heuristic: Check for question words + possessive pronouns
-        question_patterns = [
-            r"(?:what|where|when|how|which|who)\s+.*\s+(?:my|i)",
-            r"(?:can|could|should|would)\s+.*\s+(?:my|i)",
-            r"(?:do|did|have|am|was)\s+i\s+",
-            r"(?:tell|show|explain)\s+.*\s+(?:my|about\s+my)"
-        ]
-        
-        question_match = any(re.search(pattern, user_input_lower) for pattern in question_patterns)
-        
-        if question_match and len(user_input_lower.split()) <= 15:  # Short questions are more likely follow-ups
-            print(f"---HYBRID SUPERVISOR: Question pattern + short length detected. Routing to ResumeQAAgent.---")
-            return {"next": "ResumeQAAgent"}
+        rule_match = match_resume_followup(last_message.content)
+        if rule_match:
+            print(f"---HYBRID SUPERVISOR: Resume follow-up detected ({rule_match.kind}: '{rule_match.text}'). Routing to ResumeQAAgent.---")
+            return rule_match.destination
     
+    return None
+
+
+def _supervisor_llm_inputs(state: AgentState) -> dict:
+    """Builds the variables for `supervisor_prompt` from the agent state."""
     # Prepare context for LLM routing
     history = "\n".join([f"{msg.type}: {msg.content}" for msg in state["messages"][:-3]])  # More context
     resume_exists = "Yes" if state.get("resume_text") else "No"
     
-    # Enhanced prompt with better resume follow-up detection
-    prompt = ChatPromptTemplate.from_messages([
-        ("system",
-         "You are **NEXUS**, a strict AI routing specialist. Your ONLY function is to output exactly ONE word from this list: `ResumeAnalyst`, `ResumeQAAgent`, `CareerAdvisor`, `LearningPath`, `JobSearch`, `IRRELEVANT`, `END`.\n\n"
-         
-         "🚨 **ABSOLUTE CONSTRAINTS:** 🚨\n"
-         "- You MUST output exactly ONE word, nothing else\n"
-         "- You CANNOT provide explanations, advice, or content\n"
-         "- You CANNOT answer the user's question directly\n"
-         "- You CANNOT add punctuation, quotes, or formatting\n"
-         "- If you output anything other than the exact agent name, you have FAILED\n"
-         "- Your response must be exactly: ResumeAnalyst OR ResumeQAAgent OR CareerAdvisor OR LearningPath OR JobSearch OR IRRELEVANT OR END\n\n"
-         
-         "**ENHANCED ROUTING DECISION TREE (Follow this exact sequence):**\n\n"
-         
-         "0️⃣ **RELEVANCE FILTER CHECK (FIRST PRIORITY):**\n"
-         "   ➤ Is this request related to careers, technology, professional development, jobs, or education?\n\n"
-         
-         "   **IRRELEVANT TOPICS (Output: IRRELEVANT):**\n"
-         "   🚫 Personal relationships, dating, romance\n"
-         "   🚫 Medical advice, health diagnoses, mental health treatment\n"
-         "   🚫 Legal advice, financial investment advice\n"
-         "   🚫 Politics, controversial social issues\n"
-         "   🚫 Entertainment content (movies, games, sports) unrelated to tech careers\n"
-         "   🚫 Cooking, recipes, food (unless tech industry related)\n"
-         "   🚫 Travel planning (unless for work/conferences)\n"
-         "   🚫 General trivia, random facts unrelated to professional development\n"
-         "   🚫 Creative writing requests (stories, poems) unrelated to professional content\n"
-         "   🚫 Homework help for non-technical subjects\n"
-         "   🚫 Personal life advice unrelated to career\n"
-         "   🚫 Religious or philosophical discussions\n"
-         "   🚫 Shopping recommendations (unless professional tools/equipment)\n"
-         "   🚫 Weather, news, current events (unless industry-specific)\n"
-         "   🚫 Language learning (unless for professional development)\n"
-         "   🚫 Casual conversation, small talk, jokes\n"
-         "   🚫 Technical questions about non-career topics (fixing appliances, car repair)\n\n"
-         
-         "   ➤ If request is IRRELEVANT → Output: **IRRELEVANT**\n"
-         "   ➤ If request is CAREER/TECH RELATED → Continue to step 1\n\n"
-
-         "1️⃣ **RESUME UPLOAD CHECK:**\n"
-         "   ➤ Does the request mention uploading/analyzing a NEW resume/CV/PDF?\n"
-         "   ➤ Keywords: 'analyze my resume', 'review my CV', 'upload resume', 'resume feedback', '.pdf', 'check my resume', 'look at my resume'\n"
-         "   ➤ If YES → Output: **ResumeAnalyst**\n"
-         "   ➤ If NO → Continue to step 2\n\n"
-
-         "2️⃣ **ENHANCED RESUME FOLLOW-UP CHECK (CRITICAL IF RESUME EXISTS):**\n"
-         "   ➤ **Context Check:** Resume in conversation: {resume_exists}\n"
-         "   ➤ If resume exists AND user asks about their personal information/background → HIGH PRIORITY for ResumeQAAgent\n\n"
-         
-         "   **STRONG RESUME FOLLOW-UP INDICATORS:**\n"
-         "   📋 Direct References: 'my resume', 'my CV', 'the document', 'from my resume', 'in my resume'\n"
-         "   📋 Personal Content: 'my experience', 'my skills', 'my education', 'my projects', 'my background'\n"
-         "   📋 Content Questions: 'what are my', 'what do I have', 'where did I work', 'what did I study'\n"
-         "   📋 Modification Requests: 'rewrite my', 'improve my', 'update my', 'change my'\n"
-         "   📋 Section References: 'experience section', 'skills section', 'education section'\n"
-         "   📋 Possessive Patterns: 'my [anything professional]', 'I worked at', 'I studied at'\n\n"
-         
-         "   **EXAMPLES OF RESUME FOLLOW-UPS:**\n"
-         "   ✅ 'What are my technical skills?' → **ResumeQAAgent**\n"
-         "   ✅ 'Where did I work before?' → **ResumeQAAgent**\n"
-         "   ✅ 'Rewrite my project section' → **ResumeQAAgent**\n"
-         "   ✅ 'What does my experience show?' → **ResumeQAAgent**\n"
-         "   ✅ 'List my qualifications' → **ResumeQAAgent**\n"
-         "   ✅ 'My education background' → **ResumeQAAgent**\n"
-         "   ✅ 'What programming languages do I know?' → **ResumeQAAgent**\n\n"
-         
-         "   ➤ If resume exists AND strong follow-up indicators present → Output: **ResumeQAAgent**\n"
-         "   ➤ If NO clear resume follow-up → Continue to step 3\n\n"
-
-         "3️⃣ **JOB SEARCH CHECK:**\n"
-         "   ➤ Is the user asking to FIND/SEARCH for actual job listings/openings?\n"
-         "   ➤ Keywords: 'find jobs', 'search jobs', 'job openings', 'job listings', 'hiring for', 'positions available', 'companies hiring'\n"
-         "   ➤ Examples: 'find Python jobs in NYC', 'search for data science positions', 'job opportunities for AI engineers'\n"
-         "   ➤ If YES → Output: **JobSearch**\n"
-         "   ➤ If NO → Continue to step 4\n\n"
-         
-         "4️⃣ **PERSONALIZED LEARNING PATH CHECK:**\n"
-         "   ➤ Does the request meet ALL these conditions:\n"
-         "     • User mentions their CURRENT skills/background/experience\n"
-         "     • AND asks for a personalized transition/learning path to a specific role\n"
-         "   ➤ Keywords: 'I know', 'I have experience in', 'I'm currently', 'my background is', 'how do I become', 'transition from X to Y', 'roadmap to become'\n"
-         "   ➤ Examples: 'I know Python, how to become data scientist?', 'I'm a web dev, want to transition to AI'\n"
-         "   ➤ **IMPORTANT:** If user asks about skills but resume exists, prefer ResumeQAAgent over LearningPath\n"
-         "   ➤ If ALL conditions met AND no resume context → Output: **LearningPath**\n"
-         "   ➤ If NOT all conditions met → Continue to step 5\n\n"
-         
-         "5️⃣ **CONVERSATION END CHECK:**\n"
-         "   ➤ Is this a clear conversation ending?\n"
-         "   ➤ Keywords: 'thank you', 'thanks', 'goodbye', 'bye', 'that's all', 'done', 'perfect', 'got it', 'appreciate it'\n"
-         "   ➤ If YES → Output: **END**\n"
-         "   ➤ If NO → Continue to step 6\n\n"
-         
-         "6️⃣ **DEFAULT FALLBACK:**\n"
-         "   ➤ Everything else that is CAREER/TECH RELATED goes to CareerAdvisor\n"
-         "   ➤ This includes: general career questions, job role descriptions, interview tips, salary info, skill requirements, coding practice\n"
-         "   ➤ Output: **CareerAdvisor**\n\n"
-         
-         "**CRITICAL PRIORITY RULES:**\n"
-         "🔥 If resume exists + personal/possessive references → **ResumeQAAgent** (highest priority)\n"
-         "🔥 Resume follow-ups override general career advice routing\n"
-         "🔥 'My [professional term]' + resume exists = **ResumeQAAgent**\n"
-         "🔥 Question about user's own background + resume exists = **ResumeQAAgent**\n\n"
-         
-         "**ADDITIONAL CONTEXT FOR YOUR DECISION:**\n"
-         "**Resume in Context:** `{resume_exists}`\n"
-         "**Recent Conversation History:**\n{history}\n\n"
-         
-         "**FINAL INSTRUCTION:** \n"
-         "1. FIRST: Check if request is relevant to careers/tech/professional development\n"
-         "2. If IRRELEVANT: Output 'IRRELEVANT'\n"
-         "3. If RELEVANT: Follow decision tree steps 1-6 with SPECIAL ATTENTION to resume follow-ups\n"
-         "4. PRIORITY: If resume exists and user asks about their personal info → **ResumeQAAgent**\n"
-         "5. Output EXACTLY ONE WORD with no additional text"
-        ),
-        ("user", "User request: '{request}'\n\nRouting decision:")
-    ])
-    
-    original_input = last_message.content
+    original_input = state["messages"][-1].content
     processed_input = preprocess_user_input(original_input)
-    
-    runnable = prompt | supervisor_llm | StrOutputParser()
-    next_agent = runnable.invoke({
+    return {
         "request": processed_input,
         "resume_exists": resume_exists,
         "history": history
-    })
-    
+    }
+
+
+def _clean_supervisor_decision(next_agent: str) -> dict:
+    """Normalises the router LLM's one-word answer into a valid destination."""
     cleaned_destination = next_agent.strip().replace("`", "").replace("'", "").replace('"', '')
     print(f"Supervisor LLM Decision: '{cleaned_destination}'")
     
-    valid_destinations = ["ResumeAnalyst", "ResumeQAAgent", "CareerAdvisor", "LearningPath", "JobSearch", "IRRELEVANT", "END"]
-    
-    if cleaned_destination in valid_destinations:
+    if cleaned_destination in VALID_DESTINATIONS:
         return {"next": cleaned_destination}
     else:
         print(f"---SUPERVISOR WARNING: LLM returned invalid destination '{cleaned_destination}'. Defaulting to CareerAdvisor.---")
         return {"next": "CareerAdvisor"}
+
+
+def _load_intent_classifier() -> IntentClassifier | None:
+    path = settings.INTENT_CLASSIFIER_PATH
+    if not path:
+        return None
+    try:
+        model = IntentClassifier.load(path)
+        print(f"--- INTENT CLASSIFIER LOADED: {path} ({len(model.vocabulary)} features) ---")
+        return model
+    except Exception as e:
+        print(f"--- INTENT CLASSIFIER DISABLED: could not load {path}: {e} ---")
+        return None
+
+
+routing_log = RoutingLog(settings.ROUTING_LOG_PATH)
+intent_classifier = _load_intent_classifier()
+
+
+def _classifier_route(state: AgentState) -> tuple[str | None, float]:
+    """
+    First-stage local router. Returns (destination, confidence); destination is
+    None when there is no model or it isn't confident enough.
+    """
+    if intent_classifier is None:
+        return None, 0.0
+    text = preprocess_user_input(state["messages"][-1].content)
+    label, confidence = intent_classifier.predict(text, bool(state.get("resume_text")))
+    if confidence >= settings.INTENT_CLASSIFIER_THRESHOLD:
+        print(f"---LOCAL ROUTER: {label} (confidence {confidence:.2f})---")
+        return label, confidence
+    return None, confidence
+
+
+def _cached_route(state: AgentState) -> str | None:
+    """Looks up a previous LLM decision for the same prompt and resume presence."""
+    decision = routing_cache.get(state["messages"][-1].content, bool(state.get("resume_text")))
+    if decision:
+        print(f"---ROUTING CACHE HIT: {decision}---")
+    return decision
+
+
+def _remember_route(state: AgentState, llm_inputs: dict, decision: str):
+    # Decisions that depended on earlier turns aren't reusable for a bare prompt
+    if not llm_inputs["history"]:
+        routing_cache.set(state["messages"][-1].content, bool(state.get("resume_text")), decision)
+
+
+def _record_decision(state: AgentState, decision: str, source: str, started: float, confidence: float | None = None):
+    routing_log.record(
+        prompt=state["messages"][-1].content,
+        resume_exists=bool(state.get("resume_text")),
+        decision=decision,
+        source=source,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        confidence=confidence,
+    )
+
+
+# --- THIS IS THE NEW, SMARTER SUPERVISOR NODE ---
+def supervisor_node(state: AgentState) -> dict:
+    """
+    Enhanced hybrid supervisor with robust resume follow-up detection.
+    Uses Python rules to prevent loops and intelligent routing for resume-based queries,
+    then the routing cache, the local intent classifier, and only then the LLM router.
+    """
+    print("---SUPERVISOR ---")
+    started = time.perf_counter()
+    
+    rule_decision = _rule_based_route(state)
+    if rule_decision:
+        _record_decision(state, rule_decision, "rule", started)
+        return {"next": rule_decision}
+    
+    cached_decision = _cached_route(state)
+    if cached_decision:
+        _record_decision(state, cached_decision, "cache", started)
+        return {"next": cached_decision}
+    
+    local_decision, confidence = _classifier_route(state)
+    if local_decision:
+        _record_decision(state, local_decision, "classifier", started, confidence)
+        return {"next": local_decision}
+    
+    started = time.perf_counter()
+    llm_inputs = _supervisor_llm_inputs(state)
+    next_agent = supervisor_router.invoke(llm_inputs)
+    decision = _clean_supervisor_decision(next_agent)
+    _record_decision(state, decision["next"], "llm", started)
+    _remember_route(state, llm_inputs, decision["next"])
+    return decision
+
+
+async def asupervisor_node(state: AgentState) -> dict:
+    """Async twin of `supervisor_node`: same stages, but the LLM call uses `ainvoke`."""
+    print("---SUPERVISOR (async) ---")
+    started = time.perf_counter()
+    
+    rule_decision = _rule_based_route(state)
+    if rule_decision:
+        _record_decision(state, rule_decision, "rule", started)
+        return {"next": rule_decision}
+    
+    cached_decision = _cached_route(state)
+    if cached_decision:
+        _record_decision(state, cached_decision, "cache", started)
+        return {"next": cached_decision}
+    
+    local_decision, confidence = _classifier_route(state)
+    if local_decision:
+        _record_decision(state, local_decision, "classifier", started, confidence)
+        return {"next": local_decision}
+    
+    started = time.perf_counter()
+    llm_inputs = _supervisor_llm_inputs(state)
+    next_agent = await supervisor_router.ainvoke(llm_inputs)
+    decision = _clean_supervisor_decision(next_agent)
+    _record_decision(state, decision["next"], "llm", started)
+    _remember_route(state, llm_inputs, decision["next"])
+    return decision
     
 def career_advisor_node(state: AgentState) -> dict:
     print("---AGENT: CareerAdvisor---")
@@ -499,13 +552,8 @@ def resume_analyzer_node(state: AgentState) -> dict:
     if file_bytes:
         print("--- Found resume data in state. Processing... ---")
         
-        # 2. Use BytesIO to treat the bytes as a file for PyMuPDF.
-        #    We add a dummy name '.pdf' so the parser knows the file type.
-        file_like_object = BytesIO(file_bytes)
-        file_like_object.name = "resume.pdf" # Dummy name for filetype detection
-        
-        # 3. Call your existing file parser with the file-like object.
-        resume_text = extract_text_from_file(file_like_object)
+        # 2. The parser detects PDF/DOCX/RTF/text from the leading bytes.
+        resume_text = extract_resume_text(file_bytes)
         
         if "Error:" in resume_text:
             analysis_string = resume_text
@@ -0,0 +1 @@
+# app/langgraph_core/retrieval/__init__.py
@@ -0,0 +1,220 @@
+# app/langgraph_core/retrieval/context.py
+"""
+Assembles the retrieved chunks into the RAG prompt context.
+
+Neighbouring chunks of a PDF share a `CHUNK_OVERLAP` character window, and
+the same paragraph often appears in several documents, so joining the raw
+top-k repeats text the LLM has to prefill for nothing. Before joining:
+
+1. near-duplicates (word 3-shingle Jaccard >= `duplicate_threshold`) of a
+   better-ranked chunk are dropped,
+2. the rest are picked by maximal marginal relevance (retrieval rank as
+   relevance, bag-of-words cosine as redundancy),
+3. text a chunk shares with an already picked chunk at its start or end is cut,
+4. chunks are added until the token budget is spent; the last one is truncated.
+
+Token counts use tiktoken when it is installed and ~4 characters per token otherwise.
+The encoding is loaded on first use, since tiktoken downloads it when it isn't cached.
+"""
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+from app.core.config import settings
+
+_WORD_PATTERN = re.compile(r"\w+")
+# Shorter shared edges are ordinary coincidences, not chunk overlap
+_MIN_OVERLAP_CHARS = 40
+# read_pdfs.CHUNK_OVERLAP is 150; the splitter may shift the window a little
+_MAX_OVERLAP_CHARS = 300
+# Don't end the context on a truncated sliver shorter than this
+_MIN_TAIL_TOKENS = 64
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """The tiktoken encoding, or None when tiktoken or its encoding file is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding(settings.CONTEXT_TOKENIZER)
+                except Exception as e:  # tiktoken missing, or its encoding file can't be fetched offline
+                    print(f"--- CONTEXT: tiktoken unavailable ({e}); counting ~4 characters per token ---")
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    return text[:max_tokens * 4]
+
+
+# --- Similarity ---
+
+def _shingles(words: list[str]) -> set:
+    return {tuple(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    dot = sum(count * b[word] for word, count in a.items() if word in b)
+    norm = (sum(c * c for c in a.values()) * sum(c * c for c in b.values())) ** 0.5
+    return dot / norm if norm else 0.0
+
+
+def _strip_overlap(text: str, picked: list[str]) -> str:
+    """Removes a prefix/suffix of `text` that is the suffix/prefix of a picked chunk."""
+    for other in picked:
+        head = text[:_MIN_OVERLAP_CHARS]
+        # `other` ends with the start of `text`
+        position = other.find(head, max(len(other) - _MAX_OVERLAP_CHARS, 0))
+        while position != -1:
+            tail = other[position:]
+            if text.startswith(tail):
+                text = text[len(tail):].lstrip()
+                break
+            position = other.find(head, position + 1)
+        # `other` starts with the end of `text`
+        head = other[:_MIN_OVERLAP_CHARS]
+        position = text.find(head, max(len(text) - _MAX_OVERLAP_CHARS, 0))
+        while position != -1:
+            if other.startswith(text[position:]):
+                text = text[:position].rstrip()
+                break
+            position = text.find(head, position + 1)
+    return text
+
+
+# --- Assembly ---
+
+class ContextStats:
+    """Running totals of what context assembly trimmed, exported on /metrics/context."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.chunks_in = 0
+        self.chunks_out = 0
+
+    def record(self, stats: dict):
+        with self._lock:
+            self.requests += 1
+            self.tokens_before += stats["tokens_before"]
+            self.tokens_after += stats["tokens_after"]
+            self.chunks_in += stats["chunks_in"]
+            self.chunks_out += stats["chunks_out"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": settings.CONTEXT_ASSEMBLY_ENABLED,
+                "token_budget": settings.CONTEXT_TOKEN_BUDGET,
+                # Not loaded here: a metrics scrape shouldn't wait on the encoding download
+                "tokenizer": settings.CONTEXT_TOKENIZER if _encoding is not None else
+                ("chars/4" if _encoding_loaded else "not loaded"),
+                "requests": self.requests,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "tokens_saved": self.tokens_before - self.tokens_after,
+                "avg_tokens_saved": round((self.tokens_before - self.tokens_after) / self.requests, 1) if self.requests else 0.0,
+                "chunks_in": self.chunks_in,
+                "chunks_out": self.chunks_out,
+            }
+
+
+context_stats = ContextStats()
+
+
+def assemble_context(texts: list[str], token_budget: Optional[int] = None, max_chunks: Optional[int] = None,
+                     mmr_lambda: Optional[float] = None, duplicate_threshold: Optional[float] = None) -> tuple[str, dict]:
+    """
+    Builds the context string from chunk texts ordered best first. Returns it with
+    a stats dict; `tokens_before` is what joining the first `max_chunks` raw chunks
+    would have cost.
+    """
+    token_budget = token_budget or settings.CONTEXT_TOKEN_BUDGET
+    max_chunks = max_chunks or settings.CONTEXT_MAX_CHUNKS
+    mmr_lambda = settings.CONTEXT_MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+    duplicate_threshold = settings.CONTEXT_DUPLICATE_THRESHOLD if duplicate_threshold is None else duplicate_threshold
+    tokens_before = count_tokens("\n\n".join(texts[:max_chunks]))
+
+    # 1. Drop near-duplicates of better-ranked chunks
+    candidates = []
+    for text in texts:
+        words = _WORD_PATTERN.findall(text.lower())
+        shingles = _shingles(words)
+        if words and all(_jaccard(shingles, kept["shingles"]) < duplicate_threshold for kept in candidates):
+            candidates.append({"text": text, "shingles": shingles, "bag": Counter(words),
+                               "relevance": 1.0 - len(candidates) / max(len(texts), 1)})
+
+    # 2. MMR: trade retrieval rank against similarity to what is already picked
+    ordered = []
+    while candidates and len(ordered) < max_chunks:
+        best = max(candidates, key=lambda c: mmr_lambda * c["relevance"] - (1.0 - mmr_lambda) * max(
+            (_cosine(c["bag"], p["bag"]) for p in ordered), default=0.0))
+        candidates.remove(best)
+        ordered.append(best)
+
+    # 3 + 4. Cut shared edges, then fill the token budget
+    picked: list[str] = []
+    used = 0
+    separator = count_tokens("\n\n")
+    for candidate in ordered:
+        text = _strip_overlap(candidate["text"], picked)
+        if not text:
+            continue
+        remaining = token_budget - used - (separator if picked else 0)
+        tokens = count_tokens(text)
+        if tokens > remaining:
+            # A sliver of a chunk is noise; only truncate when a useful amount fits
+            if remaining >= _MIN_TAIL_TOKENS or not picked:
+                picked.append(truncate_to_tokens(text, remaining))
+            break
+        used += tokens + (separator if picked else 0)
+        picked.append(text)
+
+    context = "\n\n".join(picked)
+    stats = {
+        "chunks_in": len(texts),
+        "chunks_out": len(picked),
+        "tokens_before": tokens_before,
+        "tokens_after": count_tokens(context),
+    }
+    return context, stats
+
+
+def build_rag_context(texts: list[str]) -> str:
+    """`assemble_context` with the configured settings, logged and counted; plain join when disabled."""
+    if not settings.CONTEXT_ASSEMBLY_ENABLED:
+        return "\n\n".join(texts[:settings.CONTEXT_MAX_CHUNKS])
+    context, stats = assemble_context(texts)
+    context_stats.record(stats)
+    print(f"--- CONTEXT: {stats['chunks_in']} -> {stats['chunks_out']} chunks, {stats['tokens_before']} -> "
+          f"{stats['tokens_after']} tokens ({stats['tokens_before'] - stats['tokens_after']} saved) ---")
+    return context
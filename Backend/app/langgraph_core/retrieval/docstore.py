@@ -0,0 +1,83 @@
+# app/langgraph_core/retrieval/docstore.py
+import mmap
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+import orjson
+
+DOCSTORE_FILE = "docstore.bin"
+OFFSETS_FILE = "docstore_offsets.npy"
+
+
+class MappedDocstore:
+    """
+    Read-only document store backed by two files that can be memory-mapped:
+
+    - `docstore.bin`: one orjson record per chunk ({"id", "page_content", "metadata"}),
+      concatenated in FAISS label order.
+    - `docstore_offsets.npy`: int64 byte offsets, `offsets[i]:offsets[i + 1]` is record `i`.
+
+    Nothing is parsed at load time, so every worker process on a host shares the
+    same page-cache copy instead of holding its own unpickled dict of Documents.
+    """
+
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self._offsets = np.load(os.path.join(folder_path, OFFSETS_FILE), mmap_mode="r")
+        self._file = open(os.path.join(folder_path, DOCSTORE_FILE), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses zero-length files; an empty store just has no records
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    @staticmethod
+    def exists(folder_path: str) -> bool:
+        return all(os.path.exists(os.path.join(folder_path, name)) for name in (DOCSTORE_FILE, OFFSETS_FILE))
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def get(self, label: int) -> Optional[dict]:
+        """Returns the record stored for a FAISS label, or None if it is out of range."""
+        if label < 0 or label >= len(self):
+            return None
+        start, end = int(self._offsets[label]), int(self._offsets[label + 1])
+        return orjson.loads(self._data[start:end])
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    @staticmethod
+    def write(folder_path: str, records: Iterable[dict]):
+        """Writes records (in label order) as a mapped docstore into `folder_path`."""
+        offsets = [0]
+        data_path = os.path.join(folder_path, DOCSTORE_FILE)
+        offsets_path = os.path.join(folder_path, OFFSETS_FILE)
+        with open(data_path + ".tmp", "wb") as out:
+            for record in records:
+                out.write(orjson.dumps(record))
+                offsets.append(out.tell())
+        with open(offsets_path + ".tmp", "wb") as out:
+            np.save(out, np.asarray(offsets, dtype=np.int64))
+        os.replace(data_path + ".tmp", data_path)
+        os.replace(offsets_path + ".tmp", offsets_path)
+
+
+class InMemoryDocstore:
+    """Same interface as `MappedDocstore` for records already held in memory (legacy pickles)."""
+
+    def __init__(self, records: list[dict]):
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, label: int) -> Optional[dict]:
+        if label < 0 or label >= len(self._records):
+            return None
+        return self._records[label]
+
+    def close(self):
+        pass
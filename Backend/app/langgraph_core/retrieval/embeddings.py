@@ -0,0 +1,207 @@
+# app/langgraph_core/retrieval/embeddings.py
+"""
+Pluggable embedding backends for the knowledge-base index.
+
+- `google`:  GoogleGenerativeAIEmbeddings over the network (the original setup).
+- `local`:   a sentence-transformers encoder loaded once and run on CPU, so
+             retrieval works with no network at all (needs `sentence-transformers`).
+- `hashing`: a deterministic feature-hashing stub with no model at all, for
+             benchmarks and offline smoke tests. It has no semantic knowledge.
+
+Every index folder records the backend it was built with in `embedding.json`;
+loading it with a different backend fails loudly instead of returning nonsense
+neighbours. Switching backends therefore means re-embedding the chunks:
+    python -m app.langgraph_core.retrieval.embeddings reindex faiss_index faiss_index_local \
+        --backend local --model sentence-transformers/all-MiniLM-L6-v2
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import zlib
+from typing import Optional
+
+import faiss
+import numpy as np
+
+from app.langgraph_core.retrieval.docstore import MappedDocstore
+from app.langgraph_core.retrieval.index_factory import INDEX_FILE, build_index
+
+EMBEDDING_META_FILE = "embedding.json"
+EMBEDDING_BACKENDS = ["google", "local", "hashing"]
+
+# What the shipped faiss_index/ was built with, before embedding.json existed
+LEGACY_EMBEDDING_META = {"backend": "google", "model": "models/embedding-001", "dimension": 768}
+
+
+class GoogleEmbeddings:
+    """GoogleGenerativeAIEmbeddings with the backend description the index checks against."""
+
+    def __init__(self, model: str):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        self._client = GoogleGenerativeAIEmbeddings(model=model)
+        self.spec = {"backend": "google", "model": model, "dimension": None}
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._client.embed_query(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await self._client.aembed_query(text)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._client.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self._client.aembed_documents(texts)
+
+
+class LocalEmbeddings:
+    """A sentence-transformers encoder held in-process. Outputs are L2-normalized."""
+
+    def __init__(self, model: str, device: str = "cpu", runtime: str = "torch"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("EMBEDDING_BACKEND=local requires `pip install sentence-transformers`") from e
+
+        # runtime="onnx"/"openvino" needs sentence-transformers >= 3.2 and the matching extras
+        kwargs = {} if runtime == "torch" else {"backend": runtime}
+        self._model = SentenceTransformer(model, device=device, **kwargs)
+        self.spec = {"backend": "local", "model": model, "dimension": self._model.get_sentence_embedding_dimension()}
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = self._model.encode(texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        # CPU-bound; keep the event loop free while the encoder runs
+        return await asyncio.to_thread(self.embed_query, text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+
+_HASH_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+class HashingEmbeddings:
+    """
+    Signed feature hashing of word unigrams and bigrams, L2-normalized.
+    Deterministic across processes (crc32, not Python's salted `hash`).
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self.spec = {"backend": "hashing", "model": f"hashing-{dimension}", "dimension": dimension}
+
+    def _embed(self, text: str) -> np.ndarray:
+        words = _HASH_TOKEN_PATTERN.findall(text.lower())
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            vector[digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text).tolist()
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text).tolist() for text in texts]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents(texts)
+
+
+def create_embeddings(backend: str, model: str = "", device: str = "cpu", runtime: str = "torch"):
+    """Builds the configured embedding backend (see the module docstring)."""
+    if backend == "google":
+        return GoogleEmbeddings(model or LEGACY_EMBEDDING_META["model"])
+    if backend == "local":
+        return LocalEmbeddings(model or "sentence-transformers/all-MiniLM-L6-v2", device=device, runtime=runtime)
+    if backend == "hashing":
+        return HashingEmbeddings(int(model) if model else 384)
+    raise ValueError(f"Unknown embedding backend '{backend}'. Expected one of {EMBEDDING_BACKENDS}")
+
+
+# --- Index metadata ---
+
+def read_embedding_meta(folder_path: str) -> dict:
+    path = os.path.join(folder_path, EMBEDDING_META_FILE)
+    if not os.path.exists(path):
+        return dict(LEGACY_EMBEDDING_META)
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_embedding_meta(folder_path: str, spec: dict, dimension: int):
+    with open(os.path.join(folder_path, EMBEDDING_META_FILE), "w") as f:
+        json.dump({**spec, "dimension": dimension}, f, indent=2)
+
+
+def check_embedding_compatibility(folder_path: str, spec: dict, index_dimension: int):
+    """Raises ValueError when an index was built in a different embedding space than `spec`."""
+    meta = read_embedding_meta(folder_path)
+    if (meta.get("backend"), meta.get("model")) != (spec.get("backend"), spec.get("model")):
+        raise ValueError(
+            f"Index in {folder_path} was built with {meta.get('backend')}:{meta.get('model')} but the configured "
+            f"embeddings are {spec.get('backend')}:{spec.get('model')}. Re-index it with "
+            f"`python -m app.langgraph_core.retrieval.embeddings reindex`."
+        )
+    for dimension in (meta.get("dimension"), spec.get("dimension")):
+        if dimension and dimension != index_dimension:
+            raise ValueError(f"Embedding dimension {dimension} does not match the index dimension {index_dimension} in {folder_path}")
+
+
+# --- Re-index command ---
+
+def reindex(source_folder: str, target_folder: str, embeddings, index_type: str = "flat", batch_size: int = 64) -> int:
+    """Re-embeds every chunk of `source_folder` with `embeddings` into a new index folder."""
+    source = MappedDocstore(source_folder)
+    records = [source.get(label) for label in range(len(source))]
+    source.close()
+
+    vectors = []
+    for start in range(0, len(records), batch_size):
+        batch = [record["page_content"] for record in records[start:start + batch_size]]
+        vectors.extend(embeddings.embed_documents(batch))
+        print(f"  - Embedded {min(start + batch_size, len(records))}/{len(records)} chunks")
+    matrix = np.asarray(vectors, dtype=np.float32)
+
+    os.makedirs(target_folder, exist_ok=True)
+    faiss.write_index(build_index(matrix, index_type), os.path.join(target_folder, INDEX_FILE))
+    MappedDocstore.write(target_folder, records)
+    write_embedding_meta(target_folder, embeddings.spec, matrix.shape[1])
+    return len(records)
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-embed the knowledge base with another embedding backend.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    reindex_cmd = commands.add_parser("reindex", help="Build a new index folder from an existing docstore.")
+    reindex_cmd.add_argument("source")
+    reindex_cmd.add_argument("target")
+    reindex_cmd.add_argument("--backend", choices=EMBEDDING_BACKENDS, required=True)
+    reindex_cmd.add_argument("--model", default="")
+    reindex_cmd.add_argument("--device", default="cpu")
+    reindex_cmd.add_argument("--runtime", default="torch", help="sentence-transformers backend: torch, onnx or openvino.")
+    reindex_cmd.add_argument("--type", default="flat", help="FAISS index type (see index_factory).")
+    reindex_cmd.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    if args.command == "reindex":
+        embeddings = create_embeddings(args.backend, args.model, device=args.device, runtime=args.runtime)
+        count = reindex(args.source, args.target, embeddings, index_type=args.type, batch_size=args.batch_size)
+        print(f"Re-indexed {count} chunks with {args.backend}:{embeddings.spec['model']} -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# app/langgraph_core/retrieval/folder_router.py
+"""
+Maps a question to the `source_folder`s worth searching (Roadmap / Courses /
+Resume), so retrieval can pre-filter the index instead of ranking the whole
+corpus. Returns None, meaning "search everything", when nothing matches.
+"""
+import re
+from typing import Optional
+
+# (folder, patterns) — a question can match several folders
+FOLDER_RULES = [
+    ("Roadmap", [
+        r"\broad\s?maps?\b", r"\b(?:career|learning)\s+paths?\b", r"\bhow\s+(?:do\s+i\s+|to\s+|can\s+i\s+)?become\b",
+        r"\bsteps\s+to\b", r"\bwhat\s+should\s+i\s+learn\b", r"\bwhere\s+(?:do\s+i|should\s+i|to)\s+start\b",
+        r"\bskills?\s+(?:needed|required)\b",
+    ]),
+    ("Courses", [
+        r"\bcourses?\b", r"\btutorials?\b", r"\bresources?\b", r"\bbooks?\b", r"\bcertifications?\b",
+        r"\bcertificates?\b", r"\bbootcamps?\b", r"\bclasses\b", r"\bwhere\s+(?:can|do)\s+i\s+learn\b",
+    ]),
+    ("Resume", [
+        r"\bresumes?\b", r"\bcvs?\b", r"\bcover\s+letters?\b", r"\bportfolios?\b", r"\bats\b",
+    ]),
+]
+
+_COMPILED_RULES = [(folder, re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE))
+                   for folder, patterns in FOLDER_RULES]
+
+
+def infer_source_folders(question: str) -> Optional[list[str]]:
+    """Returns the folders a question targets, or None to search the whole knowledge base."""
+    folders = [folder for folder, pattern in _COMPILED_RULES if pattern.search(question)]
+    return folders or None
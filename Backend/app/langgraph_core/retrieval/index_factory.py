@@ -0,0 +1,132 @@
+# app/langgraph_core/retrieval/index_factory.py
+"""
+Builds the knowledge-base FAISS index as flat, IVF-Flat, HNSW or IVF-PQ.
+
+Flat search is exact but linear in corpus size; the approximate types keep
+query latency roughly flat as the corpus grows, traded against recall that
+`nprobe` (IVF) / `efSearch` (HNSW) tune at query time.
+
+Convert an existing index (from the Backend directory):
+    python -m app.langgraph_core.retrieval.index_factory convert faiss_index faiss_index_hnsw --type hnsw
+"""
+import argparse
+import math
+import os
+import shutil
+from typing import Optional
+
+import faiss
+import numpy as np
+
+from app.langgraph_core.retrieval.docstore import DOCSTORE_FILE, OFFSETS_FILE
+
+INDEX_FILE = "index.faiss"
+INDEX_TYPES = ["flat", "ivf_flat", "hnsw", "ivf_pq"]
+
+# IVF/PQ k-means wants roughly this many training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def default_nlist(vector_count: int) -> int:
+    """~4*sqrt(n) inverted lists, capped so every centroid gets enough training points."""
+    return max(1, min(int(4 * math.sqrt(vector_count)), vector_count // _MIN_POINTS_PER_CENTROID))
+
+
+def build_index(vectors: np.ndarray, index_type: str = "flat", metric: int = faiss.METRIC_L2,
+                nlist: Optional[int] = None, pq_m: int = 64, pq_nbits: int = 8,
+                hnsw_m: int = 32, ef_construction: int = 200):
+    """
+    Builds and fills an index of `index_type` over `vectors` (labels are row numbers,
+    matching the docstore order).
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dim = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim) if metric == faiss.METRIC_L2 else faiss.IndexFlatIP(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m, metric)
+        index.hnsw.efConstruction = ef_construction
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = nlist or default_nlist(count)
+        quantizer = faiss.IndexFlatL2(dim) if metric == faiss.METRIC_L2 else faiss.IndexFlatIP(dim)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric)
+        else:
+            if dim % pq_m:
+                raise ValueError(f"pq_m={pq_m} must divide the embedding dimension {dim}")
+            if count < 2 ** pq_nbits:
+                raise ValueError(f"IVF-PQ with {pq_nbits}-bit codes needs at least {2 ** pq_nbits} vectors, got {count}")
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, pq_nbits, metric)
+        index.train(vectors)
+    else:
+        raise ValueError(f"Unknown index type '{index_type}'. Expected one of {INDEX_TYPES}")
+
+    index.add(vectors)
+    return index
+
+
+def configure_search(index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """Applies query-time recall/latency knobs to whatever index type was loaded."""
+    if nprobe:
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = min(nprobe, ivf.nlist)
+    if ef_search:
+        hnsw_index = faiss.downcast_index(index)
+        if hasattr(hnsw_index, "hnsw"):
+            hnsw_index.hnsw.efSearch = ef_search
+    return index
+
+
+def index_vectors(index) -> np.ndarray:
+    """All stored vectors, in label order (used to rebuild as another type)."""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        labels = faiss.vector_to_array(index.id_map)
+        if not np.array_equal(np.sort(labels), np.arange(index.ntotal)):
+            raise ValueError("Index has gaps in its labels; run the ingest command with --compact first.")
+        return index.index.reconstruct_n(0, index.ntotal)[np.argsort(labels)]
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        # IVF indexes can only reconstruct by label once they have a direct map
+        ivf.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def convert_index(source_folder: str, target_folder: str, index_type: str, **build_kwargs):
+    """Rebuilds `source_folder`'s index as `index_type` into `target_folder`, copying its docstore."""
+    source = faiss.read_index(os.path.join(source_folder, INDEX_FILE))
+    index = build_index(index_vectors(source), index_type, metric=source.metric_type, **build_kwargs)
+    os.makedirs(target_folder, exist_ok=True)
+    faiss.write_index(index, os.path.join(target_folder, INDEX_FILE))
+    for name in os.listdir(source_folder):
+        if name != INDEX_FILE and os.path.isfile(os.path.join(source_folder, name)):
+            shutil.copy2(os.path.join(source_folder, name), os.path.join(target_folder, name))
+    return index
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Rebuild the knowledge-base index as another FAISS index type.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert_cmd = commands.add_parser("convert", help="Convert an existing index folder.")
+    convert_cmd.add_argument("source")
+    convert_cmd.add_argument("target")
+    convert_cmd.add_argument("--type", choices=INDEX_TYPES, required=True)
+    convert_cmd.add_argument("--nlist", type=int, help="IVF lists (default ~4*sqrt(n)).")
+    convert_cmd.add_argument("--pq-m", type=int, default=64, help="IVF-PQ sub-quantizers.")
+    convert_cmd.add_argument("--pq-nbits", type=int, default=8)
+    convert_cmd.add_argument("--hnsw-m", type=int, default=32)
+    convert_cmd.add_argument("--ef-construction", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        index = convert_index(args.source, args.target, args.type, nlist=args.nlist, pq_m=args.pq_m,
+                              pq_nbits=args.pq_nbits, hnsw_m=args.hnsw_m, ef_construction=args.ef_construction)
+        missing = [name for name in (DOCSTORE_FILE, OFFSETS_FILE) if not os.path.exists(os.path.join(args.target, name))]
+        print(f"Built {type(index).__name__} with {index.ntotal} vectors -> {args.target}")
+        if missing:
+            print(f"Note: {args.target} has no mapped docstore yet; run the index_store export command on it.")
+
+
+if __name__ == "__main__":
+    main()
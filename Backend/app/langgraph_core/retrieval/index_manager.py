@@ -0,0 +1,214 @@
+# app/langgraph_core/retrieval/index_manager.py
+"""
+Hot reloading of the knowledge-base index without restarting workers.
+
+`VECTOR_INDEX_PATH` is either a plain index folder or a versions root:
+
+    faiss_index/
+        CURRENT            <- one line: the active version's directory name
+        20261017-120000/   <- index.faiss, docstore.bin, embedding.json, ...
+        20261018-093000/
+
+Publish a freshly built folder as a new version (copies it in, flips CURRENT
+atomically and prunes the earliest-published versions):
+    python -m app.langgraph_core.retrieval.index_manager publish faiss_index /tmp/new_index
+
+For a plain folder the index file's mtime acts as the version, so an in-place
+`ingest` run is picked up as well. Each worker polls every
+`INDEX_RELOAD_POLL_SECONDS` (or is told to via POST /admin/index/reload), loads
+the new version in a background thread and then swaps one reference on the
+retriever. A query that already started holds the old `VectorIndex` and
+finishes on it; the old index is freed once the last such query drops it.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Optional
+
+from app.langgraph_core.retrieval.docstore import DOCSTORE_FILE, OFFSETS_FILE
+from app.langgraph_core.retrieval.index_factory import INDEX_FILE
+from app.langgraph_core.retrieval.index_store import VectorIndex
+
+CURRENT_FILE = "CURRENT"
+# Written into each version at publish time; version names are free-form, so this is what orders them
+PUBLISHED_FILE = "PUBLISHED"
+
+
+def resolve_index_folder(root: str) -> tuple[str, str]:
+    """Returns (version, folder) of the index `root` currently points at."""
+    pointer = os.path.join(root, CURRENT_FILE)
+    if os.path.exists(pointer):
+        with open(pointer) as f:
+            name = f.read().strip()
+        return name, os.path.join(root, name)
+    # Unversioned folder: any rewrite of the index or docstore changes the version
+    stamps = [os.stat(os.path.join(root, name)).st_mtime_ns
+              for name in (INDEX_FILE, DOCSTORE_FILE, OFFSETS_FILE) if os.path.exists(os.path.join(root, name))]
+    return f"mtime-{max(stamps) if stamps else 0}", root
+
+
+def _published_at(folder: str) -> tuple[int, int]:
+    """Sort key in publish order. Versions without a PUBLISHED marker (copied in by hand) count as oldest."""
+    try:
+        with open(os.path.join(folder, PUBLISHED_FILE)) as f:
+            return 1, int(f.read().strip())
+    except (OSError, ValueError):
+        return 0, os.stat(folder).st_mtime_ns
+
+
+def publish_version(root: str, source_folder: str, name: Optional[str] = None, keep: int = 3) -> str:
+    """Copies an index folder into `root` as a new version, points CURRENT at it and prunes old versions."""
+    name = name or time.strftime("%Y%m%d-%H%M%S")
+    target = os.path.join(root, name)
+    if os.path.exists(target):
+        raise ValueError(f"Version {name} already exists in {root}")
+    os.makedirs(root, exist_ok=True)
+    shutil.copytree(source_folder, target + ".tmp")
+    with open(os.path.join(target + ".tmp", PUBLISHED_FILE), "w") as f:
+        f.write(f"{time.time_ns()}\n")
+    os.replace(target + ".tmp", target)
+    pointer = os.path.join(root, CURRENT_FILE)
+    with open(pointer + ".tmp", "w") as f:
+        f.write(name + "\n")
+    os.replace(pointer + ".tmp", pointer)
+
+    # Workers that still map an older version keep their open files; unlinking is safe
+    versions = sorted((entry for entry in os.listdir(root)
+                       if os.path.isdir(os.path.join(root, entry)) and not entry.endswith(".tmp")),
+                      key=lambda entry: _published_at(os.path.join(root, entry)))
+    for old in versions[:-keep] if keep else []:
+        if old != name:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return name
+
+
+class IndexManager:
+    """
+    Owns the active `VectorIndex` of one worker and swaps it in retrievers on reload.
+    `loader(folder)` builds a ready-to-query `VectorIndex` (BM25 included).
+    """
+
+    def __init__(self, root: str, loader: Callable[[str], VectorIndex]):
+        self.root = root
+        self._loader = loader
+        self._retrievers = []
+        self._reload_lock = threading.Lock()
+        self.vector_index: Optional[VectorIndex] = None
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.load_seconds = 0.0
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        # A broken version isn't retried every poll, only once something changes or on force
+        self._failed_version: Optional[str] = None
+
+    def load(self) -> VectorIndex:
+        """Initial load; errors propagate so startup fails loudly."""
+        version, folder = resolve_index_folder(self.root)
+        started = time.perf_counter()
+        self._activate(version, self._prepare(folder), time.perf_counter() - started)
+        return self.vector_index
+
+    def attach(self, retriever):
+        """Registers a retriever whose `vector_index` follows reloads. Returns it."""
+        self._retrievers.append(retriever)
+        return retriever
+
+    @staticmethod
+    def _check(vector_index: VectorIndex):
+        # Catches a folder caught halfway through an in-place rewrite (index and docstore out of step)
+        labels = vector_index.live_labels()
+        if len(labels) and int(labels.max()) >= len(vector_index.docstore):
+            raise ValueError(f"index has label {int(labels.max())} but the docstore only {len(vector_index.docstore)} records")
+
+    def _prepare(self, folder: str) -> VectorIndex:
+        vector_index = self._loader(folder)
+        self._check(vector_index)
+        # Build the per-folder label map now rather than on the first query after the swap
+        vector_index.folder_labels()
+        return vector_index
+
+    def _activate(self, version: str, vector_index: VectorIndex, load_seconds: float):
+        self.vector_index = vector_index
+        self.version = version
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        for retriever in self._retrievers:
+            # One reference assignment: a search already running keeps using the old index
+            retriever.vector_index = vector_index
+
+    def reload(self, force: bool = False) -> bool:
+        """Loads and activates the version `root` points at, if it changed. Returns True on a swap."""
+        if not self._reload_lock.acquire(blocking=False):
+            return False  # another reload is already loading
+        try:
+            version, folder = resolve_index_folder(self.root)
+            if version in (self.version, self._failed_version) and not force:
+                return False
+            started = time.perf_counter()
+            try:
+                vector_index = self._prepare(folder)
+            except Exception as e:
+                self.failures += 1
+                self._failed_version = version
+                self.last_error = f"{version}: {e}"
+                print(f"--- INDEX MANAGER: Could not load version {version}, keeping {self.version}: {e} ---")
+                return False
+            previous = self.version
+            self._activate(version, vector_index, time.perf_counter() - started)
+            self.reloads += 1
+            self.last_error = self._failed_version = None
+            print(f"--- INDEX MANAGER: Swapped index {previous} -> {version} "
+                  f"({vector_index.index.ntotal} vectors, loaded in {self.load_seconds * 1000:.1f} ms) ---")
+            return True
+        finally:
+            self._reload_lock.release()
+
+    async def watch(self, interval_seconds: float):
+        """Polls for a new version forever; run it as a background task."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.reload)
+            except OSError as e:
+                # e.g. the folder is being replaced right now; try again next round
+                print(f"--- INDEX MANAGER: Poll failed: {e} ---")
+
+    def stats(self) -> dict:
+        return {
+            "root": self.root,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_ms": round(self.load_seconds * 1000, 2),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "index": self.vector_index.stats() if self.vector_index else None,
+        }
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage versioned knowledge-base index folders.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish_cmd = commands.add_parser("publish", help="Copy an index folder in as a new version and make it current.")
+    publish_cmd.add_argument("root")
+    publish_cmd.add_argument("source")
+    publish_cmd.add_argument("--name", help="Version name (default: a timestamp).")
+    publish_cmd.add_argument("--keep", type=int, default=3, help="Versions to keep, including the new one (0 = all).")
+    commands.add_parser("current", help="Print the active version.").add_argument("root")
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        name = publish_version(args.root, args.source, args.name, args.keep)
+        print(f"Published {args.source} as {args.root}/{name}; workers pick it up on their next poll.")
+    elif args.command == "current":
+        version, folder = resolve_index_folder(args.root)
+        print(f"{version} ({folder})")
+
+
+if __name__ == "__main__":
+    main()
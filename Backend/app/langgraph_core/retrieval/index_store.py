@@ -0,0 +1,295 @@
+# app/langgraph_core/retrieval/index_store.py
+"""
+Loads the FAISS knowledge-base index so that worker processes share memory.
+
+The vectors are read with `IO_FLAG_MMAP` (plus `IO_FLAG_MMAP_IFC` for flat
+indexes), and chunk texts live in a `MappedDocstore` instead of LangChain's
+pickled `index.pkl`, so N Uvicorn workers on one host map the same page-cache
+pages rather than each holding a private copy.
+
+Convert an existing LangChain index once (from the Backend directory):
+    python -m app.langgraph_core.retrieval.index_store export faiss_index
+
+Only faiss, numpy and orjson are needed, so this module (and the benchmarks
+built on it) stays importable without the LLM stack.
+"""
+import argparse
+import asyncio
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import faiss
+import numpy as np
+
+from app.langgraph_core.retrieval.docstore import InMemoryDocstore, MappedDocstore
+from app.langgraph_core.retrieval.embeddings import check_embedding_compatibility, read_embedding_meta
+from app.langgraph_core.retrieval.index_factory import INDEX_FILE, configure_search
+from app.langgraph_core.retrieval.lexical import BM25Index, reciprocal_rank_fusion
+
+LEGACY_DOCSTORE_FILE = "index.pkl"
+RETRIEVAL_MODES = ["dense", "lexical", "hybrid"]
+
+# Runs the BM25 leg next to the embedding call on the sync path
+_lexical_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bm25")
+
+
+class SearchHit(NamedTuple):
+    label: int
+    score: float
+    record: dict
+
+
+def read_faiss_index(index_path: str, use_mmap: bool = True):
+    """Reads a FAISS index, memory-mapped when the index type supports it."""
+    if use_mmap:
+        # IFC maps flat/HNSW storage; IVF inverted lists only accept the plain MMAP flag
+        flag_sets = [faiss.IO_FLAG_MMAP | getattr(faiss, "IO_FLAG_MMAP_IFC", 0), faiss.IO_FLAG_MMAP]
+        for flags in flag_sets:
+            try:
+                return faiss.read_index(index_path, flags), True
+            except RuntimeError as e:
+                error = e
+        print(f"--- INDEX STORE: mmap not supported for {index_path} ({error}); reading into memory ---")
+    return faiss.read_index(index_path), False
+
+
+def legacy_records(folder_path: str) -> list[dict]:
+    """Unpickles LangChain's (InMemoryDocstore, index_to_docstore_id) pair into plain records."""
+    with open(os.path.join(folder_path, LEGACY_DOCSTORE_FILE), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    records = []
+    for label in range(len(index_to_docstore_id)):
+        doc_id = index_to_docstore_id[label]
+        document = docstore.search(doc_id)
+        records.append({"id": doc_id, "page_content": document.page_content, "metadata": document.metadata})
+    return records
+
+
+class VectorIndex:
+    """A FAISS index plus the docstore that maps its labels back to chunk records."""
+
+    def __init__(self, index, docstore, embeddings, folder_path: str, mapped: bool, load_seconds: float):
+        self.index = index
+        self.docstore = docstore
+        self.embeddings = embeddings
+        self.folder_path = folder_path
+        self.mapped = mapped
+        self.load_seconds = load_seconds
+        self.lexical: Optional[BM25Index] = None
+        self._folder_labels: Optional[dict[str, np.ndarray]] = None
+        # folders -> (bitmap, selector, search params, BM25 mask); the params point into the bitmap
+        self._folder_filters: dict[tuple[str, ...], tuple] = {}
+
+    def live_labels(self) -> np.ndarray:
+        """Labels currently searchable (ingestion can leave removed records in the docstore)."""
+        if isinstance(self.index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+            return np.sort(faiss.vector_to_array(self.index.id_map))
+        return np.arange(self.index.ntotal, dtype=np.int64)
+
+    def build_lexical(self) -> BM25Index:
+        self.lexical = BM25Index.build((int(label), self.docstore.get(int(label))["page_content"])
+                                       for label in self.live_labels())
+        print(f"--- INDEX STORE: Built BM25 over {len(self.lexical)} chunks in {self.lexical.build_seconds * 1000:.1f} ms ---")
+        return self.lexical
+
+    # --- source_folder pre-filtering ---
+    def folder_labels(self) -> dict[str, np.ndarray]:
+        """Live labels grouped by their chunk's `source_folder` metadata."""
+        if self._folder_labels is None:
+            grouped: dict[str, list[int]] = {}
+            for label in self.live_labels():
+                metadata = (self.docstore.get(int(label)) or {}).get("metadata") or {}
+                grouped.setdefault(metadata.get("source_folder") or "", []).append(int(label))
+            self._folder_labels = {folder: np.asarray(labels, dtype=np.int64) for folder, labels in grouped.items()}
+        return self._folder_labels
+
+    def _search_params(self, selector):
+        # Filtered searches pass their own parameters, so carry over the configured nprobe/efSearch
+        ivf = faiss.try_extract_index_ivf(self.index)
+        if ivf is not None:
+            return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+        concrete = faiss.downcast_index(self.index)
+        if hasattr(concrete, "hnsw"):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=concrete.hnsw.efSearch)
+        return faiss.SearchParameters(sel=selector)
+
+    def _folder_filter(self, folders: Optional[list[str]]):
+        """
+        Returns (FAISS search params, BM25 mask) restricting a search to `folders`, or
+        None when there is nothing to filter on. Built once per folder combination as an
+        IDSelectorBitmap over the labels, so FAISS skips other chunks during the scan.
+        """
+        if not folders:
+            return None
+        key = tuple(sorted(folder for folder in set(folders) if folder in self.folder_labels()))
+        if not key:
+            return None
+        cached = self._folder_filters.get(key)
+        if cached is None:
+            labels = np.concatenate([self._folder_labels[folder] for folder in key])
+            bitmap = np.zeros(int(self.live_labels().max()) // 8 + 1, dtype=np.uint8)
+            np.bitwise_or.at(bitmap, labels >> 3, (1 << (labels & 7)).astype(np.uint8))
+            selector = faiss.IDSelectorBitmap(len(bitmap) * 8, faiss.swig_ptr(bitmap))
+            mask = np.isin(self.lexical.labels, labels) if self.lexical is not None else None
+            cached = (bitmap, selector, self._search_params(selector), mask)
+            self._folder_filters[key] = cached
+        return cached[2], cached[3]
+
+    def _hits(self, scored_labels) -> list[SearchHit]:
+        hits = []
+        for label, score in scored_labels:
+            record = self.docstore.get(label)
+            if record is not None:
+                hits.append(SearchHit(label, score, record))
+        return hits
+
+    def search_by_vector(self, vector, k: int = 5, folders: Optional[list[str]] = None) -> list[SearchHit]:
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        folder_filter = self._folder_filter(folders)
+        if folder_filter:
+            scores, labels = self.index.search(query, k, params=folder_filter[0])
+        else:
+            scores, labels = self.index.search(query, k)
+        hits = []
+        for score, label in zip(scores[0], labels[0]):
+            if label < 0:
+                continue
+            record = self.docstore.get(int(label))
+            if record is not None:
+                hits.append(SearchHit(int(label), float(score), record))
+        return hits
+
+    def search(self, query: str, k: int = 5, folders: Optional[list[str]] = None) -> list[SearchHit]:
+        return self.search_by_vector(self.embeddings.embed_query(query), k, folders)
+
+    async def asearch(self, query: str, k: int = 5, folders: Optional[list[str]] = None) -> list[SearchHit]:
+        # Only the embedding call does I/O; the FAISS search itself is sub-millisecond
+        return self.search_by_vector(await self.embeddings.aembed_query(query), k, folders)
+
+    def lexical_search(self, query: str, k: int = 5, folders: Optional[list[str]] = None) -> list[SearchHit]:
+        lexical = self.lexical or self.build_lexical()
+        folder_filter = self._folder_filter(folders)
+        return self._hits(lexical.search(query, k, allowed=folder_filter[1] if folder_filter else None))
+
+    def _fuse(self, dense: list[SearchHit], lexical: list[SearchHit], k: int, rrf_k: int) -> list[SearchHit]:
+        fused = reciprocal_rank_fusion([[hit.label for hit in dense], [hit.label for hit in lexical]], k=rrf_k, limit=k)
+        return self._hits(fused)
+
+    def hybrid_search(self, query: str, k: int = 5, fetch_k: int = 20, rrf_k: int = 60,
+                      folders: Optional[list[str]] = None) -> list[SearchHit]:
+        """Dense and BM25 legs (each `fetch_k` deep) run concurrently, fused by reciprocal rank."""
+        lexical_future = _lexical_executor.submit(self.lexical_search, query, fetch_k, folders)
+        dense = self.search(query, fetch_k, folders)
+        return self._fuse(dense, lexical_future.result(), k, rrf_k)
+
+    async def ahybrid_search(self, query: str, k: int = 5, fetch_k: int = 20, rrf_k: int = 60,
+                             folders: Optional[list[str]] = None) -> list[SearchHit]:
+        dense, lexical = await asyncio.gather(
+            self.asearch(query, fetch_k, folders),
+            asyncio.to_thread(self.lexical_search, query, fetch_k, folders),
+        )
+        return self._fuse(dense, lexical, k, rrf_k)
+
+    def retrieve(self, query: str, k: int = 5, mode: str = "dense", fetch_k: int = 20, rrf_k: int = 60,
+                 folders: Optional[list[str]] = None) -> list[SearchHit]:
+        """
+        Searches with the given mode, restricted to `folders` when given. A filter that
+        matches nothing falls back to the whole knowledge base.
+        """
+        if mode == "hybrid":
+            hits = self.hybrid_search(query, k, fetch_k, rrf_k, folders)
+        elif mode == "lexical":
+            hits = self.lexical_search(query, k, folders)
+        else:
+            hits = self.search(query, k, folders)
+        if folders and not hits:
+            return self.retrieve(query, k, mode, fetch_k, rrf_k)
+        return hits
+
+    async def aretrieve(self, query: str, k: int = 5, mode: str = "dense", fetch_k: int = 20, rrf_k: int = 60,
+                        folders: Optional[list[str]] = None) -> list[SearchHit]:
+        if mode == "hybrid":
+            hits = await self.ahybrid_search(query, k, fetch_k, rrf_k, folders)
+        elif mode == "lexical":
+            hits = self.lexical_search(query, k, folders)
+        else:
+            hits = await self.asearch(query, k, folders)
+        if folders and not hits:
+            return await self.aretrieve(query, k, mode, fetch_k, rrf_k)
+        return hits
+
+    def close(self):
+        self.docstore.close()
+
+    def stats(self) -> dict:
+        return {
+            "folder": self.folder_path,
+            "index_type": type(self.index).__name__,
+            "vectors": int(self.index.ntotal),
+            "dimension": int(self.index.d),
+            "documents": len(self.docstore),
+            "mapped": self.mapped,
+            "embedding": read_embedding_meta(self.folder_path),
+            "load_ms": round(self.load_seconds * 1000, 2),
+            "lexical": self.lexical.stats() if self.lexical else None,
+            "folders": {folder: len(labels) for folder, labels in self.folder_labels().items()},
+        }
+
+
+def load_vector_index(folder_path: str, embeddings, use_mmap: bool = True, nprobe: Optional[int] = None,
+                      ef_search: Optional[int] = None, lexical: bool = False) -> VectorIndex:
+    """
+    Loads `folder_path/index.faiss` with its docstore. Falls back to the legacy
+    pickled docstore (with a warning) when the index hasn't been exported yet.
+    `nprobe`/`ef_search` only apply to IVF/HNSW indexes respectively. Raises
+    ValueError if `embeddings` differs from the backend the index was built with.
+    `lexical=True` also builds the in-memory BM25 index used by hybrid retrieval.
+    """
+    started = time.perf_counter()
+    index, index_mapped = read_faiss_index(os.path.join(folder_path, INDEX_FILE), use_mmap)
+    spec = getattr(embeddings, "spec", None)
+    if spec:
+        # Querying with a different embedding model returns confident garbage; refuse instead
+        check_embedding_compatibility(folder_path, spec, index.d)
+    configure_search(index, nprobe=nprobe, ef_search=ef_search)
+    if MappedDocstore.exists(folder_path):
+        docstore = MappedDocstore(folder_path)
+        docstore_mapped = True
+    else:
+        print(f"--- INDEX STORE: No mapped docstore in {folder_path}; unpickling {LEGACY_DOCSTORE_FILE}. "
+              f"Run `python -m app.langgraph_core.retrieval.index_store export {folder_path}` to share it across workers. ---")
+        docstore = InMemoryDocstore(legacy_records(folder_path))
+        docstore_mapped = False
+    vector_index = VectorIndex(index, docstore, embeddings, folder_path, index_mapped and docstore_mapped,
+                               time.perf_counter() - started)
+    print(f"--- INDEX STORE: Loaded {index.ntotal} vectors from {folder_path} in {vector_index.load_seconds * 1000:.1f} ms "
+          f"(mapped={vector_index.mapped}) ---")
+    if lexical:
+        vector_index.build_lexical()
+    return vector_index
+
+
+def export_mapped_docstore(folder_path: str) -> int:
+    """Writes the mapped docstore next to a LangChain-saved index. Returns the record count."""
+    records = legacy_records(folder_path)
+    MappedDocstore.write(folder_path, records)
+    return len(records)
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage the memory-mapped knowledge-base index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export", help="Convert LangChain's index.pkl into a mapped docstore.")
+    export_cmd.add_argument("folder", nargs="?", default="faiss_index")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        count = export_mapped_docstore(args.folder)
+        print(f"Exported {count} records to {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# app/langgraph_core/retrieval/lexical.py
+"""
+In-memory BM25 over the knowledge-base chunks, plus reciprocal rank fusion.
+
+Dense embeddings blur exact technology names ("Kubernetes CKA", "PyTorch
+Lightning"); a lexical leg catches them. Postings are stored CSR-style in
+flat numpy arrays (term -> slice of doc ids and precomputed BM25 weights), so
+a query is a handful of vectorised scatter-adds rather than a Python loop
+over documents.
+"""
+import re
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Keeps "c++", "c#" and "node.js" as single tokens
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.rstrip(".") for token in _TOKEN_PATTERN.findall(text.lower()) if token.rstrip(".")]
+
+
+class BM25Index:
+    """
+    BM25 (k1, b) with postings held as:
+      - `indptr`  int64[V + 1]: term t's postings are `indptr[t]:indptr[t + 1]`
+      - `doc_ids` int32[P]:     internal document numbers
+      - `weights` float32[P]:   idf * saturated term frequency, precomputed
+    `labels` maps internal document numbers back to FAISS/docstore labels.
+    """
+
+    def __init__(self, vocabulary: dict[str, int], indptr: np.ndarray, doc_ids: np.ndarray,
+                 weights: np.ndarray, labels: np.ndarray):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.labels = labels
+        self.build_seconds = 0.0
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[int, str]], k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Builds the index from (label, text) pairs."""
+        started = time.perf_counter()
+        vocabulary: dict[str, int] = {}
+        term_ids, doc_numbers, counts, lengths, labels = [], [], [], [], []
+        for doc_number, (label, text) in enumerate(documents):
+            tokens = tokenize(text)
+            labels.append(label)
+            lengths.append(len(tokens))
+            frequencies: dict[int, int] = {}
+            for token in tokens:
+                term_id = vocabulary.setdefault(token, len(vocabulary))
+                frequencies[term_id] = frequencies.get(term_id, 0) + 1
+            term_ids.extend(frequencies.keys())
+            counts.extend(frequencies.values())
+            doc_numbers.extend([doc_number] * len(frequencies))
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        doc_numbers = np.asarray(doc_numbers, dtype=np.int32)
+        tf = np.asarray(counts, dtype=np.float32)
+        lengths = np.asarray(lengths, dtype=np.float32)
+        doc_count = len(labels)
+
+        # Group postings by term (stable, so doc ids stay ascending within a term)
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, doc_numbers, tf = term_ids[order], doc_numbers[order], tf[order]
+        postings_per_term = np.bincount(term_ids, minlength=len(vocabulary))
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(postings_per_term, out=indptr[1:])
+
+        document_frequency = postings_per_term.astype(np.float32)
+        idf = np.log(1.0 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+        average_length = float(lengths.mean()) if doc_count else 0.0
+        norm = k1 * (1.0 - b + b * lengths[doc_numbers] / (average_length or 1.0))
+        weights = (idf[term_ids] * tf * (k1 + 1.0) / (tf + norm)).astype(np.float32)
+
+        index = cls(vocabulary, indptr, doc_numbers, weights, np.asarray(labels, dtype=np.int64))
+        index.build_seconds = time.perf_counter() - started
+        return index
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def search(self, query: str, k: int = 5, allowed: Optional[np.ndarray] = None) -> list[tuple[int, float]]:
+        """
+        Returns up to k (label, score) pairs, best first. Documents with no query term
+        are skipped; `allowed` (a bool mask over `labels`) restricts the candidates.
+        """
+        term_ids = {self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary}
+        if not term_ids:
+            return []
+        scores = np.zeros(len(self.labels), dtype=np.float32)
+        for term_id in term_ids:
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # A document appears at most once per term, so plain fancy-index += is safe
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+        if allowed is not None:
+            scores[~allowed] = 0.0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(self.labels[doc]), float(scores[doc])) for doc in candidates]
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self.labels),
+            "terms": len(self.vocabulary),
+            "postings": int(len(self.doc_ids)),
+            "bytes": int(self.indptr.nbytes + self.doc_ids.nbytes + self.weights.nbytes + self.labels.nbytes),
+            "build_ms": round(self.build_seconds * 1000, 2),
+        }
+
+
+def reciprocal_rank_fusion(rankings: list[list[int]], k: int = 60, limit: Optional[int] = None) -> list[tuple[int, float]]:
+    """
+    Fuses ranked label lists: score(d) = sum over lists of 1 / (k + rank(d)), rank from 1.
+    Ties keep the order in which labels were first seen (dense leg first).
+    """
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, label in enumerate(ranking, start=1):
+            scores[label] = scores.get(label, 0.0) + 1.0 / (k + rank)
+    fused = sorted(scores.items(), key=lambda item: -item[1])
+    return fused[:limit] if limit else fused
@@ -0,0 +1,58 @@
+# app/langgraph_core/retrieval/retriever.py
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from app.core.config import settings
+from app.langgraph_core.retrieval.folder_router import infer_source_folders
+from app.langgraph_core.retrieval.index_store import RETRIEVAL_MODES, SearchHit, VectorIndex, load_vector_index
+
+
+def _to_document(hit: SearchHit) -> Document:
+    record = hit.record
+    return Document(id=record.get("id"), page_content=record["page_content"], metadata=record.get("metadata") or {})
+
+
+class IndexRetriever(BaseRetriever):
+    """LangChain retriever over a `VectorIndex`, a drop-in for `FAISS.as_retriever()`."""
+
+    vector_index: Any
+    k: int = 5
+    # "dense" (FAISS only), "lexical" (BM25 only) or "hybrid" (both, fused by reciprocal rank)
+    mode: str = "dense"
+    fetch_k: int = 20
+    rrf_k: int = 60
+    # Restrict each search to the source_folders the question is about (Roadmap/Courses/Resume)
+    filter_folders: bool = False
+
+    def _folders(self, query: str):
+        return infer_source_folders(query) if self.filter_folders else None
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        hits = self.vector_index.retrieve(query, self.k, self.mode, self.fetch_k, self.rrf_k, self._folders(query))
+        return [_to_document(hit) for hit in hits]
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun) -> list[Document]:
+        hits = await self.vector_index.aretrieve(query, self.k, self.mode, self.fetch_k, self.rrf_k, self._folders(query))
+        return [_to_document(hit) for hit in hits]
+
+
+def load_configured_index(folder_path: str, embeddings) -> VectorIndex:
+    """Loads an index folder (memory-mapped where possible) with the search settings from config."""
+    mode = settings.RETRIEVAL_MODE
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"RETRIEVAL_MODE must be one of {RETRIEVAL_MODES}, got '{mode}'")
+    return load_vector_index(folder_path, embeddings, nprobe=settings.VECTOR_INDEX_NPROBE,
+                             ef_search=settings.VECTOR_INDEX_EF_SEARCH, lexical=mode != "dense")
+
+
+def configured_retriever(vector_index: VectorIndex, k: int = 5) -> IndexRetriever:
+    return IndexRetriever(vector_index=vector_index, k=k, mode=settings.RETRIEVAL_MODE, fetch_k=settings.RETRIEVAL_FETCH_K,
+                          rrf_k=settings.RETRIEVAL_RRF_K, filter_folders=settings.RETRIEVAL_FOLDER_FILTER)
+
+
+def load_vector_store(folder_path: str, embeddings, k: int = 5) -> IndexRetriever:
+    """Loads the knowledge-base index and wraps it as a retriever."""
+    return configured_retriever(load_configured_index(folder_path, embeddings), k)
@@ -0,0 +1,56 @@
+# app/langgraph_core/routing_log.py
+import json
+import threading
+import time
+from typing import Optional
+
+
+class RoutingLog:
+    """
+    Appends supervisor decisions to a JSONL file. These records are the
+    training data for the local intent classifier and carry the LLM router's
+    latency for comparison.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, prompt: str, resume_exists: bool, decision: str, source: str,
+               latency_ms: float, confidence: Optional[float] = None):
+        if not self.path:
+            return
+        entry = {
+            "ts": round(time.time(), 3),
+            "prompt": prompt,
+            "resume_exists": resume_exists,
+            "decision": decision,
+            "source": source,
+            "latency_ms": round(latency_ms, 3),
+        }
+        if confidence is not None:
+            entry["confidence"] = round(confidence, 4)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+        except OSError as e:
+            print(f"--- ROUTING LOG: could not write to {self.path}: {e} ---")
+
+
+def read_routing_log(path: str, sources: Optional[set[str]] = None) -> list[dict]:
+    """Loads logged decisions, optionally keeping only some sources (e.g. {"llm"})."""
+    records = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if sources and record.get("source") not in sources:
+                continue
+            records.append(record)
+    return records
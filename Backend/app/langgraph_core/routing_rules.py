@@ -0,0 +1,123 @@
+# app/langgraph_core/routing_rules.py
+"""
+Precompiled resume follow-up rules for the supervisor.
+
+All keyword, regex and context-clue heuristics are compiled once, at import,
+into a single non-capturing alternation. One `search()` over the lowercased
+message answers "did any strong rule fire?"; only on a hit do we re-test the
+individual rules at the match position to name the one that triggered (capture
+groups on every branch would make the common, no-match path several times
+slower). The weaker question-shape heuristics live in a second compiled
+pattern that only runs when no strong rule matched, because their greedy `.*`
+would otherwise shadow strong matches later in the message.
+
+This module has no LangChain imports so the benchmarks can load it on its own.
+"""
+import re
+from typing import NamedTuple, Optional
+
+RESUME_REFERENCE_KEYWORDS = [
+    "my resume", "my cv", "the resume", "the cv", "my document",
+    "the document", "the file", "from my resume", "in my resume",
+    "on my resume", "resume shows", "cv shows", "document shows"
+]
+
+RESUME_CONTENT_KEYWORDS = [
+    "my experience", "my education", "my skills", "my projects",
+    "my work experience", "my background", "my qualifications",
+    "what are my", "what do i have", "what's my", "where did i work",
+    "what did i study", "my degree", "my job", "my role", "my position"
+]
+
+RESUME_ACTION_KEYWORDS = [
+    "rewrite", "improve", "update", "modify", "change", "edit",
+    "enhance", "revise", "fix", "adjust", "optimize", "strengthen"
+]
+
+RESUME_PATTERNS = [
+    # Direct resume references
+    r"(?:my|the)\s+(?:resume|cv)",
+    r"(?:from|in|on)\s+(?:my|the)\s+(?:resume|cv)",
+
+    # Possessive patterns about experience/skills
+    r"my\s+(?:experience|skills|education|background|projects)",
+    r"what\s+(?:are|is)\s+my\s+(?:experience|skills|education)",
+    r"where\s+(?:did|have)\s+i\s+(?:work|study)",
+
+    # Action patterns on resume content
+    r"(?:rewrite|improve|update|modify|change|edit)\s+(?:my|the)",
+    r"(?:enhance|revise|fix|adjust)\s+(?:my\s+)?(?:experience|skills|education)",
+
+    # Section-specific references
+    r"(?:experience|education|skills|projects?)\s+section",
+    r"(?:work|job)\s+(?:experience|history)",
+    r"(?:technical|programming)\s+skills"
+]
+
+CONTEXT_CLUES = [
+    "based on", "according to", "mentioned in", "listed in",
+    "show that", "indicates", "reflects", "demonstrates"
+]
+
+# Question words + possessive pronouns; only trusted on short messages
+QUESTION_PATTERNS = [
+    r"(?:what|where|when|how|which|who)\s+.*\s+(?:my|i)",
+    r"(?:can|could|should|would)\s+.*\s+(?:my|i)",
+    r"(?:do|did|have|am|was)\s+i\s+",
+    r"(?:tell|show|explain)\s+.*\s+(?:my|about\s+my)"
+]
+QUESTION_MAX_WORDS = 15
+
+
+class RuleMatch(NamedTuple):
+    destination: str
+    kind: str   # "direct", "pattern", "context" or "question"
+    rule: str   # the keyword or regex source that fired
+    text: str   # the span of the message it matched
+
+
+class _CompiledRules(NamedTuple):
+    combined: re.Pattern
+    rules: list[tuple[str, str, re.Pattern]]
+
+
+def _compile_rules(rules: list[tuple[str, str, str]]) -> _CompiledRules:
+    """Joins (kind, label, regex) rules into one alternation, keeping each rule for attribution."""
+    combined = re.compile("|".join(f"(?:{source})" for _, _, source in rules))
+    return _CompiledRules(combined, [(kind, label, re.compile(source)) for kind, label, source in rules])
+
+
+_STRONG_RULES = _compile_rules(
+    [("direct", keyword, re.escape(keyword)) for keyword in
+     RESUME_REFERENCE_KEYWORDS + RESUME_CONTENT_KEYWORDS + RESUME_ACTION_KEYWORDS]
+    + [("pattern", pattern, pattern) for pattern in RESUME_PATTERNS]
+    + [("context", clue, re.escape(clue)) for clue in CONTEXT_CLUES]
+)
+_QUESTION_RULES = _compile_rules([("question", pattern, pattern) for pattern in QUESTION_PATTERNS])
+
+
+def _describe(match: re.Match, compiled: _CompiledRules) -> RuleMatch:
+    # The alternation picked the first branch that matches at this position
+    for kind, label, rule in compiled.rules:
+        rule_match = rule.match(match.string, match.start())
+        if rule_match:
+            return RuleMatch("ResumeQAAgent", kind, label, rule_match.group(0))
+    return RuleMatch("ResumeQAAgent", "unknown", "", match.group(0))
+
+
+def match_resume_followup(message: str) -> Optional[RuleMatch]:
+    """
+    Decides whether a message (sent while a resume is loaded) is a follow-up
+    about that resume. Returns the triggering rule, or None if none fired.
+    """
+    text = message.lower()
+
+    strong = _STRONG_RULES.combined.search(text)
+    if strong:
+        return _describe(strong, _STRONG_RULES)
+
+    question = _QUESTION_RULES.combined.search(text)
+    if question and len(text.split()) <= QUESTION_MAX_WORDS:
+        return _describe(question, _QUESTION_RULES)
+
+    return None
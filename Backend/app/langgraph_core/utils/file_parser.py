@@ -1,25 +1,211 @@
 # In Backend/langgraph_core/utils/file_parser.py
+import re
+import zipfile
+from io import BytesIO # Make sure BytesIO is imported
+from typing import Optional, Union
+
 import fitz
 import docx
-from io import BytesIO # Make sure BytesIO is imported
 
-def extract_text_from_file(file_bytes: bytes, filename: str):
-    """Extracts text from raw bytes of a PDF or DOCX file."""
+# --- Format sniffing ---
+# Uploads are identified by their leading bytes, not their name, so each file
+# is parsed exactly once by the right extractor and anything else is rejected
+# before any parsing work.
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06")
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .doc (and .xls/.ppt)
+RTF_MAGIC = b"{\\rtf"
+UTF8_BOM = b"\xef\xbb\xbf"
+UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+SUPPORTED_TYPES = ("pdf", "docx", "rtf", "text")
+
+# An upload is either its raw bytes or the path of the temp file it was streamed to
+FileSource = Union[bytes, str]
+
+UNSUPPORTED_MESSAGES = {
+    "doc": "Error: Legacy Word (.doc) files are not supported. Please save the resume as DOCX or PDF and upload it again.",
+    "zip": "Error: This ZIP archive is not a Word document. Please upload the resume as a PDF or DOCX file.",
+    "unknown": "Error: Unsupported file type. Please upload the resume as a PDF, DOCX, RTF or plain text file.",
+}
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if b"\x00" in head:
+        return False
+    try:
+        sample = head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # The sample may end mid-character; anything earlier means it isn't UTF-8 text
+        if e.start < len(head) - 3:
+            return False
+        sample = head[:e.start].decode("utf-8")
+    printable = sum(1 for ch in sample if ch.isprintable() or ch in "\r\n\t\f")
+    return bool(sample.strip()) and printable / len(sample) > 0.95
+
+
+def _read_head(source: FileSource, size: int = 4096) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(size)
+    return bytes(source[:size])
+
+
+def _open_source(source: FileSource):
+    """Something the PDF/DOCX/ZIP readers accept: the path itself, or a stream over the bytes."""
+    return source if isinstance(source, str) else BytesIO(source)
+
+
+def _read_all(source: FileSource) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return bytes(source)
+
+
+def detect_file_type(source: FileSource) -> str:
+    """
+    Returns "pdf", "docx", "rtf" or "text" for supported uploads, and "doc",
+    "zip" or "unknown" for ones that should be rejected.
+    """
+    head = _read_head(source)
+    # PDF readers accept up to 1 KB of junk before the header
+    if PDF_MAGIC in head[:1024]:
+        return "pdf"
+    if head.startswith(ZIP_MAGICS):
+        # An OOXML Word file is a ZIP with word/document.xml; only the central directory is read here
+        try:
+            with zipfile.ZipFile(_open_source(source)) as archive:
+                return "docx" if "word/document.xml" in archive.namelist() else "zip"
+        except zipfile.BadZipFile:
+            return "unknown"
+    if head.startswith(OLE_MAGIC):
+        return "doc"
+    if head.lstrip(UTF8_BOM).startswith(RTF_MAGIC):
+        return "rtf"
+    if head.startswith(UTF16_BOMS) or _looks_like_text(head.lstrip(UTF8_BOM)):
+        return "text"
+    return "unknown"
+
+
+# --- Extractors ---
+
+class PageLimitExceeded(ValueError):
+    pass
+
+
+def _extract_pdf(source: FileSource, max_pages: Optional[int] = None) -> str:
+    # From a path PyMuPDF reads pages on demand instead of holding the whole file
+    opened = fitz.open(source, filetype="pdf") if isinstance(source, str) else fitz.open(stream=BytesIO(source), filetype="pdf")
+    with opened as doc:
+        # Checked before any page is rendered, so a 200-page scan costs almost nothing
+        if max_pages and doc.page_count > max_pages:
+            raise PageLimitExceeded(f"Error: The PDF has {doc.page_count} pages; resumes longer than {max_pages} pages are not analysed.")
+        return "".join(page.get_text() for page in doc)
+
+
+def _extract_docx(source: FileSource) -> str:
+    # python-docx can read a path or the file-like object directly
+    doc = docx.Document(_open_source(source))
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+_RTF_TOKEN = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.I)
+# Groups whose content is formatting or metadata, not document text
+_RTF_SKIP_DESTINATIONS = {"fonttbl", "colortbl", "stylesheet", "info", "pict", "header", "footer", "listtable",
+                          "listoverridetable", "rsidtbl", "generator", "xmlnstbl", "themedata", "datastore"}
+
+
+def _extract_rtf(source: FileSource) -> str:
+    """Plain text of an RTF document: control words dropped, \\par/\\tab/\\'hh/\\uN decoded."""
+    text = _read_all(source).decode("latin-1")
+    out = []
+    stack = []  # skip flag of each enclosing group
+    skipping = False
+    pending_skip = 0  # characters to drop after \uN (its ANSI fallback)
+    for match in _RTF_TOKEN.finditer(text):
+        word, argument, hex_code, symbol, brace, plain = match.groups()
+        if brace == "{":
+            stack.append(skipping)
+        elif brace == "}":
+            skipping = stack.pop() if stack else False
+        elif word:
+            word = word.lower()
+            if word in _RTF_SKIP_DESTINATIONS:
+                skipping = True
+            elif skipping:
+                continue
+            elif word in ("par", "line", "row"):
+                out.append("\n")
+            elif word in ("tab", "cell"):
+                out.append("\t")
+            elif word == "u" and argument:
+                out.append(chr(int(argument) % 65536))
+                pending_skip = 1
+        elif symbol == "*":
+            skipping = True  # {\*\destination ...} is ignorable by definition
+        elif skipping:
+            continue
+        elif hex_code:
+            if pending_skip:
+                pending_skip -= 1
+            else:
+                out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif symbol:
+            out.append(symbol if symbol in "\\{}" else "")
+        elif plain:
+            if pending_skip:
+                plain = plain[pending_skip:]
+                pending_skip = 0
+            out.append(plain)
+    return "".join(out)
+
+
+def _extract_text(source: FileSource) -> str:
+    file_bytes = _read_all(source)
+    if file_bytes.startswith(UTF16_BOMS):
+        return file_bytes.decode("utf-16")
     try:
-        # Create an in-memory file-like object from the bytes
-        file_stream = BytesIO(file_bytes)
-
-        if filename.lower().endswith('.pdf'):
-            with fitz.open(stream=file_stream, filetype="pdf") as doc:
-                return "".join(page.get_text() for page in doc)
-        
-        elif filename.lower().endswith('.docx'):
-            # python-docx can read the file-like object directly
-            doc = docx.Document(file_stream)
-            return "\n".join([para.text for para in doc.paragraphs])
-        
-        else:
-            return "Error: Unsupported file type."
-            
+        return file_bytes.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return file_bytes.decode("latin-1")
+
+
+_EXTRACTORS = {
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+    "rtf": _extract_rtf,
+    "text": _extract_text,
+}
+
+
+def extract_resume_text(source: FileSource, max_pages: Optional[int] = None) -> str:
+    """
+    Detects the upload's format from its leading bytes and extracts its text once.
+    `source` is the file's bytes or the path of a file on disk.
+    Returns the text, or a string starting with "Error:" for unsupported or unreadable files.
+    `max_pages` rejects longer PDFs before their pages are read.
+    """
+    try:
+        file_type = detect_file_type(source)
+    except OSError as e:
+        return f"Error: Could not open the uploaded file. Reason: {e}"
+    if file_type not in _EXTRACTORS:
+        print(f"--- FILE PARSER: Rejected upload of type '{file_type}' ---")
+        return UNSUPPORTED_MESSAGES[file_type]
+    try:
+        text = _extract_pdf(source, max_pages) if file_type == "pdf" else _EXTRACTORS[file_type](source)
+    except PageLimitExceeded as e:
+        return str(e)
+    except MemoryError:
+        return f"Error: The {file_type.upper()} file needs more memory to read than uploads are allowed."
     except Exception as e:
-        return f"Error: Could not read the file content. Reason: {e}"
\ No newline at end of file
+        return f"Error: Could not read the {file_type.upper()} file content. Reason: {e}"
+    if not text or not text.strip():
+        return f"Error: No text could be extracted from the uploaded {file_type.upper()} file."
+    return text
+
+
+def extract_text_from_file(file_bytes: bytes, filename: str = ""):
+    """Extracts text from raw bytes of a PDF, DOCX, RTF or text file. The filename is not trusted."""
+    return extract_resume_text(file_bytes)
@@ -0,0 +1,273 @@
+# app/langgraph_core/utils/ingest.py
+"""
+Incremental ingestion of the career documents into the knowledge-base index.
+
+    python -m app.langgraph_core.utils.ingest --docs carrer_docs --index faiss_index
+
+- PDFs are read and chunked in a process pool (`--workers`).
+- Chunks are embedded in batches (`--batch-size`) with at most `--concurrency`
+  embedding calls in flight.
+- `ingest_manifest.json` in the index folder records each file's SHA-256 and the
+  FAISS labels of its chunks, so a re-run only re-chunks and re-embeds new or
+  changed files, and removes the vectors of changed or deleted ones in place.
+
+Labels are stable (the index is wrapped in an `IndexIDMap2` when needed), and
+the docstore is append-only: removed chunks stay in it as unreachable records
+until `--compact` rewrites the index and docstore with contiguous labels.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import faiss
+import numpy as np
+
+from app.langgraph_core.retrieval.docstore import InMemoryDocstore, MappedDocstore
+from app.langgraph_core.retrieval.embeddings import (
+    EMBEDDING_BACKENDS,
+    check_embedding_compatibility,
+    create_embeddings,
+    write_embedding_meta,
+)
+from app.langgraph_core.retrieval.index_factory import INDEX_FILE, build_index
+from app.langgraph_core.retrieval.index_store import LEGACY_DOCSTORE_FILE, legacy_records
+from app.langgraph_core.utils.read_pdfs import chunk_pdf
+
+MANIFEST_FILE = "ingest_manifest.json"
+
+
+# --- Source scanning ---
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_documents(docs_root: str) -> dict[str, dict]:
+    """Maps "<folder>/<file>.pdf" to its path, source folder and content hash."""
+    found = {}
+    for folder in sorted(os.listdir(docs_root)):
+        folder_path = os.path.join(docs_root, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in sorted(os.listdir(folder_path)):
+            if filename.lower().endswith(".pdf"):
+                path = os.path.join(folder_path, filename)
+                found[f"{folder}/{filename}"] = {"path": path, "source_folder": folder, "sha256": _file_sha256(path)}
+    return found
+
+
+# --- Manifest ---
+
+def _existing_docstore(index_folder: str):
+    """The docstore next to an existing index: the mapped one, or the LangChain `index.pkl` it replaced."""
+    if MappedDocstore.exists(index_folder):
+        return MappedDocstore(index_folder)
+    if os.path.exists(os.path.join(index_folder, LEGACY_DOCSTORE_FILE)):
+        # Seeding from it keeps new labels clear of the ones the old vectors hold
+        print(f"--- INGEST: Reading the legacy {LEGACY_DOCSTORE_FILE} in {index_folder} ---")
+        return InMemoryDocstore(legacy_records(index_folder))
+    return None
+
+
+def load_manifest(index_folder: str, docstore) -> dict:
+    path = os.path.join(index_folder, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    manifest = {"files": {}}
+    if docstore is not None:
+        # Index built before the manifest existed: attribute chunks by source, with
+        # unknown hashes so every file is refreshed once
+        for label in range(len(docstore)):
+            metadata = docstore.get(label).get("metadata") or {}
+            key = f"{metadata.get('source_folder')}/{metadata.get('source_file')}"
+            manifest["files"].setdefault(key, {"sha256": None, "labels": []})["labels"].append(label)
+        print(f"--- INGEST: No manifest in {index_folder}; seeded one from {len(docstore)} existing chunks ---")
+    return manifest
+
+
+def save_manifest(index_folder: str, manifest: dict):
+    path = os.path.join(index_folder, MANIFEST_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+# --- Index helpers ---
+
+def _updatable_index(index):
+    """Returns an index whose labels survive `remove_ids` (IVF natively; flat via IndexIDMap2)."""
+    # `index` comes from faiss.read_index, which already returns the concrete class; don't
+    # downcast it here, the downcast proxy doesn't own the C++ object
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) or faiss.try_extract_index_ivf(index) is not None:
+        return index
+    if isinstance(index, faiss.IndexFlat):
+        wrapped = faiss.IndexIDMap2(faiss.IndexFlat(index.d, index.metric_type))
+        if index.ntotal:
+            wrapped.add_with_ids(index.reconstruct_n(0, index.ntotal), np.arange(index.ntotal, dtype=np.int64))
+        return wrapped
+    raise SystemExit(f"{type(index).__name__} can't delete vectors in place; re-run with --full or convert to flat/IVF first.")
+
+
+def _write_index(index, index_folder: str):
+    path = os.path.join(index_folder, INDEX_FILE)
+    faiss.write_index(index, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+async def embed_in_batches(embeddings, texts: list[str], batch_size: int, concurrency: int) -> np.ndarray:
+    """Embeds `texts` in order, with at most `concurrency` batch calls running at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+    batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+    done = 0
+
+    async def run(batch: list[str]):
+        nonlocal done
+        async with semaphore:
+            vectors = await embeddings.aembed_documents(batch)
+        done += len(batch)
+        print(f"  - Embedded {done}/{len(texts)} chunks")
+        return vectors
+
+    results = await asyncio.gather(*(run(batch) for batch in batches))
+    return np.asarray([vector for batch in results for vector in batch], dtype=np.float32)
+
+
+def _compact(index, docstore_records: list[dict], manifest: dict):
+    """Rebuilds index and docstore with only live chunks, relabelled 0..n-1."""
+    live = sorted(label for entry in manifest["files"].values() for label in entry["labels"])
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+    vectors = np.vstack([index.reconstruct(label) for label in live]) if live else np.zeros((0, index.d), dtype=np.float32)
+    relabel = {old: new for new, old in enumerate(live)}
+    for entry in manifest["files"].values():
+        entry["labels"] = [relabel[label] for label in entry["labels"]]
+
+    inner = faiss.downcast_index(index.index) if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) else index
+    if isinstance(inner, faiss.IndexIVFPQ):
+        rebuilt = build_index(vectors, "ivf_pq", metric=index.metric_type, pq_m=inner.pq.M, pq_nbits=inner.pq.nbits)
+    elif isinstance(inner, faiss.IndexIVFFlat):
+        rebuilt = build_index(vectors, "ivf_flat", metric=index.metric_type)
+    else:
+        rebuilt = faiss.IndexIDMap2(faiss.IndexFlat(index.d, index.metric_type))
+        if len(live):
+            rebuilt.add_with_ids(vectors, np.arange(len(live), dtype=np.int64))
+    return rebuilt, [docstore_records[label] for label in live]
+
+
+# --- Pipeline ---
+
+def ingest(docs_root: str, index_folder: str, embeddings, workers: Optional[int] = None, batch_size: int = 64,
+           concurrency: int = 4, full: bool = False, compact: bool = False) -> dict:
+    started = time.perf_counter()
+    os.makedirs(index_folder, exist_ok=True)
+    has_index = os.path.exists(os.path.join(index_folder, INDEX_FILE)) and not full
+
+    index = None
+    records = []
+    manifest = {"files": {}}
+    if has_index:
+        index = faiss.read_index(os.path.join(index_folder, INDEX_FILE))
+        check_embedding_compatibility(index_folder, embeddings.spec, index.d)
+        index = _updatable_index(index)
+        docstore = _existing_docstore(index_folder)
+        if docstore is None and index.ntotal:
+            raise SystemExit(f"{index_folder} has {index.ntotal} vectors but no docstore to match them to; "
+                             f"re-run with --full to rebuild it.")
+        manifest = load_manifest(index_folder, docstore)
+        if docstore:
+            records = [docstore.get(label) for label in range(len(docstore))]
+            docstore.close()
+
+    sources = scan_documents(docs_root)
+    known = manifest["files"]
+    changed = [key for key, source in sources.items() if key not in known or known[key]["sha256"] != source["sha256"]]
+    deleted = [key for key in known if key not in sources]
+
+    # 1. Drop the vectors of files that changed or disappeared
+    stale_labels = [label for key in changed + deleted if key in known for label in known[key]["labels"]]
+    if stale_labels and index is not None:
+        index.remove_ids(np.asarray(stale_labels, dtype=np.int64))
+    for key in deleted:
+        del known[key]
+
+    # 2. Read and chunk new/changed PDFs in parallel
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunk_lists = list(pool.map(chunk_pdf, [sources[key]["path"] for key in changed],
+                                    [sources[key]["source_folder"] for key in changed]))
+
+    # 3. Embed the new chunks in concurrent batches
+    new_chunks = [chunk for chunks in chunk_lists for chunk in chunks]
+    vectors = asyncio.run(embed_in_batches(embeddings, [c["page_content"] for c in new_chunks], batch_size, concurrency)) \
+        if new_chunks else None
+
+    # 4. Append them under fresh labels
+    if index is None:
+        dimension = vectors.shape[1] if vectors is not None else embeddings.spec.get("dimension")
+        if not dimension:
+            raise SystemExit("No documents to ingest and no existing index to extend.")
+        index = faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+    next_label = len(records)
+    for key, chunks in zip(changed, chunk_lists):
+        labels = list(range(next_label, next_label + len(chunks)))
+        next_label += len(chunks)
+        known[key] = {"sha256": sources[key]["sha256"], "labels": labels}
+        records.extend({"id": str(uuid.uuid4()), **chunk} for chunk in chunks)
+    if new_chunks:
+        index.add_with_ids(vectors, np.arange(len(records) - len(new_chunks), len(records), dtype=np.int64))
+
+    if compact:
+        index, records = _compact(index, records, manifest)
+
+    # 5. Persist: index, docstore, manifest, embedding metadata
+    _write_index(index, index_folder)
+    MappedDocstore.write(index_folder, records)
+    save_manifest(index_folder, manifest)
+    write_embedding_meta(index_folder, embeddings.spec, index.d)
+
+    return {
+        "files_total": len(sources),
+        "files_changed": len(changed),
+        "files_deleted": len(deleted),
+        "chunks_embedded": len(new_chunks),
+        "vectors_removed": len(stale_labels),
+        "vectors_live": int(index.ntotal),
+        "docstore_records": len(records),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main(argv: Optional[list[str]] = None):
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Incrementally (re)index the career documents.")
+    parser.add_argument("--docs", default="carrer_docs", help="Root folder with one sub-folder per source (Roadmap, Resume, Courses...).")
+    parser.add_argument("--index", default=settings.VECTOR_INDEX_PATH)
+    parser.add_argument("--backend", choices=EMBEDDING_BACKENDS, default=settings.EMBEDDING_BACKEND)
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: CPU count).")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embedding call.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Embedding calls in flight at once.")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and rebuild from scratch.")
+    parser.add_argument("--compact", action="store_true", help="Drop removed chunks and relabel 0..n-1.")
+    args = parser.parse_args(argv)
+
+    embeddings = create_embeddings(args.backend, args.model, device=settings.EMBEDDING_DEVICE, runtime=settings.EMBEDDING_RUNTIME)
+    summary = ingest(args.docs, args.index, embeddings, workers=args.workers, batch_size=args.batch_size,
+                     concurrency=args.concurrency, full=args.full, compact=args.compact)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,39 @@ def read_pdf_text(pdf_path):
         print(f"Error reading PDF {pdf_path}: {e}")
         return ""
 
+# Shared chunking settings, so the ingestion CLI and this script agree
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 150
+
+_text_splitter = None
+
+
+def _get_text_splitter():
+    global _text_splitter
+    if _text_splitter is None:
+        _text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return _text_splitter
+
+
+def chunk_text(text, source_file, source_folder):
+    """
+    Splits one document's text into chunk records ({"page_content", "metadata"}).
+    Plain dicts rather than Documents so they can cross process boundaries cheaply.
+    """
+    return [
+        {"page_content": chunk, "metadata": {"source_file": source_file, "source_folder": source_folder}}
+        for chunk in _get_text_splitter().split_text(text)
+    ]
+
+
+def chunk_pdf(pdf_path, source_folder):
+    """Reads and chunks a single PDF. Safe to run in a worker process."""
+    text = read_pdf_text(pdf_path)
+    if not text or not text.strip():
+        return []
+    return chunk_text(text, os.path.basename(pdf_path), source_folder)
+
+
 # 2. Function to process all PDFs in a list of folders
 def process_all_folders(folder_paths):
     """
@@ -26,12 +59,6 @@ def process_all_folders(folder_paths):
         list[Document]: A list of LangChain Document objects, ready for embedding.
     """
     all_documents = []
-    
-    # Initialize the Text Splitter once
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=150
-    )
 
     for folder_path in folder_paths:
         if not os.path.isdir(folder_path):
@@ -44,26 +71,18 @@ def process_all_folders(folder_paths):
             if filename.lower().endswith('.pdf'):
                 file_path = os.path.join(folder_path, filename)
                 
-                # a. Read the PDF
+                # a. Read and chunk the PDF
                 print(f"  - Reading '{filename}'...")
-                text = read_pdf_text(file_path)
+                # The metadata is KEY! source_folder is e.g. 'Roadmap', 'Resume'
+                chunks = chunk_pdf(file_path, os.path.basename(folder_path))
                 
-                if not text or not text.strip():
+                if not chunks:
                     print(f"    - Could not extract text from '{filename}'. Skipping.")
                     continue
                 
-                # b. Chunk the text
-                chunks = text_splitter.split_text(text)
-                
-                # c. Create Document objects with metadata for each chunk
-                for i, chunk_text in enumerate(chunks):
-                    # The metadata is KEY! It tells us the source of the information.
-                    metadata = {
-                        "source_file": filename,
-                        "source_folder": os.path.basename(folder_path) # e.g., 'Roadmap', 'Resume'
-                    }
-                    doc = Document(page_content=chunk_text, metadata=metadata)
-                    all_documents.append(doc)
+                # b. Create Document objects with metadata for each chunk
+                for chunk in chunks:
+                    all_documents.append(Document(page_content=chunk["page_content"], metadata=chunk["metadata"]))
                 
                 print(f"    - Success! Created {len(chunks)} chunks.")
 
@@ -1,13 +1,42 @@
 # --- Now the rest of your imports can follow ---
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import chat, auth
+import asyncio
+from app.api.routes import chat, auth, metrics, admin
 from app.core.config import settings 
+from app.langgraph_core.agents.registry import chain_registry
+from app.langgraph_core.cache.embedding_cache import query_embedding_cache
+from app.langgraph_core.agents import prompts
+from app.services.resume_extraction import resume_extractor
+from app.services.resume_jobs import resume_jobs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build every agent chain once, before the first request arrives
+    build_times = await run_in_threadpool(chain_registry.warm_up)
+    print(f"--- CHAIN REGISTRY WARM: {len(build_times)} chains, "
+          f"{sum(build_times.values()) * 1000:.1f} ms total ---")
+    # Pick up newly published knowledge-base versions without restarting the worker
+    index_watcher = None
+    if prompts.index_manager is not None and settings.INDEX_RELOAD_POLL_SECONDS > 0:
+        index_watcher = asyncio.create_task(prompts.index_manager.watch(settings.INDEX_RELOAD_POLL_SECONDS))
+    yield
+    if index_watcher is not None:
+        index_watcher.cancel()
+    await resume_jobs.stop()
+    resume_extractor.shutdown()
+    # Keep warm query embeddings for the next start (no-op unless QUERY_EMBEDDING_CACHE_PATH is set)
+    await run_in_threadpool(query_embedding_cache.save)
+
 
 app = FastAPI(
     title="CareerGPT API",
     description="The backend API for the AI-Powered Career Intelligence Platform.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = [
@@ -29,6 +58,8 @@ app.add_middleware(
 
 app.include_router(auth.router)
 app.include_router(chat.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 @app.get("/", tags=["Root"])
 def read_root():
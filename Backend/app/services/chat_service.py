@@ -1,36 +1,35 @@
 import json
 import re
 import traceback
-from io import BytesIO
-from typing import Generator, Optional
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from pydantic.v1 import Field, BaseModel
+from typing import AsyncGenerator, Generator, Optional
+from fastapi.concurrency import run_in_threadpool
 from langchain_core.messages import HumanMessage, AIMessage
 from sqlalchemy.orm import Session
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
 
+from app.core.config import settings
 from app.db import models
 from app.db.database import SessionLocal
-from app.langgraph_core.utils.file_parser import extract_text_from_file
-from app.langgraph_core.nodes import supervisor_node
-from app.langgraph_core.agents.prompts import (
-    create_career_advisor_chain,
-    create_job_search_chain,
-    create_learning_path_chain,
-    create_resume_analyzer_chain,
-    create_resume_qa_chain
-)
+from app.services.resume_extraction import FileSource, resume_extractor
+from app.langgraph_core.nodes import supervisor_node, asupervisor_node
+from app.langgraph_core.agents.registry import chain_registry
+from app.langgraph_core.cache.response_cache import response_cache
+from app.langgraph_core.cache.resume_cache import content_digest, resume_cache
+from app.langgraph_core.cache.semantic_cache import semantic_cache
+from app.services.speculation import route_with_speculation
 
 # --- SYSTEM ARCHITECTURE OVERVIEW ---
 # This service handles all chat interactions with intelligent agent routing
 # 1. Uses supervisor_node from nodes.py for intelligent routing
 # 2. Executes appropriate agent chains based on routing decision
-# 3. Streams responses character by character for real-time display
+# 3. Streams LLM tokens through to the client as the model emits them
 # 4. Manages database operations for chat history and resume storage
 # 5. Handles file uploads and resume analysis
+#
+# Every entry point has an async twin (prefixed with `a`) that uses
+# `ainvoke`/`astream` end to end, so the HTTP routes can serve many
+# concurrent conversations without holding a threadpool thread each.
+# With SPECULATIVE_ROUTING_ENABLED the async path starts the most likely
+# agent while the supervisor is still deciding (see services/speculation.py).
 # ---
 
 
@@ -38,203 +37,354 @@ def process_user_message_stream(db_session: Session, chat_session: models.ChatSe
     """
     Main streaming function that routes user messages and streams AI responses.
     Uses the supervisor_node from nodes.py for intelligent routing.
+    Tokens are yielded as the model emits them; the full text is assembled
+    on the side and written to the database once the stream is finished.
     """
     try:
         # Get resume text from chat session
         resume_text = chat_session.resume_text
-        
-        # Create agent state for supervisor
-        agent_state = {
-            "messages": [HumanMessage(content=user_prompt)],
-            "resume_text": resume_text,
-            "file_data": None
-        }
-        
+
         # Use supervisor to determine next agent
         print("--- CONSULTING SUPERVISOR ---")
-        supervisor_result = supervisor_node(agent_state)
+        supervisor_result = supervisor_node(_build_agent_state(user_prompt, resume_text))
         next_agent = supervisor_result.get("next", "CareerAdvisor")
         print(f"--- SUPERVISOR DECISION: {next_agent} ---")
-        
-        # Execute the chosen agent and stream response
+
+        # Execute the chosen agent and stream its tokens straight through
         print(f"--- EXECUTING AGENT: {next_agent} ---")
-        agent_response = _execute_agent_node(next_agent, user_prompt, resume_text)
-        
-        # Stream the response character by character
-        for char in agent_response:
-            yield char
-        
+        response_parts = []
+        for token in _stream_agent_node(next_agent, user_prompt, resume_text):
+            response_parts.append(token)
+            yield token
+
         # Save messages to database after streaming is complete
-        try:
-            # Refresh the chat session to ensure it's still valid
-            db_session.refresh(chat_session)
-            
-            # Create and save user message
-            user_message = models.ChatMessage(
-                session_id=chat_session.id,
-                role="human",
-                content=user_prompt
-            )
-            
-            # Create and save AI message
-            ai_message = models.ChatMessage(
-                session_id=chat_session.id,
-                role="ai",
-                content=agent_response
-            )
-            
-            # Add messages to database
-            db_session.add_all([user_message, ai_message])
-            db_session.commit()
-            
-        except Exception as db_error:
-            db_session.rollback()
-            # Don't re-raise the error to avoid breaking the stream
-        
+        _save_exchange(db_session, chat_session, user_prompt, "".join(response_parts).strip())
+
     except Exception as e:
         yield f"I apologize, but I encountered an error: {str(e)}. Please try again."
 
 
-def _execute_agent_node(agent_name: str, user_prompt: str, resume_text: Optional[str]) -> str:
+async def aprocess_user_message_stream(db_session: Session, chat_session: models.ChatSession, user_prompt: str) -> AsyncGenerator[str, None]:
     """
-    Execute the appropriate agent node and return the response.
-    Uses the imported chain creation functions for direct execution.
+    Async version of `process_user_message_stream`.
+    Routing and generation run on the event loop via `ainvoke`/`astream`;
+    only the short database write is pushed to the threadpool.
     """
     try:
-        # Route to appropriate agent chain
-        if agent_name == "ResumeQAAgent":
-            print("--- EXECUTING: ResumeQAAgent ---")
-            agent_chain = create_resume_qa_chain()
-            result = agent_chain.invoke({
-                "resume_context": resume_text if resume_text else "No resume provided",
-                "question": user_prompt
-            })
-            
-        elif agent_name == "LearningPath":
-            print("--- EXECUTING: LearningPath ---")
-            
-            llm_parser = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
-            parser_prompt = ChatPromptTemplate.from_template(
-                """You are a highly efficient text-to-JSON converter. Your ONLY job is to extract information from the user's request and format it as a single, valid JSON object.
-                You MUST respond with ONLY the JSON object and nothing else. Do not add any conversational text, introductions, or Markdown formatting.
-
-                The JSON schema you must adhere to is:
-                {{"current_skills": "a comma-separated list of skills", "goal_role": "the user's desired job role"}}
-
-                - If no skills are mentioned, use "Not specified" for the current_skills value.
-                - If no goal role is mentioned, use "Not specified" for the goal_role value.
-
-                User Request: "{request}"
-
-                Your JSON Response:
-                """
+        resume_text = chat_session.resume_text
+
+        print("--- CONSULTING SUPERVISOR ---")
+        if settings.SPECULATIVE_ROUTING_ENABLED:
+            next_agent, agent_stream = await route_with_speculation(
+                _aroute(user_prompt, resume_text),
+                resume_text,
+                lambda agent_name: _astream_agent_node(agent_name, user_prompt, resume_text),
+                resolve_agent=_agent_label,
             )
-            
-            parser_chain = parser_prompt | llm_parser | StrOutputParser()
-            
-            try:
-                raw_response = parser_chain.invoke({"request": user_prompt})
-                match = re.search(r"\{.*\}", raw_response, re.DOTALL)
-                if match:
-                    json_string = match.group(0)
-                    parsed_args = json.loads(json_string)
-                    current_skills = parsed_args.get("current_skills", "Not specified")
-                    goal_role = parsed_args.get("goal_role", "Not specified")
-                else:
-                    current_skills = "Not specified"
-                    goal_role = "Not specified"
-            except:
-                current_skills = "Not specified"
-                goal_role = "Not specified"
-            
-            agent_chain = create_learning_path_chain()
-            result = agent_chain.invoke({
-                "current_skills": current_skills,
-                "goal_role": goal_role
-            })
-            
-        elif agent_name == "JobSearch":
-            print("--- EXECUTING: JobSearch ---")
-            # Use LLM parser to extract skills and location from user query
-            
-            class JobSearchParams(BaseModel):
-                skills: str = Field(description="The job title or primary skills the user is looking for.")
-                location: str = Field(description="The geographic location the user wants to search in. Default to 'Not specified' if none is mentioned.")
-            
-            llm_parser = ChatGroq(model="llama-3.1-8b-instant", temperature=0).with_structured_output(JobSearchParams)
-            
-            parser_prompt = ChatPromptTemplate.from_messages([
-                ("system",
-                 "You are a data extraction specialist. Your only job is to analyze the user's request and extract the 'skills' (job title) and 'location' into a JSON object that matches the `JobSearchParams` schema. Follow the examples precisely.\n\n"
-                 "--- EXAMPLES ---\n"
-                 "User Request: 'find me AI Engineer jobs in Pakistan'\n"
-                 "Your JSON Response: {{\"skills\": \"AI Engineer\", \"location\": \"Pakistan\"}}\n\n"
-                 "User Request: 'remote software developer positions'\n"
-                 "Your JSON Response: {{\"skills\": \"software developer\", \"location\": \"Remote\"}}\n\n"
-                 "User Request: 'what are some data science jobs?'\n"
-                 "Your JSON Response: {{\"skills\": \"data science\", \"location\": \"Not specified\"}}\n"
-                 "--- END EXAMPLES ---"
-                ),
-                ("user", "User Request: \"{request}\"")
-            ])
-            
-            try:
-                parsed_params = (parser_prompt | llm_parser).invoke({"request": user_prompt})
-                skills = parsed_params.skills
-                location = parsed_params.location
-            except Exception as parse_error:
-                skills = "Not specified"
-                location = "Not specified"
-            
-            agent_chain = create_job_search_chain()
-            result = agent_chain.invoke({
-                "skills": skills,
-                "location": location,
-                "resume_context": resume_text if resume_text else "No resume provided. Provide general job search results."
-            })
-            
-        elif agent_name == "ResumeAnalyst":
-            print("--- EXECUTING: ResumeAnalyst ---")
-            agent_chain = create_resume_analyzer_chain()
-            result = agent_chain.invoke({
-                "resume_text": resume_text if resume_text else "No resume provided"
-            })
-            
-
-            
         else:
-            # Default to CareerAdvisor
-            print("--- EXECUTING: CareerAdvisor ---")
-            try:
-                agent_chain = create_career_advisor_chain()
-                result = agent_chain.invoke({
-                    "question": user_prompt,
-                    "resume_context": resume_text if resume_text else "No resume provided"
-                })
-            except Exception as chain_error:
-                result = "I'm having trouble providing career advice right now. Please try again in a moment."
-        
-        # Return the result directly (it's already a string)
-        if result and str(result).strip():
-            final_result = str(result).strip()
-            return final_result
+            next_agent = await _aroute(user_prompt, resume_text)
+            agent_stream = _astream_agent_node(next_agent, user_prompt, resume_text)
+        print(f"--- SUPERVISOR DECISION: {next_agent} ---")
+
+        print(f"--- EXECUTING AGENT: {next_agent} ---")
+        response_parts = []
+        async for token in agent_stream:
+            response_parts.append(token)
+            yield token
+
+        await run_in_threadpool(_save_exchange, db_session, chat_session, user_prompt, "".join(response_parts).strip())
+
+    except Exception as e:
+        yield f"I apologize, but I encountered an error: {str(e)}. Please try again."
+
+
+async def _aroute(user_prompt: str, resume_text: Optional[str]) -> str:
+    supervisor_result = await asupervisor_node(_build_agent_state(user_prompt, resume_text))
+    return supervisor_result.get("next", "CareerAdvisor")
+
+
+def _build_agent_state(user_prompt: str, resume_text: Optional[str]) -> dict:
+    """Creates the agent state the supervisor expects for a single user turn."""
+    return {
+        "messages": [HumanMessage(content=user_prompt)],
+        "resume_text": resume_text,
+        "file_data": None
+    }
+
+
+def _save_exchange(db_session: Session, chat_session: models.ChatSession, user_prompt: str, agent_response: str):
+    """Persists the user's message and the agent's answer. Never raises."""
+    try:
+        # Refresh the chat session to ensure it's still valid
+        db_session.refresh(chat_session)
+
+        # Create and save user message
+        user_message = models.ChatMessage(
+            session_id=chat_session.id,
+            role="human",
+            content=user_prompt
+        )
+
+        # Create and save AI message
+        ai_message = models.ChatMessage(
+            session_id=chat_session.id,
+            role="ai",
+            content=agent_response
+        )
+
+        # Add messages to database
+        db_session.add_all([user_message, ai_message])
+        db_session.commit()
+
+    except Exception as db_error:
+        db_session.rollback()
+        # Don't re-raise the error to avoid breaking the stream
+
+
+# Messages shown when an agent fails before (or while) producing its answer
+_AGENT_FALLBACK_MESSAGES = {
+    "ResumeQAAgent": "I'm having trouble accessing your resume information. Please try again or re-upload your resume.",
+    "LearningPath": "I'm having trouble creating a learning path. Please try rephrasing your request with your current skills and desired role.",
+    "JobSearch": "I'm having trouble searching for jobs. Please try specifying the job title and location more clearly.",
+    "ResumeAnalyst": "I'm having trouble analyzing your resume. Please try uploading your resume again.",
+    "CareerAdvisor": "I'm having trouble providing career advice. Please try rephrasing your question.",
+}
+_DEFAULT_FALLBACK_MESSAGE = "I'm having trouble processing your request. Please try again or rephrase your question."
+_EMPTY_RESPONSE_MESSAGE = "I apologize, but I couldn't generate a response. Please try again."
+
+
+def _agent_label(agent_name: str) -> str:
+    """The chain that serves a supervisor decision; END, IRRELEVANT and unknown names go to CareerAdvisor."""
+    return agent_name if agent_name in _AGENT_FALLBACK_MESSAGES else "CareerAdvisor"
+
+
+def _learning_path_args_from_raw(raw_response: str) -> tuple[str, str]:
+    """Pulls (current_skills, goal_role) out of the parser LLM's JSON answer."""
+    try:
+        match = re.search(r"\{.*\}", raw_response, re.DOTALL)
+        if match:
+            json_string = match.group(0)
+            parsed_args = json.loads(json_string)
+            return (
+                parsed_args.get("current_skills", "Not specified"),
+                parsed_args.get("goal_role", "Not specified"),
+            )
+    except:
+        pass
+    return "Not specified", "Not specified"
+
+
+def _parse_learning_path_args(user_prompt: str) -> tuple[str, str]:
+    """Extract (current_skills, goal_role) from the user's request with the small parser LLM."""
+    try:
+        raw_response = chain_registry.get("LearningPathParser").invoke({"request": user_prompt})
+    except Exception as parse_error:
+        raw_response = ""
+    return _learning_path_args_from_raw(raw_response)
+
+
+async def _aparse_learning_path_args(user_prompt: str) -> tuple[str, str]:
+    try:
+        raw_response = await chain_registry.get("LearningPathParser").ainvoke({"request": user_prompt})
+    except Exception as parse_error:
+        raw_response = ""
+    return _learning_path_args_from_raw(raw_response)
+
+
+def _parse_job_search_args(user_prompt: str) -> tuple[str, str]:
+    """Extract (skills, location) from the user's request with the small parser LLM."""
+    try:
+        parsed_params = chain_registry.get("JobSearchParser").invoke({"request": user_prompt})
+        return parsed_params.skills, parsed_params.location
+    except Exception as parse_error:
+        return "Not specified", "Not specified"
+
+
+async def _aparse_job_search_args(user_prompt: str) -> tuple[str, str]:
+    try:
+        parsed_params = await chain_registry.get("JobSearchParser").ainvoke({"request": user_prompt})
+        return parsed_params.skills, parsed_params.location
+    except Exception as parse_error:
+        return "Not specified", "Not specified"
+
+
+def _agent_payload(agent_name: str, user_prompt: str, resume_text: Optional[str], parsed_args: Optional[tuple] = None):
+    """
+    Returns the chain and the input payload for the chosen agent.
+    `parsed_args` carries the parser output for LearningPath / JobSearch.
+    """
+    if agent_name == "ResumeQAAgent":
+        return chain_registry.get("ResumeQAAgent"), {
+            "resume_context": resume_text if resume_text else "No resume provided",
+            "question": user_prompt
+        }
+
+    if agent_name == "LearningPath":
+        current_skills, goal_role = parsed_args
+        return chain_registry.get("LearningPath"), {
+            "current_skills": current_skills,
+            "goal_role": goal_role
+        }
+
+    if agent_name == "JobSearch":
+        skills, location = parsed_args
+        return chain_registry.get("JobSearch"), {
+            "skills": skills,
+            "location": location,
+            "resume_context": resume_text if resume_text else "No resume provided. Provide general job search results."
+        }
+
+    if agent_name == "ResumeAnalyst":
+        return chain_registry.get("ResumeAnalyst"), {
+            "resume_text": resume_text if resume_text else "No resume provided"
+        }
+
+    # Default to CareerAdvisor. Its RAG prompt only uses the question, so the
+    # resume is deliberately left out (which also keeps its answers cacheable).
+    return chain_registry.get("CareerAdvisor"), {
+        "question": user_prompt
+    }
+
+
+def _resolve_agent(agent_name: str, user_prompt: str, resume_text: Optional[str]):
+    """
+    Build the chain and the input payload for the chosen agent.
+    Argument extraction (LearningPath / JobSearch) happens here so that both the
+    blocking and the streaming execution paths share it.
+    """
+    parsed_args = None
+    if agent_name == "LearningPath":
+        parsed_args = _parse_learning_path_args(user_prompt)
+    elif agent_name == "JobSearch":
+        # Use LLM parser to extract skills and location from user query
+        parsed_args = _parse_job_search_args(user_prompt)
+    return _agent_payload(agent_name, user_prompt, resume_text, parsed_args)
+
+
+async def _aresolve_agent(agent_name: str, user_prompt: str, resume_text: Optional[str]):
+    parsed_args = None
+    if agent_name == "LearningPath":
+        parsed_args = await _aparse_learning_path_args(user_prompt)
+    elif agent_name == "JobSearch":
+        parsed_args = await _aparse_job_search_args(user_prompt)
+    return _agent_payload(agent_name, user_prompt, resume_text, parsed_args)
+
+
+def _agent_failure_message(agent_name: str, error: Exception, started: bool) -> str:
+    print(f"--- AGENT {agent_name} FAILED: {error} ---")
+    fallback = _AGENT_FALLBACK_MESSAGES.get(agent_name, _DEFAULT_FALLBACK_MESSAGE)
+    return f"\n\n{fallback}" if started else fallback
+
+
+def _stream_agent_node(agent_name: str, user_prompt: str, resume_text: Optional[str]) -> Generator[str, None, None]:
+    """
+    Execute the appropriate agent chain with `.stream()` and yield tokens as the
+    LLM produces them. Leading whitespace is dropped so the answer starts cleanly.
+    Repeated or paraphrased non-personalized questions are answered from the
+    exact-match and semantic response caches.
+    If the agent fails, its fallback message is yielded instead (or appended
+    after whatever was already streamed).
+    """
+    label = _agent_label(agent_name)
+    print(f"--- EXECUTING: {label} ---")
+    started = False
+    try:
+        agent_chain, inputs = _resolve_agent(agent_name, user_prompt, resume_text)
+
+        cache_key = response_cache.make_key(label, inputs)
+        cached = response_cache.get(cache_key)
+        if cached:
+            print(f"--- RESPONSE CACHE HIT: {label} ---")
+            yield cached
+            return
+
+        # Paraphrase lookup among answers for the same technologies and parsed arguments
+        semantic_vector = semantic_scope = None
+        if semantic_cache.applies_to(label):
+            semantic_scope = semantic_cache.scope(user_prompt, inputs)
+            semantic_vector = semantic_cache.embed(user_prompt)
+            cached = semantic_cache.lookup(label, semantic_vector, semantic_scope)
+            if cached:
+                print(f"--- SEMANTIC CACHE HIT: {label} ---")
+                yield cached
+                return
+
+        parts = []
+        for chunk in agent_chain.stream(inputs):
+            token = str(chunk) if chunk is not None else ""
+            if not started:
+                token = token.lstrip()
+                if not token:
+                    continue
+                started = True
+            parts.append(token)
+            yield token
+
+        if not started:
+            yield _EMPTY_RESPONSE_MESSAGE
         else:
-            return "I apologize, but I couldn't generate a response. Please try again."
-            
+            answer = "".join(parts).strip()
+            response_cache.set(cache_key, answer)
+            semantic_cache.store(label, user_prompt, answer, semantic_vector, semantic_scope)
+
     except Exception as e:
-        # Fallback response with more specific error information
-        if agent_name == "ResumeQAAgent":
-            return "I'm having trouble accessing your resume information. Please try again or re-upload your resume."
-        elif agent_name == "LearningPath":
-            return "I'm having trouble creating a learning path. Please try rephrasing your request with your current skills and desired role."
-        elif agent_name == "JobSearch":
-            return "I'm having trouble searching for jobs. Please try specifying the job title and location more clearly."
-        elif agent_name == "ResumeAnalyst":
-            return "I'm having trouble analyzing your resume. Please try uploading your resume again."
-        elif agent_name == "CareerAdvisor":
-            return "I'm having trouble providing career advice. Please try rephrasing your question."
+        yield _agent_failure_message(agent_name, e, started)
+
+
+async def _astream_agent_node(agent_name: str, user_prompt: str, resume_text: Optional[str]) -> AsyncGenerator[str, None]:
+    """Async version of `_stream_agent_node`, driven by the chains' `.astream()`."""
+    label = _agent_label(agent_name)
+    print(f"--- EXECUTING: {label} ---")
+    started = False
+    try:
+        agent_chain, inputs = await _aresolve_agent(agent_name, user_prompt, resume_text)
+
+        cache_key = response_cache.make_key(label, inputs)
+        cached = response_cache.get(cache_key)
+        if cached:
+            print(f"--- RESPONSE CACHE HIT: {label} ---")
+            yield cached
+            return
+
+        # Paraphrase lookup among answers for the same technologies and parsed arguments
+        semantic_vector = semantic_scope = None
+        if semantic_cache.applies_to(label):
+            semantic_scope = semantic_cache.scope(user_prompt, inputs)
+            semantic_vector = await semantic_cache.aembed(user_prompt)
+            cached = semantic_cache.lookup(label, semantic_vector, semantic_scope)
+            if cached:
+                print(f"--- SEMANTIC CACHE HIT: {label} ---")
+                yield cached
+                return
+
+        parts = []
+        async for chunk in agent_chain.astream(inputs):
+            token = str(chunk) if chunk is not None else ""
+            if not started:
+                token = token.lstrip()
+                if not token:
+                    continue
+                started = True
+            parts.append(token)
+            yield token
+
+        if not started:
+            yield _EMPTY_RESPONSE_MESSAGE
         else:
-            return "I'm having trouble processing your request. Please try again or rephrase your question."
+            answer = "".join(parts).strip()
+            response_cache.set(cache_key, answer)
+            semantic_cache.store(label, user_prompt, answer, semantic_vector, semantic_scope)
+
+    except Exception as e:
+        yield _agent_failure_message(agent_name, e, started)
+
+
+def _execute_agent_node(agent_name: str, user_prompt: str, resume_text: Optional[str]) -> str:
+    """
+    Execute the appropriate agent node and return the complete response.
+    Thin wrapper over `_stream_agent_node` for callers that need the whole string.
+    """
+    return "".join(_stream_agent_node(agent_name, user_prompt, resume_text)).strip()
 
 
 def process_user_message(db_session: Session, chat_session: models.ChatSession, user_prompt: str) -> str:
@@ -247,89 +397,170 @@ def process_user_message(db_session: Session, chat_session: models.ChatSession,
     return full_response
 
 
+async def aprocess_user_message(db_session: Session, chat_session: models.ChatSession, user_prompt: str) -> str:
+    """
+    Non-streaming async version, used when the client doesn't want SSE.
+    """
+    parts = []
+    async for token in aprocess_user_message_stream(db_session, chat_session, user_prompt):
+        parts.append(token)
+    return "".join(parts)
+
+
+def _extract_resume_text(file_content: bytes) -> str:
+    """
+    Extract text from file - the format is detected from its leading bytes, in the
+    extraction process pool (timeout, memory and page caps).
+    Returns the text, or a string starting with "Error:" when nothing could be read.
+    """
+    return resume_extractor.extract_sync(file_content)
+
+
+def _save_resume_analysis(db_session: Session, chat_session: models.ChatSession, resume_text: str, analysis_string: str):
+    """Stores the resume text on the session and records the upload/analysis messages."""
+    # Update chat session with resume text
+    chat_session.resume_text = resume_text
+
+    # Create messages for the database
+    human_message = models.ChatMessage(
+        session_id=chat_session.id,
+        role="human",
+        content="Uploaded resume for analysis"
+    )
+
+    ai_message = models.ChatMessage(
+        session_id=chat_session.id,
+        role="ai",
+        content=analysis_string
+    )
+
+    # Add messages to database
+    try:
+        db_session.add_all([human_message, ai_message])
+        db_session.commit()
+    except Exception as db_error:
+        db_session.rollback()
+        # Continue without failing the entire operation
+
+
+def _get_chat_session(db_session: Session, chat_session_id: int) -> Optional[models.ChatSession]:
+    return db_session.query(models.ChatSession).filter(
+        models.ChatSession.id == chat_session_id
+    ).first()
+
+
 def process_resume_file(db_session: Session, chat_session_id: int, file_content: bytes) -> str:
     """
     Process uploaded resume file and return analysis.
     """
     try:
         # Get chat session
-        chat_session = db_session.query(models.ChatSession).filter(
-            models.ChatSession.id == chat_session_id
-        ).first()
-        
+        chat_session = _get_chat_session(db_session, chat_session_id)
+
         if not chat_session:
             return "Error: Chat session not found."
-        
-        # Extract text from file - we need to determine file type from content
-        # Try different file types since we don't have the original filename
-        resume_text = None
-        
-        # Try PDF first
-        try:
-            resume_text = extract_text_from_file(file_content, "resume.pdf")
-            if not resume_text.startswith("Error:"):
-                pass
-            else:
-                resume_text = None
-        except:
-            resume_text = None
-        
-        # Try DOCX if PDF failed
-        if not resume_text or resume_text.startswith("Error:"):
-            try:
-                resume_text = extract_text_from_file(file_content, "resume.docx")
-                if not resume_text.startswith("Error:"):
-                    pass
-                else:
-                    resume_text = None
-            except:
-                resume_text = None
-        
-        # If both failed, return error
-        if not resume_text or resume_text.startswith("Error:"):
-            resume_text = "Error: Could not extract text from the uploaded file. Please ensure it's a valid PDF or DOCX file."
-        
+
+        # The same file uploaded again (any session) skips extraction and, usually, the analysis too
+        cache_key = resume_cache.file_key(content_digest(file_content))
+        resume_text, analysis_string = resume_cache.get(cache_key) or (None, None)
+        if resume_text is None:
+            resume_text = _extract_resume_text(file_content)
+
         if "Error:" in resume_text:
             analysis_string = resume_text
+        elif analysis_string is not None:
+            print("--- RESUME CACHE: Reusing the analysis of an identical upload ---")
         else:
             try:
-                # Use the imported resume analyzer chain
-                resume_analyzer_chain = create_resume_analyzer_chain()
+                # Use the shared resume analyzer chain
+                resume_analyzer_chain = chain_registry.get("ResumeAnalyst")
                 analysis_string = resume_analyzer_chain.invoke({"resume_text": resume_text})
             except Exception as chain_error:
                 analysis_string = f"Error: Could not analyze the resume. Please try again. Details: {str(chain_error)}"
-        
-        # Update chat session with resume text
-        chat_session.resume_text = resume_text
-        
-        # Create messages for the database
-        human_message = models.ChatMessage(
-            session_id=chat_session_id,
-            role="human",
-            content="Uploaded resume for analysis"
-        )
-        
-        ai_message = models.ChatMessage(
-            session_id=chat_session_id,
-            role="ai",
-            content=analysis_string
-        )
-        
-        # Add messages to database
-        try:
-            db_session.add_all([human_message, ai_message])
-            db_session.commit()
-        except Exception as db_error:
-            db_session.rollback()
-            # Continue without failing the entire operation
-        
+            resume_cache.set(cache_key, resume_text, analysis_string)
+
+        _save_resume_analysis(db_session, chat_session, resume_text, analysis_string)
+
         print("--- RESUME PROCESSING COMPLETE ---")
         return analysis_string
-        
+
     except Exception as e:
         return f"Error processing resume: {str(e)}"
 
 
+async def astream_resume_analysis(db_session: Session, chat_session_id: int, file_content: FileSource,
+                                  file_digest: Optional[str] = None) -> AsyncGenerator[dict, None]:
+    """
+    The async resume pipeline, reported as it goes: `{"stage": "extracting"}`,
+    `{"stage": "analyzing"}`, the analysis as `{"token": ...}` chunks from the
+    analyzer chain's `.astream()`, then `{"stage": "saving"}`. Text extraction runs
+    in the extraction process pool. A failure is recorded on the session like an
+    analysis and ends the stream with `{"error": "Error: ..."}`.
+    `file_content` may also be the path of a streamed upload, with the `file_digest`
+    computed while it was received (see api/uploads.py); then the file is never read
+    into this process.
+    """
+    try:
+        chat_session = await run_in_threadpool(_get_chat_session, db_session, chat_session_id)
+
+        if not chat_session:
+            yield {"error": "Error: Chat session not found."}
+            return
+
+        yield {"stage": "extracting"}
+        if file_digest is None:
+            file_digest = await run_in_threadpool(content_digest, file_content)
+        cache_key = resume_cache.file_key(file_digest)
+        resume_text, analysis_string = await run_in_threadpool(resume_cache.get, cache_key) or (None, None)
+        if resume_text is None:
+            resume_text = await resume_extractor.extract(file_content)
+
+        if "Error:" in resume_text:
+            analysis_string = resume_text
+        else:
+            yield {"stage": "analyzing"}
+            if analysis_string is not None:
+                print("--- RESUME CACHE: Reusing the analysis of an identical upload ---")
+                yield {"token": analysis_string}
+            else:
+                parts = []
+                try:
+                    resume_analyzer_chain = chain_registry.get("ResumeAnalyst")
+                    async for chunk in resume_analyzer_chain.astream({"resume_text": resume_text}):
+                        token = str(chunk) if chunk is not None else ""
+                        if token:
+                            parts.append(token)
+                            yield {"token": token}
+                    analysis_string = "".join(parts)
+                except Exception as chain_error:
+                    analysis_string = f"Error: Could not analyze the resume. Please try again. Details: {str(chain_error)}"
+                await run_in_threadpool(resume_cache.set, cache_key, resume_text, analysis_string)
+
+        yield {"stage": "saving"}
+        await run_in_threadpool(_save_resume_analysis, db_session, chat_session, resume_text, analysis_string)
+
+        print("--- RESUME PROCESSING COMPLETE ---")
+        if analysis_string.startswith("Error:"):
+            yield {"error": analysis_string}
+
+    except Exception as e:
+        yield {"error": f"Error processing resume: {str(e)}"}
+
+
+async def aprocess_resume_file(db_session: Session, chat_session_id: int, file_content: FileSource,
+                               file_digest: Optional[str] = None) -> str:
+    """
+    Async version of `process_resume_file`: runs `astream_resume_analysis` to the
+    end and returns the analysis (or the error message).
+    """
+    parts = []
+    async for event in astream_resume_analysis(db_session, chat_session_id, file_content, file_digest):
+        if "error" in event:
+            return event["error"]
+        parts.append(event.get("token", ""))
+    return "".join(parts)
+
+
 def get_chat_history(db_session: Session, session_id: int) -> list[models.ChatMessage]:
     """
     Get chat history for a session.
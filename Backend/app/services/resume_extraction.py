@@ -0,0 +1,181 @@
+# app/services/resume_extraction.py
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+from app.core.config import settings
+
+TIMEOUT_MESSAGE = "Error: The file took too long to read. Please upload a shorter or text-based (not scanned) PDF or DOCX."
+BUSY_MESSAGE = "Error: The resume reader is busy right now. Please try the upload again in a moment."
+CRASH_MESSAGE = "Error: Could not read the file content. It may be corrupted or too large to process."
+
+# The upload's bytes, or the path of the temp file it was streamed to (see api/uploads.py)
+FileSource = Union[bytes, str]
+
+
+# --- Worker side ---
+
+def _limit_worker_memory(memory_mb: int):
+    """Pool initializer: caps the worker's address space so a malformed file raises MemoryError instead of eating the host."""
+    if memory_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"--- RESUME EXTRACTION: Could not cap worker memory at {memory_mb} MB: {e} ---")
+
+
+def _extract_job(source: FileSource, max_pages: int, max_chars: int) -> str:
+    # Imported here so the parent process never loads PyMuPDF/python-docx for extraction
+    from app.langgraph_core.utils.file_parser import extract_resume_text
+
+    # Only a bounded string crosses back over the pipe
+    return extract_resume_text(source, max_pages=max_pages)[:max_chars]
+
+
+# --- Parent side ---
+
+class ResumeExtractor:
+    """
+    Runs resume text extraction in a small spawned process pool.
+
+    Each job gets a wall-clock timeout. A job that overruns while running means
+    its worker is stuck, and a process can't be interrupted from outside, so the
+    whole pool is killed and replaced; jobs that were queued behind it are
+    retried once on the new pool. A worker that dies (memory cap, crash) is
+    handled the same way.
+    """
+
+    def __init__(self, workers: int, timeout_seconds: float, memory_mb: int, max_pages: int, max_chars: int):
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.memory_mb = memory_mb
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.restarts = 0
+        self._seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the API process has threads (and maybe a FAISS index) we don't want copied
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_limit_worker_memory,
+                    initargs=(self.memory_mb,),
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is not pool:
+                return  # another job already replaced it
+            self._pool = None
+            self.restarts += 1
+        kill_workers = getattr(pool, "kill_workers", None)  # public from Python 3.14
+        if kill_workers is not None:
+            kill_workers()
+        else:
+            for process in list((pool._processes or {}).values()):
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("--- RESUME EXTRACTION: Killed a stuck extraction pool; starting a fresh one ---")
+
+    def _on_timeout(self, pool: ProcessPoolExecutor, future) -> str:
+        self.timeouts += 1
+        if future.cancel():
+            # Never started: the pool is busy, not stuck
+            return BUSY_MESSAGE
+        self._discard_pool(pool)
+        return TIMEOUT_MESSAGE
+
+    def _record(self, started: float):
+        with self._lock:
+            self.jobs += 1
+            self._seconds += time.perf_counter() - started
+
+    async def extract(self, source: FileSource) -> str:
+        """
+        Text of the upload, or an "Error: ..." string. Never blocks the event loop.
+        Pass a path for streamed uploads: only the path is sent to the worker, not the file.
+        """
+        started = time.perf_counter()
+        try:
+            for _ in range(2):
+                pool = self._get_pool()
+                future = pool.submit(_extract_job, source, self.max_pages, self.max_chars)
+                result = asyncio.wrap_future(future)
+                try:
+                    # shield: a timeout must not cancel the concurrent future before _on_timeout inspects it
+                    return await asyncio.wait_for(asyncio.shield(result), self.timeout_seconds)
+                except asyncio.TimeoutError:
+                    # The killed job's BrokenProcessPool arrives later; nobody is waiting for it
+                    result.add_done_callback(lambda done: done.cancelled() or done.exception())
+                    return self._on_timeout(pool, future)
+                except BrokenProcessPool:
+                    self.crashes += 1
+                    self._discard_pool(pool)
+            return CRASH_MESSAGE
+        finally:
+            self._record(started)
+
+    def extract_sync(self, source: FileSource) -> str:
+        """Blocking twin of `extract` for the synchronous code path."""
+        started = time.perf_counter()
+        try:
+            for _ in range(2):
+                pool = self._get_pool()
+                future = pool.submit(_extract_job, source, self.max_pages, self.max_chars)
+                try:
+                    return future.result(timeout=self.timeout_seconds)
+                except FutureTimeoutError:
+                    return self._on_timeout(pool, future)
+                except BrokenProcessPool:
+                    self.crashes += 1
+                    self._discard_pool(pool)
+            return CRASH_MESSAGE
+        finally:
+            self._record(started)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "timeout_seconds": self.timeout_seconds,
+                "memory_mb": self.memory_mb,
+                "max_pages": self.max_pages,
+                "jobs": self.jobs,
+                "timeouts": self.timeouts,
+                "crashes": self.crashes,
+                "pool_restarts": self.restarts,
+                "avg_ms": round(self._seconds * 1000 / self.jobs, 1) if self.jobs else 0.0,
+            }
+
+
+resume_extractor = ResumeExtractor(
+    workers=settings.RESUME_EXTRACT_WORKERS,
+    timeout_seconds=settings.RESUME_EXTRACT_TIMEOUT_SECONDS,
+    memory_mb=settings.RESUME_EXTRACT_MEMORY_MB,
+    max_pages=settings.RESUME_EXTRACT_MAX_PAGES,
+    max_chars=settings.RESUME_EXTRACT_MAX_CHARS,
+)
@@ -0,0 +1,216 @@
+# app/services/resume_jobs.py
+import asyncio
+import time
+import uuid
+from typing import AsyncIterator, Callable, Optional
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services import chat_service
+from app.services.resume_extraction import FileSource
+
+TERMINAL_STAGES = ("done", "failed")
+
+
+class ResumeJob:
+    """
+    One queued resume analysis and everything it has reported so far.
+
+    Events are kept in order (`{"stage": ...}`, `{"token": ...}`, and finally
+    `{"stage": "done"}` or `{"stage": "failed", "error": ...}`), so a listener that
+    connects late, or reconnects, replays them from any position.
+    """
+
+    def __init__(self, user_id: int, session_id: int, file_content: FileSource, file_digest: Optional[str],
+                 cleanup: Optional[Callable[[], None]] = None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.session_id = session_id
+        self.file_content = file_content
+        self.file_digest = file_digest
+        self._cleanup = cleanup
+        self.stage = "queued"
+        self.events: list[dict] = [{"stage": "queued"}]
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.stage in TERMINAL_STAGES
+
+    def publish(self, event: dict):
+        self.events.append(event)
+        if "stage" in event:
+            self.stage = event["stage"]
+            if self.finished:
+                self.finished_at = time.time()
+        # Wake everyone waiting on the current event; they wait on the new one next
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def release_file(self):
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+
+    async def follow(self, after: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """
+        Yields (position, event) from `after` until the job finishes; `position` is
+        where to resume from. Tokens that piled up while the listener was away
+        are merged into one event.
+        """
+        position = after
+        while True:
+            while position < len(self.events):
+                event = self.events[position]
+                position += 1
+                if "token" in event:
+                    tokens = [event["token"]]
+                    while position < len(self.events) and "token" in self.events[position]:
+                        tokens.append(self.events[position]["token"])
+                        position += 1
+                    event = {"token": "".join(tokens)}
+                yield position, event
+            if self.finished:
+                return
+            await self._changed.wait()
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "status": self.stage,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.events[-1].get("error") if self.stage == "failed" else None,
+        }
+
+
+class ResumeJobQueue:
+    """
+    In-process queue of resume analyses, worked by a few asyncio tasks on the
+    API's event loop, so an upload returns as soon as the file is stored instead
+    of holding its request open for the whole extraction and LLM generation.
+    Parsing still happens in the extraction process pool.
+
+    Jobs live in this worker's memory: the events endpoint has to reach the
+    worker that accepted the upload, and jobs queued at shutdown are dropped
+    (their sessions simply end up without an analysis). Finished jobs are
+    forgotten after `retention_seconds`.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retention_seconds: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[str, ResumeJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._seconds = 0.0
+
+    def _start(self):
+        # Lazily, from inside the running loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        print(f"--- RESUME JOBS: Started {self.workers} workers ---")
+
+    def full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    def submit(self, user_id: int, session_id: int, file_content: FileSource, file_digest: Optional[str] = None,
+               cleanup: Optional[Callable[[], None]] = None) -> ResumeJob:
+        """Queues an analysis. Raises asyncio.QueueFull when `max_pending` jobs are already waiting."""
+        if self._queue is None:
+            self._start()
+        self._prune()
+        job = ResumeJob(user_id, session_id, file_content, file_digest, cleanup)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+        self._jobs[job.id] = job
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[ResumeJob]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ResumeJob):
+        started = time.perf_counter()
+        error = None
+        db_session = SessionLocal()
+        try:
+            async for event in chat_service.astream_resume_analysis(db_session, job.session_id, job.file_content,
+                                                                    job.file_digest):
+                if "error" in event:
+                    error = event["error"]
+                else:
+                    job.publish(event)
+        except Exception as e:
+            error = f"Error processing resume: {str(e)}"
+        finally:
+            db_session.close()
+            job.release_file()
+
+        elapsed = time.perf_counter() - started
+        self._seconds += elapsed
+        if error:
+            self.failed += 1
+            job.publish({"stage": "failed", "error": error})
+        else:
+            self.completed += 1
+            job.publish({"stage": "done", "session_id": job.session_id})
+        print(f"--- RESUME JOBS: Job {job.id} for session {job.session_id} {job.stage} in {elapsed:.1f} s ---")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait().release_file()
+        for job in self._jobs.values():
+            job.release_file()
+        self._queue = None
+
+    def stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+            "tracked_jobs": len(self._jobs),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_seconds": round(self._seconds / finished, 2) if finished else 0.0,
+        }
+
+
+resume_jobs = ResumeJobQueue(
+    workers=settings.RESUME_JOB_WORKERS,
+    max_pending=settings.RESUME_JOB_MAX_PENDING,
+    retention_seconds=settings.RESUME_JOB_RETENTION_SECONDS,
+)
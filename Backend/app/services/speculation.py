@@ -0,0 +1,137 @@
+# app/services/speculation.py
+import asyncio
+import threading
+import time
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+
+from app.core.config import settings
+
+_DONE = object()
+
+
+class SpeculationStats:
+    """Counters for the speculative routing path, exported on /metrics/speculation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self.wasted_ms = 0.0
+
+    def record(self, hit: bool, elapsed_ms: float):
+        with self._lock:
+            self.attempts += 1
+            if hit:
+                self.hits += 1
+                self.saved_ms += elapsed_ms
+            else:
+                self.misses += 1
+                self.wasted_ms += elapsed_ms
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": settings.SPECULATIVE_ROUTING_ENABLED,
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / self.attempts, 4) if self.attempts else 0.0,
+                "saved_ms_total": round(self.saved_ms, 1),
+                "saved_ms_avg": round(self.saved_ms / self.hits, 1) if self.hits else 0.0,
+                "wasted_ms_total": round(self.wasted_ms, 1),
+            }
+
+
+speculation_stats = SpeculationStats()
+
+
+def predicted_agent(resume_text: Optional[str]) -> str:
+    """The agent most prompts end up at: resume Q&A once a resume is loaded, general advice otherwise."""
+    return settings.SPECULATIVE_RESUME_AGENT if resume_text else settings.SPECULATIVE_AGENT
+
+
+class SpeculativeRun:
+    """
+    Runs an agent stream in a background task while the supervisor is still
+    deciding, buffering its tokens in a queue. If the supervisor agrees, the
+    buffer is replayed and the stream continues live; if not, the task is
+    cancelled before it can produce anything user-visible.
+
+    Only read-only agents (no tool calls, no DB writes) should be speculated,
+    since a cancelled run may already have sent its LLM request.
+    """
+
+    def __init__(self, agent_name: str, stream_factory: Callable[[], AsyncGenerator[str, None]]):
+        self.agent_name = agent_name
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.started_at = time.perf_counter()
+        self._task = asyncio.create_task(self._pump(stream_factory))
+
+    async def _pump(self, stream_factory: Callable[[], AsyncGenerator[str, None]]):
+        stream = stream_factory()
+        try:
+            async for token in stream:
+                self._queue.put_nowait(token)
+        except Exception as e:
+            self._queue.put_nowait(e)
+        finally:
+            await stream.aclose()
+            self._queue.put_nowait(_DONE)
+
+    async def cancel(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def replay(self) -> AsyncGenerator[str, None]:
+        """Yields the buffered tokens, then the rest of the stream as it arrives."""
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # The client went away mid-stream; stop generating for nobody
+            if not self._task.done():
+                self._task.cancel()
+
+
+async def route_with_speculation(
+    route: Awaitable[str],
+    resume_text: Optional[str],
+    stream_factory: Callable[[str], AsyncGenerator[str, None]],
+    resolve_agent: Callable[[str], str] = lambda agent_name: agent_name,
+) -> tuple[str, AsyncGenerator[str, None]]:
+    """
+    Awaits the routing decision while the predicted agent is already generating.
+    Returns the chosen agent and the token stream to send for it.
+    `resolve_agent` maps a routing decision to the chain that serves it, so a
+    decision served by the guessed chain (END or IRRELEVANT for CareerAdvisor)
+    counts as a hit instead of restarting the same chain.
+    """
+    guess = predicted_agent(resume_text)
+    speculative = SpeculativeRun(guess, lambda: stream_factory(guess))
+    try:
+        next_agent = await route
+    except BaseException:
+        await speculative.cancel()
+        raise
+
+    # The agent started this long before it otherwise would have
+    elapsed_ms = (time.perf_counter() - speculative.started_at) * 1000
+    if resolve_agent(next_agent) == resolve_agent(guess):
+        speculation_stats.record(True, elapsed_ms)
+        print(f"--- SPECULATION HIT: {guess} (saved {elapsed_ms:.0f} ms) ---")
+        return next_agent, speculative.replay()
+
+    await speculative.cancel()
+    speculation_stats.record(False, elapsed_ms)
+    print(f"--- SPECULATION MISS: guessed {guess}, routed to {next_agent} ---")
+    return next_agent, stream_factory(next_agent)
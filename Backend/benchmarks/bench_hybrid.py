@@ -0,0 +1,106 @@
+# benchmarks/bench_hybrid.py
+"""
+Dense vs. BM25 vs. hybrid (reciprocal rank fusion) retrieval over the
+knowledge-base chunks: hit@k, MRR and per-query latency.
+
+Queries are generated from the chunks themselves: a few of a chunk's rarest
+terms (technology names, acronyms) plus filler words, with that chunk as the
+expected answer, which is the "Kubernetes CKA" style of query dense search
+struggles with. By default the chunks are re-embedded in memory with the
+deterministic hashing backend so the run needs no network; pass
+`--backend google` (or `local`) to measure the real embedding model.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_hybrid [--folder faiss_index] [--queries 200] [--k 5] [--backend hashing]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from app.langgraph_core.retrieval.docstore import MappedDocstore
+from app.langgraph_core.retrieval.embeddings import EMBEDDING_BACKENDS, create_embeddings, read_embedding_meta
+from app.langgraph_core.retrieval.index_factory import build_index
+from app.langgraph_core.retrieval.index_store import VectorIndex, load_vector_index
+from app.langgraph_core.retrieval.lexical import tokenize
+
+FILLER = ["what", "should", "i", "learn", "about", "for", "a", "career", "in"]
+
+
+def _vector_index(folder: str, embeddings) -> VectorIndex:
+    spec = embeddings.spec
+    meta = read_embedding_meta(folder)
+    if (meta.get("backend"), meta.get("model")) == (spec["backend"], spec["model"]):
+        return load_vector_index(folder, embeddings, lexical=True)
+    # Different embedding space than the stored index: re-embed the chunks in memory
+    docstore = MappedDocstore(folder)
+    texts = [docstore.get(label)["page_content"] for label in range(len(docstore))]
+    index = build_index(np.asarray(embeddings.embed_documents(texts), dtype=np.float32), "flat")
+    vector_index = VectorIndex(index, docstore, embeddings, folder, mapped=False, load_seconds=0.0)
+    vector_index.build_lexical()
+    return vector_index
+
+
+def _queries(vector_index: VectorIndex, count: int, seed: int = 0) -> list[tuple[str, int]]:
+    lexical = vector_index.lexical
+    document_frequency = np.diff(lexical.indptr)
+    rng = np.random.default_rng(seed)
+    labels = vector_index.live_labels()
+    queries = []
+    for label in rng.choice(labels, size=min(count, len(labels)), replace=False):
+        terms = sorted({t for t in tokenize(vector_index.docstore.get(int(label))["page_content"]) if len(t) > 2},
+                       key=lambda t: (document_frequency[lexical.vocabulary[t]], t))
+        if len(terms) < 3:
+            continue
+        words = list(rng.choice(FILLER, size=3, replace=False)) + terms[:3]
+        rng.shuffle(words)
+        queries.append((" ".join(words), int(label)))
+    return queries
+
+
+async def _score(vector_index: VectorIndex, queries: list[tuple[str, int]], mode: str, k: int) -> dict:
+    hits, reciprocal_ranks, latencies = 0, [], []
+    for query, expected in queries:
+        started = time.perf_counter()
+        labels = [hit.label for hit in await vector_index.aretrieve(query, k, mode)]
+        latencies.append((time.perf_counter() - started) * 1000)
+        rank = labels.index(expected) + 1 if expected in labels else None
+        hits += rank is not None
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+    return {
+        "mode": mode,
+        f"hit@{k}": round(hits / len(queries), 4),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="faiss_index")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--backend", choices=EMBEDDING_BACKENDS, default="hashing")
+    parser.add_argument("--model", default="")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    vector_index = _vector_index(args.folder, create_embeddings(args.backend, args.model))
+    queries = _queries(vector_index, args.queries)
+    results = [asyncio.run(_score(vector_index, queries, mode, args.k)) for mode in ("dense", "lexical", "hybrid")]
+
+    print(f"{len(queries)} queries over {len(vector_index.live_labels())} chunks, k={args.k}, "
+          f"embeddings={vector_index.embeddings.spec['backend']}:{vector_index.embeddings.spec['model']}")
+    for row in results:
+        print(f"  {row['mode']:<8} hit@{args.k} {row[f'hit@{args.k}']:.3f}  MRR {row['mrr']:.3f}  "
+              f"p50 {row['p50_ms']:.3f} ms  p95 {row['p95_ms']:.3f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"queries": len(queries), "k": args.k, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/bench_index_load.py
+"""
+Cold-start benchmark: per-worker memory and load time of the knowledge-base
+index, legacy (private FAISS copy + unpickled docstore) vs. memory-mapped
+(`IO_FLAG_MMAP` + `MappedDocstore`).
+
+Each mode runs in a fresh interpreter, like a new Uvicorn worker. `RssAnon`
+is the memory private to that worker; `RssFile` is page cache shared by every
+worker mapping the same files.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_index_load [--folder faiss_index] [--synthetic 100000] [--queries 20]
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+
+class _SyntheticDocument:
+    def __init__(self, page_content: str, metadata: dict):
+        self.page_content = page_content
+        self.metadata = metadata
+
+
+class _SyntheticDocstore:
+    """Stands in for LangChain's InMemoryDocstore when pickling a synthetic index."""
+
+    def __init__(self, documents: dict):
+        self._dict = documents
+
+    def search(self, doc_id: str):
+        return self._dict[doc_id]
+
+
+def _memory_mb() -> dict:
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("RssAnon", "RssFile", "VmRSS"):
+                values[key] = round(int(rest.split()[0]) / 1024, 1)
+    return values
+
+
+def _child(mode: str, folder: str, queries: int):
+    from app.langgraph_core.retrieval.docstore import InMemoryDocstore, MappedDocstore
+    from app.langgraph_core.retrieval.index_store import legacy_records, read_faiss_index, INDEX_FILE
+
+    baseline = _memory_mb()
+    started = time.perf_counter()
+    if mode == "legacy":
+        index, _ = read_faiss_index(os.path.join(folder, INDEX_FILE), use_mmap=False)
+        docstore = InMemoryDocstore(legacy_records(folder))
+    else:
+        index, _ = read_faiss_index(os.path.join(folder, INDEX_FILE), use_mmap=True)
+        docstore = MappedDocstore(folder)
+    load_ms = (time.perf_counter() - started) * 1000
+    after_load = _memory_mb()
+
+    rng = np.random.default_rng(0)
+    for _ in range(queries):
+        _, labels = index.search(rng.standard_normal((1, index.d)).astype(np.float32), 5)
+        for label in labels[0]:
+            if label >= 0:
+                docstore.get(int(label))
+    after_search = _memory_mb()
+
+    delta = lambda snapshot: {k: round(snapshot[k] - baseline[k], 1) for k in snapshot}
+    print(json.dumps({
+        "mode": mode,
+        "load_ms": round(load_ms, 2),
+        "after_load_mb": delta(after_load),
+        "after_search_mb": delta(after_search),
+    }))
+
+
+def _build_synthetic(folder: str, vectors: int, dim: int = 768):
+    from app.langgraph_core.retrieval.docstore import MappedDocstore
+
+    rng = np.random.default_rng(0)
+    index = faiss.IndexFlatL2(dim)
+    index.add(rng.standard_normal((vectors, dim)).astype(np.float32))
+    faiss.write_index(index, os.path.join(folder, "index.faiss"))
+
+    text = "lorem ipsum career roadmap " * 40
+    ids = {label: f"doc-{label}" for label in range(vectors)}
+    documents = {doc_id: _SyntheticDocument(text, {"source_file": "synthetic.pdf", "source_folder": "Roadmap"})
+                 for doc_id in ids.values()}
+    with open(os.path.join(folder, "index.pkl"), "wb") as f:
+        pickle.dump((_SyntheticDocstore(documents), ids), f)
+    MappedDocstore.write(folder, ({"id": ids[label], "page_content": text, "metadata": documents[ids[label]].metadata}
+                                  for label in range(vectors)))
+
+
+def _run(mode: str, folder: str, queries: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_index_load", "--child", mode, "--folder", folder, "--queries", str(queries)],
+        capture_output=True, text=True,
+    )
+    if output.returncode != 0:
+        return {"mode": mode, "error": output.stderr.strip().splitlines()[-1] if output.stderr else "failed"}
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default="faiss_index")
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark a generated index with this many vectors instead.")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--child", choices=["legacy", "mapped"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.folder, args.queries)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if args.synthetic:
+            folder = tmp
+            _build_synthetic(folder, args.synthetic)
+        results = [_run(mode, folder, args.queries) for mode in ("legacy", "mapped")]
+
+    print(f"Index: {folder if not args.synthetic else f'synthetic ({args.synthetic} vectors)'}")
+    for result in results:
+        if "error" in result:
+            print(f"  {result['mode']:<7} failed: {result['error']}")
+            continue
+        load, search = result["after_load_mb"], result["after_search_mb"]
+        print(f"  {result['mode']:<7} load {result['load_ms']:>9.2f} ms | "
+              f"private (RssAnon) {load['RssAnon']:>7.1f} MB -> {search['RssAnon']:>7.1f} MB after search | "
+              f"shared (RssFile) {search['RssFile']:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_index_types.py
+"""
+Recall@k vs. latency of the approximate index types against the exact flat
+baseline, sweeping `nprobe` (IVF) and `efSearch` (HNSW).
+
+By default a clustered synthetic corpus stands in for a grown knowledge base;
+`--folder` uses the vectors of an existing index instead. Queries are perturbed
+corpus vectors, searched one at a time as the retriever does.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_index_types [--vectors 50000] [--dim 768] [--k 5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import time
+
+import faiss
+import numpy as np
+
+from app.langgraph_core.retrieval.index_factory import INDEX_FILE, build_index, configure_search, index_vectors
+
+NPROBE_SWEEP = [1, 4, 16, 64]
+EF_SEARCH_SWEEP = [16, 32, 64, 128]
+
+
+def _synthetic_corpus(vectors: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=vectors)
+    return centers[assignment] + 0.35 * rng.standard_normal((vectors, dim)).astype(np.float32)
+
+
+def _queries(corpus: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    picks = corpus[rng.integers(0, len(corpus), size=count)]
+    return picks + 0.1 * rng.standard_normal(picks.shape).astype(np.float32)
+
+
+def _search_all(index, queries: np.ndarray, k: int) -> tuple[np.ndarray, list[float]]:
+    labels = np.empty((len(queries), k), dtype=np.int64)
+    latencies_ms = []
+    # Time single-threaded searches like a request handler does; builds keep all cores
+    threads = faiss.omp_get_max_threads()
+    faiss.omp_set_num_threads(1)
+    try:
+        for row, query in enumerate(queries):
+            started = time.perf_counter()
+            _, found = index.search(query.reshape(1, -1), k)
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+            labels[row] = found[0]
+    finally:
+        faiss.omp_set_num_threads(threads)
+    return labels, latencies_ms
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def _row(name: str, params: dict, build_s: float, index, queries, truth, k) -> dict:
+    found, latencies = _search_all(index, queries, k)
+    return {
+        "index": name,
+        "params": params,
+        "build_s": round(build_s, 3),
+        f"recall@{k}": round(_recall(found, truth), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", help="Benchmark the vectors of this index folder instead of a synthetic corpus.")
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--pq-m", type=int, default=64)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    if args.folder:
+        corpus = index_vectors(faiss.read_index(os.path.join(args.folder, INDEX_FILE)))
+    else:
+        corpus = _synthetic_corpus(args.vectors, args.dim, args.clusters)
+    queries = _queries(corpus, args.queries)
+
+    started = time.perf_counter()
+    flat = build_index(corpus, "flat")
+    flat_build = time.perf_counter() - started
+    truth, _ = _search_all(flat, queries, args.k)
+    results = [_row("flat", {}, flat_build, flat, queries, truth, args.k)]
+
+    plans = [("ivf_flat", {}, "nprobe", NPROBE_SWEEP), ("hnsw", {}, "ef_search", EF_SEARCH_SWEEP)]
+    if len(corpus) >= 256 and corpus.shape[1] % args.pq_m == 0:
+        plans.append(("ivf_pq", {"pq_m": args.pq_m}, "nprobe", NPROBE_SWEEP))
+    else:
+        print(f"Skipping ivf_pq: needs >= 256 vectors and a dimension divisible by --pq-m={args.pq_m}")
+
+    for index_type, build_params, knob, sweep in plans:
+        started = time.perf_counter()
+        index = build_index(corpus, index_type, **build_params)
+        build_s = time.perf_counter() - started
+        for value in sweep:
+            configure_search(index, **{knob: value})
+            results.append(_row(index_type, {**build_params, knob: value}, build_s, index, queries, truth, args.k))
+
+    recall_key = f"recall@{args.k}"
+    print(f"Corpus: {len(corpus)} x {corpus.shape[1]}, {len(queries)} queries, k={args.k}")
+    print(f"{'index':<9} {'params':<28} {'build s':>8} {recall_key:>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in results:
+        params = ", ".join(f"{key}={value}" for key, value in row["params"].items())
+        print(f"{row['index']:<9} {params:<28} {row['build_s']:>8.2f} {row[recall_key]:>9.3f} "
+              f"{row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"corpus": list(corpus.shape), "queries": len(queries), "k": args.k, "results": results}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
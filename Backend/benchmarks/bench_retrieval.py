@@ -0,0 +1,240 @@
+# benchmarks/bench_retrieval.py
+"""
+Retrieval quality and latency over a labelled query set, for comparing
+chunking, k, index type and retrieval mode changes over time.
+
+Each line of the query file is
+    {"query": "...", "relevant": [{"source_file": "backend.pdf", "contains": "RabbitMQ"}, ...]}
+A target counts as found when a retrieved chunk comes from `source_file` and
+(if given) contains the `contains` text, so labels survive re-chunking.
+
+Chunks are embedded with the deterministic hashing backend by default (no
+network, same vectors on every run). They come from the docstore of `--folder`,
+or are re-chunked from the PDFs under `--docs` with `--chunk-size/--chunk-overlap`.
+
+Reports recall@k and MRR, p50/p95/p99 search latency, and memory (index,
+docstore and BM25 bytes plus process RSS), and writes them with the run
+configuration to a JSON file (default benchmarks/results/retrieval-<time>.json,
+which git ignores).
+`--compare` prints the change against an earlier results file.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_retrieval [--index-type flat hnsw] [--mode dense hybrid] [--k 1 3 5 10]
+    python -m benchmarks.bench_retrieval --folder-filter off on
+    python -m benchmarks.bench_retrieval --docs carrer_docs --chunk-size 800 --chunk-overlap 100 --compare old.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import time
+
+import faiss
+import numpy as np
+
+from app.langgraph_core.retrieval.docstore import InMemoryDocstore, MappedDocstore
+from app.langgraph_core.retrieval.embeddings import EMBEDDING_BACKENDS, create_embeddings
+from app.langgraph_core.retrieval.folder_router import infer_source_folders
+from app.langgraph_core.retrieval.index_factory import INDEX_TYPES, build_index, configure_search
+from app.langgraph_core.retrieval.index_store import RETRIEVAL_MODES, VectorIndex
+
+DEFAULT_QUERIES = os.path.join(os.path.dirname(__file__), "data", "retrieval_queries.jsonl")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _load_queries(path: str) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip() and not line.startswith("#")]
+
+
+def _records_from_docstore(folder: str) -> list[dict]:
+    docstore = MappedDocstore(folder)
+    records = [docstore.get(label) for label in range(len(docstore))]
+    docstore.close()
+    return records
+
+
+def _records_from_pdfs(docs_root: str, chunk_size: int, chunk_overlap: int) -> list[dict]:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    from app.langgraph_core.utils.ingest import scan_documents
+    from app.langgraph_core.utils.read_pdfs import read_pdf_text
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    records = []
+    for source in scan_documents(docs_root).values():
+        for chunk in splitter.split_text(read_pdf_text(source["path"])):
+            records.append({"page_content": chunk, "metadata": {"source_file": os.path.basename(source["path"]),
+                                                                "source_folder": source["source_folder"]}})
+    return records
+
+
+def _matches(record: dict, target: dict) -> bool:
+    if record["metadata"].get("source_file") != target["source_file"]:
+        return False
+    return "contains" not in target or _normalize(target["contains"]) in _normalize(record["page_content"])
+
+
+def _rss_mb() -> dict:
+    values = {"peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    values["rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+    return values
+
+
+def _evaluate(vector_index: VectorIndex, queries: list[dict], mode: str, ks: list[int], repeat: int,
+              folder_filter: bool = False) -> dict:
+    depth = max(ks)
+    recalls = {k: [] for k in ks}
+    reciprocal_ranks, latencies = [], []
+    for item in queries:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            # Same per-query folder routing as IndexRetriever with RETRIEVAL_FOLDER_FILTER
+            folders = infer_source_folders(item["query"]) if folder_filter else None
+            hits = vector_index.retrieve(item["query"], depth, mode, folders=folders)
+            latencies.append((time.perf_counter() - started) * 1000)
+        targets = item["relevant"]
+        # Rank (1-based) at which each target is first found
+        first_found = [next((rank for rank, hit in enumerate(hits, 1) if _matches(hit.record, t)), None) for t in targets]
+        for k in ks:
+            recalls[k].append(sum(1 for rank in first_found if rank and rank <= k) / len(targets))
+        best = min((rank for rank in first_found if rank), default=None)
+        reciprocal_ranks.append(1.0 / best if best else 0.0)
+    return {
+        **{f"recall@{k}": round(float(np.mean(recalls[k])), 4) for k in ks},
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _row_key(row: dict) -> tuple:
+    # Results files written before --folder-filter existed were all unfiltered
+    return row["index_type"], row["mode"], row.get("folder_filter", False)
+
+
+def _filter_label(row: dict) -> str:
+    return "folders" if row.get("folder_filter") else "all"
+
+
+def _print_comparison(results: list[dict], previous_path: str):
+    with open(previous_path) as f:
+        previous = {_row_key(row): row for row in json.load(f)["results"]}
+    print(f"\nChange vs. {previous_path}:")
+    for row in results:
+        old = previous.get(_row_key(row))
+        if not old:
+            continue
+        deltas = [f"{key} {row[key] - old[key]:+.4f}" for key in row
+                  if key.startswith("recall@") or key in ("mrr", "p50_ms", "p95_ms", "p99_ms")
+                  if key in old]
+        print(f"  {row['index_type']:<9} {row['mode']:<8} {_filter_label(row):<7} " + "  ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="Labelled query set (JSONL).")
+    parser.add_argument("--folder", default="faiss_index", help="Take the chunks from this index folder's docstore.")
+    parser.add_argument("--docs", help="Re-chunk the PDFs under this folder instead of using --folder.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=150)
+    parser.add_argument("--index-type", nargs="+", default=["flat"], choices=INDEX_TYPES)
+    parser.add_argument("--mode", nargs="+", default=["dense", "lexical", "hybrid"], choices=RETRIEVAL_MODES)
+    parser.add_argument("--folder-filter", nargs="+", default=["off"], choices=["off", "on"],
+                        help="Evaluate without and/or with source_folder pre-filtering.")
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 3, 5, 10])
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--backend", choices=EMBEDDING_BACKENDS, default="hashing")
+    parser.add_argument("--model", default="")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query.")
+    parser.add_argument("--out", help="Results file (default: benchmarks/results/retrieval-<timestamp>.json).")
+    parser.add_argument("--compare", help="Earlier results file to diff against.")
+    args = parser.parse_args()
+
+    queries = _load_queries(args.queries)
+    if args.docs:
+        records = _records_from_pdfs(args.docs, args.chunk_size, args.chunk_overlap)
+        chunking = {"source": args.docs, "chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap}
+    else:
+        records = _records_from_docstore(args.folder)
+        chunking = {"source": args.folder, "chunk_size": None, "chunk_overlap": None}
+    embeddings = create_embeddings(args.backend, args.model)
+    started = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents([record["page_content"] for record in records]), dtype=np.float32)
+    embed_seconds = time.perf_counter() - started
+    docstore = InMemoryDocstore(records)
+
+    results = []
+    for index_type in args.index_type:
+        started = time.perf_counter()
+        index = build_index(vectors, index_type)
+        build_seconds = time.perf_counter() - started
+        configure_search(index, nprobe=args.nprobe, ef_search=args.ef_search)
+        vector_index = VectorIndex(index, docstore, embeddings, chunking["source"], mapped=False, load_seconds=0.0)
+        lexical = vector_index.build_lexical() if set(args.mode) - {"dense"} else None
+        memory = {
+            "index_bytes": int(faiss.serialize_index(index).nbytes),
+            "docstore_bytes": sum(len(record["page_content"].encode("utf-8")) for record in records),
+            "bm25_bytes": lexical.stats()["bytes"] if lexical else 0,
+        }
+        for mode in args.mode:
+            for folder_filter in args.folder_filter:
+                folder_filter = folder_filter == "on"
+                row = {"index_type": index_type, "mode": mode, "folder_filter": folder_filter,
+                       "build_s": round(build_seconds, 3),
+                       **_evaluate(vector_index, queries, mode, args.k, args.repeat, folder_filter), **memory}
+                results.append(row)
+    memory_now = _rss_mb()
+
+    print(f"{len(queries)} queries over {len(records)} chunks, embeddings={embeddings.spec['backend']}:"
+          f"{embeddings.spec['model']}, chunking={chunking}")
+    recall_keys = [f"recall@{k}" for k in args.k]
+    print(f"{'index':<9} {'mode':<8} {'search':<7} " + " ".join(f"{key:>10}" for key in recall_keys)
+          + f" {'MRR':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'index KB':>9}")
+    for row in results:
+        print(f"{row['index_type']:<9} {row['mode']:<8} {_filter_label(row):<7} " + " ".join(f"{row[key]:>10.3f}" for key in recall_keys)
+              + f" {row['mrr']:>6.3f} {row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} {row['p99_ms']:>8.3f}"
+              f" {row['index_bytes'] / 1024:>9.1f}")
+    print(f"Process memory: {memory_now}")
+
+    out = args.out or os.path.join(RESULTS_DIR, time.strftime("retrieval-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "queries_file": args.queries,
+            "queries": len(queries),
+            "chunks": len(records),
+            "chunking": chunking,
+            "embedding": embeddings.spec,
+            "embed_s": round(embed_seconds, 3),
+            "params": {"k": args.k, "nprobe": args.nprobe, "ef_search": args.ef_search, "repeat": args.repeat},
+            "memory": memory_now,
+            "results": results,
+        }, f, indent=2)
+    print(f"Wrote {out}")
+    if args.compare:
+        _print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_supervisor_rules.py
+"""
+Micro-benchmark: precompiled single-pass supervisor rules vs. the original
+per-call keyword lists + `re.search` loop.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_supervisor_rules [--repeat 200] [--corpus path]
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+
+from app.langgraph_core.routing_rules import match_resume_followup
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "router_prompts.txt")
+
+
+def legacy_rule_route(message: str):
+    """The supervisor's rule block as it was before precompilation (resume present)."""
+    user_input_lower = message.lower()
+
+    resume_reference_keywords = [
+        "my resume", "my cv", "the resume", "the cv", "my document",
+        "the document", "the file", "from my resume", "in my resume",
+        "on my resume", "resume shows", "cv shows", "document shows"
+    ]
+    resume_content_keywords = [
+        "my experience", "my education", "my skills", "my projects",
+        "my work experience", "my background", "my qualifications",
+        "what are my", "what do i have", "what's my", "where did i work",
+        "what did i study", "my degree", "my job", "my role", "my position"
+    ]
+    resume_action_keywords = [
+        "rewrite", "improve", "update", "modify", "change", "edit",
+        "enhance", "revise", "fix", "adjust", "optimize", "strengthen"
+    ]
+    resume_patterns = [
+        r"(?:my|the)\s+(?:resume|cv)",
+        r"(?:from|in|on)\s+(?:my|the)\s+(?:resume|cv)",
+        r"my\s+(?:experience|skills|education|background|projects)",
+        r"what\s+(?:are|is)\s+my\s+(?:experience|skills|education)",
+        r"where\s+(?:did|have)\s+i\s+(?:work|study)",
+        r"(?:rewrite|improve|update|modify|change|edit)\s+(?:my|the)",
+        r"(?:enhance|revise|fix|adjust)\s+(?:my\s+)?(?:experience|skills|education)",
+        r"(?:experience|education|skills|projects?)\s+section",
+        r"(?:work|job)\s+(?:experience|history)",
+        r"(?:technical|programming)\s+skills"
+    ]
+    direct_match = any(keyword in user_input_lower for keyword in
+                       resume_reference_keywords + resume_content_keywords + resume_action_keywords)
+    pattern_match = any(re.search(pattern, user_input_lower) for pattern in resume_patterns)
+    context_clues = [
+        "based on", "according to", "mentioned in", "listed in",
+        "show that", "indicates", "reflects", "demonstrates"
+    ]
+    context_match = any(clue in user_input_lower for clue in context_clues)
+    if direct_match or pattern_match or context_match:
+        return "ResumeQAAgent"
+
+    question_patterns = [
+        r"(?:what|where|when|how|which|who)\s+.*\s+(?:my|i)",
+        r"(?:can|could|should|would)\s+.*\s+(?:my|i)",
+        r"(?:do|did|have|am|was)\s+i\s+",
+        r"(?:tell|show|explain)\s+.*\s+(?:my|about\s+my)"
+    ]
+    question_match = any(re.search(pattern, user_input_lower) for pattern in question_patterns)
+    if question_match and len(user_input_lower.split()) <= 15:
+        return "ResumeQAAgent"
+    return None
+
+
+def compiled_rule_route(message: str):
+    match = match_resume_followup(message)
+    return match.destination if match else None
+
+
+def load_corpus(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as handle:
+        return [line.strip() for line in handle if line.strip() and not line.startswith("#")]
+
+
+def time_per_call(func, corpus: list[str], repeat: int) -> list[float]:
+    """Returns microseconds per call for each full pass over the corpus."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for prompt in corpus:
+            func(prompt)
+        samples.append((time.perf_counter() - started) / len(corpus) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    mismatches = [p for p in corpus if legacy_rule_route(p) != compiled_rule_route(p)]
+    routed = sum(1 for p in corpus if compiled_rule_route(p))
+
+    legacy = time_per_call(legacy_rule_route, corpus, args.repeat)
+    compiled = time_per_call(compiled_rule_route, corpus, args.repeat)
+
+    print(f"Corpus: {len(corpus)} prompts ({routed} routed by rules), {args.repeat} passes")
+    print(f"Decision mismatches: {len(mismatches)}")
+    for prompt in mismatches:
+        print(f"  ! {prompt!r}: legacy={legacy_rule_route(prompt)} compiled={compiled_rule_route(prompt)}")
+    for name, samples in (("legacy", legacy), ("compiled", compiled)):
+        print(f"{name:>9}: median {statistics.median(samples):7.2f} us/call, "
+              f"min {min(samples):7.2f} us/call")
+    print(f"  speedup: {statistics.median(legacy) / statistics.median(compiled):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# tests/test_context.py
+import importlib
+
+import pytest
+
+from app.langgraph_core.retrieval import context
+from app.langgraph_core.retrieval.context import assemble_context, count_tokens
+
+
+def _byte_encoding():
+    """A real tiktoken encoding with one token per byte, so the tiktoken path runs offline."""
+    tiktoken = pytest.importorskip("tiktoken")
+    return tiktoken.Encoding(name="bytes", pat_str=r"\S+|\s+",
+                             mergeable_ranks={bytes([i]): i for i in range(256)}, special_tokens={})
+
+
+@pytest.fixture(params=["chars", "tiktoken"], autouse=True)
+def tokenizer(request, monkeypatch):
+    encoding = _byte_encoding() if request.param == "tiktoken" else None
+    monkeypatch.setattr(context, "_encoding", encoding)
+    monkeypatch.setattr(context, "_encoding_loaded", True)
+    return request.param
+
+
+def _chunk(topic: str, words: int = 40) -> str:
+    return " ".join(f"{topic}{i}" for i in range(words))
+
+
+def test_tokenizer_is_not_loaded_at_import(monkeypatch):
+    module = importlib.reload(context)
+    try:
+        assert module._encoding_loaded is False
+        assert module.context_stats.stats()["tokenizer"] == "not loaded"
+    finally:
+        monkeypatch.undo()
+
+
+def test_near_duplicates_of_a_better_ranked_chunk_are_dropped():
+    original = _chunk("alpha")
+    near_copy = original.rsplit(" ", 1)[0] + " omega"
+    other = _chunk("beta")
+
+    text, stats = assemble_context([original, near_copy, other], token_budget=10_000, max_chunks=5, mmr_lambda=1.0)
+
+    assert text == f"{original}\n\n{other}"
+    assert stats["chunks_in"] == 3 and stats["chunks_out"] == 2
+
+
+def test_overlap_with_a_picked_chunk_is_stripped():
+    shared = _chunk("shared", 10)
+    first = f"{_chunk('alpha', 20)} {shared}"
+    second = f"{shared} {_chunk('beta', 20)}"
+
+    text, _ = assemble_context([first, second], token_budget=10_000, max_chunks=5, mmr_lambda=1.0)
+
+    assert text.count(shared) == 1
+    assert text == f"{first}\n\n{_chunk('beta', 20)}"
+
+
+def test_mmr_moves_a_redundant_chunk_behind_a_different_one():
+    first = _chunk("alpha")
+    # Same words in reverse: no shared shingles, so not a duplicate, but the same bag of words
+    reordered = " ".join(reversed(first.split()))
+    different = _chunk("beta")
+
+    ranked, _ = assemble_context([first, reordered, different], token_budget=10_000, max_chunks=3, mmr_lambda=1.0)
+    diverse, _ = assemble_context([first, reordered, different], token_budget=10_000, max_chunks=3, mmr_lambda=0.5)
+
+    assert ranked.split("\n\n") == [first, reordered, different]
+    assert diverse.split("\n\n") == [first, different, reordered]
+
+
+def test_chunks_stop_at_the_token_budget():
+    chunks = [_chunk(topic, 60) for topic in ("alpha", "beta", "gamma")]
+    # Room for two chunks and less than a useful tail of the third
+    budget = count_tokens(chunks[0]) + count_tokens(chunks[1]) + 2 * count_tokens("\n\n") + context._MIN_TAIL_TOKENS - 1
+
+    text, stats = assemble_context(chunks, token_budget=budget, max_chunks=5, mmr_lambda=1.0)
+
+    assert text == f"{chunks[0]}\n\n{chunks[1]}"
+    assert stats["tokens_after"] <= budget
+    assert stats["tokens_before"] == count_tokens("\n\n".join(chunks))
+
+
+def test_the_last_chunk_is_truncated_to_fit():
+    chunks = [_chunk(topic, 60) for topic in ("alpha", "beta")]
+    budget = count_tokens(chunks[0]) + count_tokens("\n\n") + context._MIN_TAIL_TOKENS + 10
+
+    text, stats = assemble_context(chunks, token_budget=budget, max_chunks=5, mmr_lambda=1.0)
+
+    first, tail = text.split("\n\n")
+    assert first == chunks[0]
+    assert chunks[1].startswith(tail) and len(tail) < len(chunks[1])
+    assert stats["chunks_out"] == 2 and stats["tokens_after"] <= budget
+
+
+def test_a_single_oversized_chunk_is_truncated_rather_than_dropped():
+    chunk = _chunk("alpha", 200)
+
+    text, stats = assemble_context([chunk], token_budget=20, max_chunks=5)
+
+    assert chunk.startswith(text) and text
+    assert stats["tokens_after"] <= 20
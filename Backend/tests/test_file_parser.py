@@ -0,0 +1,90 @@
+# tests/test_file_parser.py
+import zipfile
+from io import BytesIO
+
+import docx
+import fitz
+import pytest
+
+from app.langgraph_core.utils.file_parser import (
+    OLE_MAGIC,
+    UNSUPPORTED_MESSAGES,
+    _extract_rtf,
+    detect_file_type,
+    extract_resume_text,
+)
+
+RTF = (rb"{\rtf1\ansi\deff0{\fonttbl{\f0 Arial;}}{\colortbl;\red0\green0\blue0;}{\*\generator Writer;}"
+       rb"{\info{\author Someone}}\f0\fs24 Jane Doe\par Skills:\tab Python, C\{\}\par Caf\'e9 \u8364? 5\line}")
+
+
+def _pdf(*pages: str) -> bytes:
+    with fitz.open() as doc:
+        for text in pages:
+            doc.new_page().insert_text((72, 72), text)
+        return doc.tobytes()
+
+
+def _docx(*paragraphs: str) -> bytes:
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _zip(name: str) -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(name, "content")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("content, expected", [
+    (_pdf("Jane Doe"), "pdf"),
+    (b"%junk before the header\n" + _pdf("Jane Doe"), "pdf"),
+    (_docx("Jane Doe"), "docx"),
+    (_zip("notes.txt"), "zip"),
+    (b"PK\x03\x04 not really a zip", "unknown"),
+    (OLE_MAGIC + b"\x00" * 64, "doc"),
+    (RTF, "rtf"),
+    (b"\xef\xbb\xbf" + RTF, "rtf"),
+    ("Jane Doe\nSoftware engineer, Zürich\n".encode("utf-8"), "text"),
+    ("Jane Doe".encode("utf-16"), "text"),
+    (bytes(range(256)) * 4, "unknown"),
+    (b"", "unknown"),
+])
+def test_detect_file_type_from_leading_bytes(content, expected):
+    assert detect_file_type(content) == expected
+
+
+def test_detect_file_type_reads_a_path(tmp_path):
+    path = tmp_path / "resume.upload"
+    path.write_bytes(_docx("Jane Doe"))
+    assert detect_file_type(str(path)) == "docx"
+
+
+def test_extract_rtf_keeps_text_and_drops_formatting_groups():
+    assert _extract_rtf(RTF) == "Jane Doe\nSkills:\tPython, C{}\nCafé € 5\n"
+
+
+def test_extract_resume_text_parses_each_supported_format(tmp_path):
+    assert "Jane Doe" in extract_resume_text(_pdf("Jane Doe"))
+    assert extract_resume_text(_docx("Jane Doe", "Python")) == "Jane Doe\nPython"
+    assert extract_resume_text("Jane Doe".encode("utf-16")) == "Jane Doe"
+    path = tmp_path / "resume.upload"
+    path.write_bytes(RTF)
+    assert extract_resume_text(str(path)).startswith("Jane Doe\n")
+
+
+def test_extract_resume_text_rejects_unsupported_and_empty_files():
+    assert extract_resume_text(OLE_MAGIC + b"\x00" * 64) == UNSUPPORTED_MESSAGES["doc"]
+    assert extract_resume_text(_zip("notes.txt")) == UNSUPPORTED_MESSAGES["zip"]
+    assert extract_resume_text(bytes(range(256))) == UNSUPPORTED_MESSAGES["unknown"]
+    assert extract_resume_text(_pdf("")) == "Error: No text could be extracted from the uploaded PDF file."
+
+
+def test_long_pdfs_are_rejected_before_their_pages_are_read():
+    result = extract_resume_text(_pdf("one", "two", "three"), max_pages=2)
+    assert result.startswith("Error: The PDF has 3 pages")
@@ -0,0 +1,90 @@
+# tests/test_lexical.py
+import math
+
+import numpy as np
+import pytest
+
+from app.langgraph_core.retrieval.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+
+CORPUS = [
+    (10, "Python and Flask. Python web services."),
+    (11, "Java with Spring Boot"),
+    (12, "Python for data science with pandas"),
+    (13, "Kubernetes and Docker for Java services"),
+]
+
+
+def _reference_bm25(query: str, k1: float = 1.5, b: float = 0.75) -> dict[int, float]:
+    """Textbook BM25 over CORPUS, one document at a time."""
+    documents = {label: tokenize(text) for label, text in CORPUS}
+    average_length = sum(len(tokens) for tokens in documents.values()) / len(documents)
+    scores = {}
+    for label, tokens in documents.items():
+        score = 0.0
+        for term in set(tokenize(query)):
+            tf = tokens.count(term)
+            if not tf:
+                continue
+            df = sum(term in other for other in documents.values())
+            idf = math.log(1.0 + (len(documents) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (k1 + 1.0) / (tf + k1 * (1.0 - b + b * len(tokens) / average_length))
+        if score:
+            scores[label] = score
+    return scores
+
+
+def test_tokenize_keeps_technology_names_whole():
+    assert tokenize("C++, C# and Node.js.") == ["c++", "c#", "and", "node.js"]
+
+
+def test_postings_are_grouped_by_term_with_ascending_documents():
+    index = BM25Index.build(CORPUS)
+    python = index.vocabulary["python"]
+    java = index.vocabulary["java"]
+
+    assert index.doc_ids[index.indptr[python]:index.indptr[python + 1]].tolist() == [0, 2]
+    assert index.doc_ids[index.indptr[java]:index.indptr[java + 1]].tolist() == [1, 3]
+    assert index.indptr[-1] == len(index.doc_ids) == len(index.weights)
+    assert index.labels.tolist() == [10, 11, 12, 13]
+
+
+@pytest.mark.parametrize("query", ["python", "java services", "python flask services"])
+def test_scores_match_textbook_bm25(query):
+    index = BM25Index.build(CORPUS)
+    expected = _reference_bm25(query)
+
+    hits = index.search(query, k=len(CORPUS))
+
+    assert [label for label, _ in hits] == sorted(expected, key=lambda label: -expected[label])
+    for label, score in hits:
+        assert score == pytest.approx(expected[label], rel=1e-5)
+
+
+def test_search_skips_documents_without_query_terms():
+    index = BM25Index.build(CORPUS)
+    assert {label for label, _ in index.search("pandas", k=4)} == {12}
+    assert index.search("haskell", k=4) == []
+
+
+def test_search_respects_k_and_the_allowed_mask():
+    index = BM25Index.build(CORPUS)
+    assert len(index.search("python java", k=2)) == 2
+
+    allowed = np.array([False, True, True, True])
+    assert {label for label, _ in index.search("python", k=4, allowed=allowed)} == {12}
+
+
+def test_fusion_sums_reciprocal_ranks():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], k=60)
+
+    assert [label for label, _ in fused] == [1, 3, 2]
+    assert dict(fused)[1] == pytest.approx(1 / 61 + 1 / 62)
+    assert dict(fused)[2] == pytest.approx(1 / 62)
+
+
+def test_fusion_ties_keep_first_seen_order_and_limit_applies():
+    # 1 and 2 swap places between the lists, so they score exactly the same
+    fused = reciprocal_rank_fusion([[1, 2, 4], [2, 1, 5]], k=60, limit=3)
+
+    assert [label for label, _ in fused] == [1, 2, 4]
+    assert fused[0][1] == fused[1][1]
@@ -0,0 +1,75 @@
+# tests/test_resume_cache.py
+import types
+
+import pytest
+
+from app.langgraph_core.cache import resume_cache as module
+from app.langgraph_core.cache.resume_cache import ResumeCache, content_digest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # Every call is a second later, so last_used orders the entries exactly
+    monkeypatch.setattr(module, "time", types.SimpleNamespace(time=_Clock().time))
+    return ResumeCache(str(tmp_path / "resumes.sqlite3"), max_bytes=100)
+
+
+def test_content_digest_is_the_same_for_bytes_and_path(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.7 resume" * 1000)
+    assert content_digest(str(path)) == content_digest(path.read_bytes())
+    assert content_digest(b"a") != content_digest(b"b")
+
+
+def test_text_and_analysis_round_trip(cache):
+    assert cache.get("resume") is None
+    cache.set("resume", "Jane Doe")
+    assert cache.get("resume") == ("Jane Doe", None)
+
+    cache.set("resume", "Jane Doe", "Strong profile")
+    assert cache.get("resume") == ("Jane Doe", "Strong profile")
+    stats = cache.stats()
+    assert (stats["hits"], stats["analysis_hits"], stats["misses"], stats["entries"]) == (2, 1, 1, 1)
+
+
+def test_errors_are_not_cached(cache):
+    cache.set("broken", "Error: Could not read the PDF file content.")
+    cache.set("resume", "Jane Doe", "Error: rate limited")
+
+    assert cache.get("broken") is None
+    assert cache.get("resume") == ("Jane Doe", None)
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_limit(cache):
+    cache.set("a", "x" * 40)
+    cache.set("b", "y" * 40)
+    cache.get("a")
+    cache.set("c", "z" * 40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 80
+
+
+def test_analysis_is_dropped_when_the_analyzer_prompt_changes(cache, monkeypatch):
+    cache.set("resume", "Jane Doe", "Strong profile")
+    monkeypatch.setattr(module, "_ANALYZER_PROMPT_DIGEST", "edited prompt")
+
+    assert cache.get("resume") == ("Jane Doe", None)
+
+
+def test_analysis_is_dropped_when_the_analyzer_model_changes(cache, monkeypatch):
+    cache.set("resume", "Jane Doe", "Strong profile")
+    monkeypatch.setitem(module.CHAIN_MODEL_PARAMS, "ResumeAnalyst", {"model": "other", "temperature": 0.4})
+
+    assert cache.get("resume") == ("Jane Doe", None)
@@ -0,0 +1,96 @@
+# tests/test_semantic_cache.py
+import numpy as np
+
+from app.langgraph_core.cache.semantic_cache import SemanticResponseCache, technology_terms
+
+PYTHON_PROMPT = "I know Python, how do I become an ML engineer"
+PYTHON_PARAPHRASE = "I know Python, how can I become an ML engineer"
+JAVA_PROMPT = "I know Java, how do I become an ML engineer"
+
+
+class _BagOfWordsEmbeddings:
+    """Deterministic stand-in for the embedding client: one dimension per known word."""
+
+    def __init__(self, texts: list[str]):
+        words = sorted({word for text in texts for word in self._words(text)})
+        self.vocabulary = {word: i for i, word in enumerate(words)}
+
+    @staticmethod
+    def _words(text: str) -> list[str]:
+        return text.lower().replace(",", " ").split()
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for word in self._words(text):
+            if word in self.vocabulary:
+                vector[self.vocabulary[word]] += 1.0
+        return vector.tolist()
+
+
+def _cache(agents: set[str], maxsize: int = 16) -> SemanticResponseCache:
+    embeddings = _BagOfWordsEmbeddings([PYTHON_PROMPT, PYTHON_PARAPHRASE, JAVA_PROMPT])
+    return SemanticResponseCache(lambda: embeddings, agents, threshold=0.8, maxsize=maxsize, ttl_seconds=60)
+
+
+def _store(cache: SemanticResponseCache, chain: str, prompt: str, inputs: dict, answer: str):
+    cache.store(chain, prompt, answer, cache.embed(prompt), cache.scope(prompt, inputs))
+
+
+def _lookup(cache: SemanticResponseCache, chain: str, prompt: str, inputs: dict):
+    return cache.lookup(chain, cache.embed(prompt), cache.scope(prompt, inputs))
+
+
+def test_prompts_with_different_skills_are_close_paraphrases():
+    # The premise: on the embedding alone these two would share a cache entry
+    cache = _cache({"CareerAdvisor"})
+    score = float((cache.embed(PYTHON_PROMPT) @ cache.embed(JAVA_PROMPT).T)[0, 0])
+    assert score >= cache.threshold
+
+
+def test_technology_terms_resolve_aliases_and_phrases():
+    assert technology_terms("Machine learning with C++, JS and Node.js.") == {"ml", "c++", "javascript", "node.js"}
+    assert technology_terms("How do I go about a career change?") == frozenset()
+
+
+def test_career_advisor_serves_a_paraphrase():
+    cache = _cache({"CareerAdvisor"})
+    _store(cache, "CareerAdvisor", PYTHON_PROMPT, {"question": PYTHON_PROMPT}, "Advice for a Python developer")
+    assert _lookup(cache, "CareerAdvisor", PYTHON_PARAPHRASE, {"question": PYTHON_PARAPHRASE}) == \
+        "Advice for a Python developer"
+
+
+def test_career_advisor_prompts_with_different_skills_do_not_share_an_entry():
+    cache = _cache({"CareerAdvisor"})
+    _store(cache, "CareerAdvisor", PYTHON_PROMPT, {"question": PYTHON_PROMPT}, "Advice for a Python developer")
+    assert _lookup(cache, "CareerAdvisor", JAVA_PROMPT, {"question": JAVA_PROMPT}) is None
+
+
+def test_learning_path_serves_a_paraphrase_with_differently_worded_arguments():
+    cache = _cache({"LearningPath"})
+    assert cache.applies_to("LearningPath")
+    _store(cache, "LearningPath", PYTHON_PROMPT, {"current_skills": "Python", "goal_role": "ML Engineer"},
+           "Roadmap for a Python developer")
+    parsed = {"current_skills": "python programming", "goal_role": "Machine Learning engineer"}
+    assert _lookup(cache, "LearningPath", PYTHON_PARAPHRASE, parsed) == "Roadmap for a Python developer"
+
+
+def test_learning_path_prompts_with_different_skills_do_not_share_an_entry():
+    cache = _cache({"LearningPath"})
+    _store(cache, "LearningPath", PYTHON_PROMPT, {"current_skills": "Python", "goal_role": "ML Engineer"},
+           "Roadmap for a Python developer")
+    assert _lookup(cache, "LearningPath", JAVA_PROMPT, {"current_skills": "Java", "goal_role": "ML Engineer"}) is None
+
+
+def test_resume_chains_are_refused():
+    cache = _cache({"CareerAdvisor", "JobSearch"})
+    assert not cache.applies_to("JobSearch")
+
+
+def test_eviction_forgets_the_scope_of_evicted_entries():
+    cache = _cache({"CareerAdvisor"}, maxsize=1)
+    _store(cache, "CareerAdvisor", PYTHON_PROMPT, {"question": PYTHON_PROMPT}, "Python answer")
+    _store(cache, "CareerAdvisor", JAVA_PROMPT, {"question": JAVA_PROMPT}, "Java answer")
+
+    assert _lookup(cache, "CareerAdvisor", PYTHON_PROMPT, {"question": PYTHON_PROMPT}) is None
+    assert _lookup(cache, "CareerAdvisor", JAVA_PROMPT, {"question": JAVA_PROMPT}) == "Java answer"
+    assert len(cache._namespaces["CareerAdvisor"].scopes) == 1
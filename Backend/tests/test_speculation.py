@@ -0,0 +1,50 @@
+# tests/test_speculation.py
+import asyncio
+
+from app.services.speculation import route_with_speculation, speculation_stats
+
+
+def _label(agent_name: str) -> str:
+    return agent_name if agent_name in ("CareerAdvisor", "ResumeQAAgent", "LearningPath") else "CareerAdvisor"
+
+
+def _run(decision: str) -> tuple[str, list[str], list[str]]:
+    started = []
+
+    async def stream(agent_name: str):
+        started.append(agent_name)
+        for token in (agent_name, " answer"):
+            yield token
+
+    async def route() -> str:
+        await asyncio.sleep(0.01)
+        return decision
+
+    async def main():
+        next_agent, tokens = await route_with_speculation(route(), None, stream, resolve_agent=_label)
+        return next_agent, [token async for token in tokens]
+
+    next_agent, tokens = asyncio.run(main())
+    return next_agent, tokens, started
+
+
+def test_a_decision_served_by_the_guessed_chain_is_a_hit():
+    hits = speculation_stats.hits
+
+    next_agent, tokens, started = _run("END")
+
+    assert next_agent == "END"
+    assert tokens == ["CareerAdvisor", " answer"]
+    assert started == ["CareerAdvisor"]
+    assert speculation_stats.hits == hits + 1
+
+
+def test_a_different_chain_cancels_the_guess_and_starts_over():
+    misses = speculation_stats.misses
+
+    next_agent, tokens, started = _run("LearningPath")
+
+    assert next_agent == "LearningPath"
+    assert tokens == ["LearningPath", " answer"]
+    assert started[-1] == "LearningPath"
+    assert speculation_stats.misses == misses + 1
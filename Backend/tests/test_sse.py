@@ -0,0 +1,89 @@
+# tests/test_sse.py
+import asyncio
+import types
+
+import orjson
+import pytest
+
+from app.api import sse
+from app.api.sse import SSEFrameCoalescer, acoalesce_tokens, coalesce_tokens, encode_event
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(sse, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _token(frame: bytes) -> str:
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    return orjson.loads(frame[len(b"data: "):-2])["token"]
+
+
+def test_encode_event_adds_an_id_line_when_given():
+    assert encode_event({"stage": "done"}) == b'data: {"stage":"done"}\n\n'
+    assert encode_event({"stage": "done"}, event_id=7) == b'id: 7\ndata: {"stage":"done"}\n\n'
+
+
+def test_tokens_are_held_until_the_byte_threshold(clock):
+    coalescer = SSEFrameCoalescer(max_bytes=10, max_interval_ms=1000)
+
+    assert coalescer.feed("Hello") is None
+    assert coalescer.feed("") is None
+    assert coalescer.feed(" ") is None
+    frame = coalescer.feed("world")
+
+    assert _token(frame) == "Hello world"
+    assert coalescer.flush() is None
+    assert (coalescer.tokens, coalescer.frames) == (3, 1)
+
+
+def test_multibyte_tokens_count_their_utf8_size(clock):
+    coalescer = SSEFrameCoalescer(max_bytes=6, max_interval_ms=1000)
+    assert coalescer.feed("é") is None
+    assert _token(coalescer.feed("éé")) == "ééé"
+
+
+def test_an_old_buffer_is_flushed_on_the_next_token(clock):
+    coalescer = SSEFrameCoalescer(max_bytes=1000, max_interval_ms=16)
+
+    assert coalescer.feed("a") is None
+    clock.now += 0.010
+    assert coalescer.seconds_until_flush() == pytest.approx(0.006)
+    assert coalescer.feed("b") is None
+    clock.now += 0.006
+    assert _token(coalescer.feed("c")) == "abc"
+    assert coalescer.seconds_until_flush() is None
+
+
+def test_coalesce_tokens_flushes_the_remainder():
+    frames = list(coalesce_tokens(["one ", "two ", "three"], SSEFrameCoalescer(max_bytes=8, max_interval_ms=1000)))
+    assert [_token(frame) for frame in frames] == ["one two ", "three"]
+
+
+def test_acoalesce_tokens_flushes_during_a_pause_in_generation():
+    async def tokens():
+        yield "first"
+        await asyncio.sleep(0.2)
+        yield "second"
+
+    async def collect():
+        frames = []
+        async for frame in acoalesce_tokens(tokens(), SSEFrameCoalescer(max_bytes=1000, max_interval_ms=20)):
+            frames.append((_token(frame), asyncio.get_running_loop().time()))
+        return frames
+
+    frames = asyncio.run(collect())
+
+    assert [text for text, _ in frames] == ["first", "second"]
+    # "first" went out while the generator was still sleeping, not together with "second"
+    assert frames[1][1] - frames[0][1] >= 0.1
@@ -0,0 +1,47 @@
+# tests/test_ttl_cache.py
+import time
+
+from app.langgraph_core.cache.ttl_cache import TTLLRUCache
+
+
+def test_get_returns_stored_values_and_counts_hits_and_misses():
+    cache = TTLLRUCache("test", maxsize=4, ttl_seconds=60)
+    cache.set("a", "answer")
+
+    assert cache.get("a") == "answer"
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"], stats["size"]) == (1, 1, 0.5, 1)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLLRUCache("test", maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_entries_expire_after_the_ttl():
+    cache = TTLLRUCache("test", maxsize=4, ttl_seconds=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear_keeps_the_counters():
+    cache = TTLLRUCache("test", maxsize=4, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
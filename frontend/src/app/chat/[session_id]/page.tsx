@@ -506,7 +506,7 @@ export default function ChatSessionPage() {
 
                 try {
                   const data = JSON.parse(dataStr);
-                  if (data.token && data.token.trim()) {
+                  if (data.token) {
                     setMessages((prev) =>
                       prev.map((m) =>
                         m.id === aiMessageId
@@ -614,7 +614,7 @@ export default function ChatSessionPage() {
 
                 try {
                   const data = JSON.parse(dataStr);
-                  if (data.token && data.token.trim()) {
+                  if (data.token) {
                     setMessages((prev) =>
                       prev.map((m) =>
                         m.id === aiMessageId
@@ -223,7 +223,7 @@ export async function processSSEStream(
                         const data = JSON.parse(dataStr);
 
                         // Handle different data types
-                        if (data.token && data.token.trim()) {
+                        if (data.token) {
                             onToken(data.token);
                         }
                         if (data.session && onSession) {